@@ -10,9 +10,17 @@ sys.path.insert(0, "src")
 from registry_api_v2_client import (
     RegistryError,
     check_registry_connectivity,
+    create_session,
     list_repositories,
 )
 
+try:
+    # libuv-based event loop with lower per-await overhead, if installed.
+    # The other examples use plain asyncio.run; the same swap works there.
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,23 +31,25 @@ async def main():
     registry_url = "http://localhost:15000"
 
     try:
-        # Check connectivity
-        logger.info("Checking registry connectivity...")
-        await check_registry_connectivity(registry_url)
-        logger.info("✓ Registry is accessible")
-
-        # List repositories
-        logger.info("Listing repositories...")
-        repos = await list_repositories(registry_url)
-        logger.info(f"Found {len(repos)} repositories: {repos}")
-
-        # If there are repositories, show their tags
-        for repo in repos[:3]:  # Show first 3 repos
-            logger.info(f"Getting tags for repository: {repo}")
-            from registry_api_v2_client import list_tags
-
-            tags = await list_tags(registry_url, repo)
-            logger.info(f"  Tags: {tags}")
+        # Share one session so every call reuses pooled keep-alive connections
+        async with await create_session() as session:
+            # Check connectivity
+            logger.info("Checking registry connectivity...")
+            await check_registry_connectivity(registry_url, session=session)
+            logger.info("✓ Registry is accessible")
+
+            # List repositories
+            logger.info("Listing repositories...")
+            repos = await list_repositories(registry_url, session=session)
+            logger.info(f"Found {len(repos)} repositories: {repos}")
+
+            # If there are repositories, show their tags
+            for repo in repos[:3]:  # Show first 3 repos
+                logger.info(f"Getting tags for repository: {repo}")
+                from registry_api_v2_client import list_tags
+
+                tags = await list_tags(registry_url, repo, session=session)
+                logger.info(f"  Tags: {tags}")
 
     except RegistryError as e:
         logger.error(f"Registry error: {e}")
@@ -51,40 +61,53 @@ async def concurrent_operations():
     """Example of concurrent async operations."""
     registry_url = "http://localhost:15000"
 
-    try:
-        # Run multiple operations concurrently
-        logger.info("Running concurrent operations...")
-
-        tasks = [
-            check_registry_connectivity(registry_url),
-            list_repositories(registry_url),
-        ]
-
-        connectivity, repos = await asyncio.gather(*tasks)
-
-        logger.info(f"Connectivity: {connectivity}")
-        logger.info(f"Repositories: {repos}")
+    # Python 3.12+: tasks that can finish without suspending skip a trip
+    # through the event loop scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
 
-        # Concurrent tag listing for multiple repos
-        if repos:
-            from registry_api_v2_client import list_tags
-
-            tag_tasks = [list_tags(registry_url, repo) for repo in repos[:3]]
-
-            if tag_tasks:
-                tag_results = await asyncio.gather(*tag_tasks)
-                for repo, tags in zip(repos[:3], tag_results, strict=False):
-                    logger.info(f"Repository {repo}: {tags}")
-
-    except RegistryError as e:
-        logger.error(f"Registry error: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+    try:
+        async with await create_session() as session:
+            # Run multiple operations concurrently
+            logger.info("Running concurrent operations...")
+
+            async with asyncio.TaskGroup() as tg:
+                # Also open a few pooled connections for the tag fan-out below
+                connectivity_task = tg.create_task(
+                    check_registry_connectivity(registry_url, session=session, warmup=3)
+                )
+                repos_task = tg.create_task(
+                    list_repositories(registry_url, session=session)
+                )
+
+            repos = repos_task.result()
+            logger.info(f"Connectivity: {connectivity_task.result()}")
+            logger.info(f"Repositories: {repos}")
+
+            # Concurrent tag listing for multiple repos
+            if repos:
+                from registry_api_v2_client import list_tags
+
+                async with asyncio.TaskGroup() as tg:
+                    tag_tasks = [
+                        tg.create_task(list_tags(registry_url, repo, session=session))
+                        for repo in repos[:3]
+                    ]
+
+                for repo, tag_task in zip(repos[:3], tag_tasks, strict=True):
+                    logger.info(f"Repository {repo}: {tag_task.result()}")
+
+    except* RegistryError as eg:
+        for e in eg.exceptions:
+            logger.error(f"Registry error: {e}")
+    except* Exception as eg:
+        for e in eg.exceptions:
+            logger.error(f"Unexpected error: {e}")
 
 
 if __name__ == "__main__":
     print("=== Basic Async Operations ===")
-    asyncio.run(main())
+    run(main())
 
     print("\n=== Concurrent Async Operations ===")
-    asyncio.run(concurrent_operations())
+    run(concurrent_operations())
@@ -7,7 +7,7 @@ import time
 # Add parent directory to path
 sys.path.insert(0, "src")
 
-from registry_api_v2_client import list_repositories
+from registry_api_v2_client import create_session, list_repositories
 
 
 async def async_multiple_calls(registry_url: str, num_calls: int = 5):
@@ -15,8 +15,11 @@ async def async_multiple_calls(registry_url: str, num_calls: int = 5):
     start_time = time.time()
 
     # Run multiple operations concurrently
-    tasks = [list_repositories(registry_url) for _ in range(num_calls)]
-    results = await asyncio.gather(*tasks)
+    async with await create_session() as session:
+        tasks = [
+            list_repositories(registry_url, session=session) for _ in range(num_calls)
+        ]
+        results = await asyncio.gather(*tasks)
 
     end_time = time.time()
     return end_time - start_time, len(results)
@@ -27,9 +30,10 @@ async def async_sequential_calls(registry_url: str, num_calls: int = 5):
     start_time = time.time()
 
     results = []
-    for _ in range(num_calls):
-        result = await list_repositories(registry_url)
-        results.append(result)
+    async with await create_session() as session:
+        for _ in range(num_calls):
+            result = await list_repositories(registry_url, session=session)
+            results.append(result)
 
     end_time = time.time()
     return end_time - start_time, len(results)
@@ -2,6 +2,7 @@
 
 import asyncio
 import hashlib
+import io
 import json
 import logging
 import sys
@@ -22,6 +23,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def add_tar_member(tar: tarfile.TarFile, name: str, content: bytes) -> None:
+    """Add in-memory content to a tar file as a regular file."""
+    member = tarfile.TarInfo(name)
+    member.size = len(content)
+    tar.addfile(member, fileobj=io.BytesIO(content))
+
+
 def create_simple_tar():
     """Create a simple test tar file."""
     # Create dummy data
@@ -49,27 +57,10 @@ def create_simple_tar():
     tar_path = tempfile.mktemp(suffix=".tar")
 
     with tarfile.open(tar_path, "w") as tar:
-        # Add manifest.json
-        manifest_info = tarfile.TarInfo("manifest.json")
-        manifest_content = json.dumps(manifest).encode("utf-8")
-        manifest_info.size = len(manifest_content)
-        tar.addfile(manifest_info, fileobj=tarfile.io.BytesIO(manifest_content))
-
-        # Add repositories
-        repos_info = tarfile.TarInfo("repositories")
-        repos_content = json.dumps(repositories).encode("utf-8")
-        repos_info.size = len(repos_content)
-        tar.addfile(repos_info, fileobj=tarfile.io.BytesIO(repos_content))
-
-        # Add config blob
-        config_info = tarfile.TarInfo(f"blobs/sha256/{config_hash}")
-        config_info.size = len(config_content)
-        tar.addfile(config_info, fileobj=tarfile.io.BytesIO(config_content))
-
-        # Add layer blob
-        layer_info = tarfile.TarInfo(f"blobs/sha256/{layer_hash}")
-        layer_info.size = len(layer_content)
-        tar.addfile(layer_info, fileobj=tarfile.io.BytesIO(layer_content))
+        add_tar_member(tar, "manifest.json", json.dumps(manifest).encode())
+        add_tar_member(tar, "repositories", json.dumps(repositories).encode())
+        add_tar_member(tar, f"blobs/sha256/{config_hash}", config_content)
+        add_tar_member(tar, f"blobs/sha256/{layer_hash}", layer_content)
 
     return tar_path
 
@@ -6,7 +6,8 @@ __email__ = "cagojeiger@naver.com"
 
 # Exceptions
 # Core types for advanced usage
-from .core.types import BlobInfo, ManifestInfo, RegistryConfig
+from .core.session import create_session
+from .core.types import BlobInfo, ManifestInfo, ProgressCallback, RegistryConfig
 from .exceptions import (
     RegistryError,
     TarReadError,
@@ -28,6 +29,7 @@ from .registry import (
     delete_image_by_digest,
     get_image_info,
     get_manifest,
+    iter_tags,
     list_repositories,
     list_tags,
 )
@@ -59,12 +61,15 @@ __all__ = [
     "push_docker_tar_with_all_original_tags",
     "list_repositories",
     "list_tags",
+    "iter_tags",
     "get_manifest",
     "get_image_info",
     "delete_image",
     "delete_image_by_digest",
     # Core types
+    "create_session",
     "RegistryConfig",
     "BlobInfo",
     "ManifestInfo",
+    "ProgressCallback",
 ]
@@ -1,11 +1,17 @@
 """Core functionality for registry operations."""
 
-from .connectivity import check_connectivity
+from .connectivity import (
+    check_connectivity,
+    clear_connectivity_cache,
+    ensure_connectivity,
+)
 from .session import create_session, make_request
 from .types import RegistryConfig, RequestResult
 
 __all__ = [
     "check_connectivity",
+    "clear_connectivity_cache",
+    "ensure_connectivity",
     "create_session",
     "make_request",
     "RegistryConfig",
@@ -1,11 +1,26 @@
 """Async registry connectivity checking functions."""
 
+import asyncio
+import time
+import weakref
+
+import aiohttp
 from aiohttp import ClientConnectorError, ClientResponseError, ClientTimeout
+from yarl import URL
 
 from ..exceptions import RegistryError
-from .session import create_session
+from .session import session_scope
 from .types import RegistryConfig, RequestResult
 
+# Seconds a successful connectivity check is trusted by ensure_connectivity
+CONNECTIVITY_CACHE_TTL = 300.0
+
+# Session -> registry base URL -> monotonic time of the last successful check.
+# Entries live only as long as their session, so a new session always checks.
+_verified_registries: weakref.WeakKeyDictionary[
+    aiohttp.ClientSession, dict[str, float]
+] = weakref.WeakKeyDictionary()
+
 
 def check_api_version_header(headers: dict[str, str]) -> bool:
     """Check if response contains valid API v2 header."""
@@ -32,11 +47,18 @@ def validate_connectivity_response(result: RequestResult) -> None:
         )
 
 
-async def check_connectivity(config: RegistryConfig) -> bool:
+async def check_connectivity(
+    config: RegistryConfig,
+    session: aiohttp.ClientSession | None = None,
+    warmup: int = 0,
+) -> bool:
     """Check if registry is accessible and supports API v2.
 
     Args:
         config: Registry configuration
+        session: Optional HTTP session to reuse
+        warmup: Number of keep-alive connections to open in the session's
+            pool after a successful check. Only useful with a shared session.
 
     Returns:
         True if registry is accessible and supports v2 API
@@ -44,31 +66,114 @@ async def check_connectivity(config: RegistryConfig) -> bool:
     Raises:
         RegistryError: If registry is not accessible or doesn't support v2
     """
-    url = f"{config.base_url}/v2/"
-
-    session = await create_session()
+    url = config.api_url / ""
 
+    verified = _verified_registries.get(session) if session is not None else None
     try:
-        timeout = ClientTimeout(total=config.timeout)
+        await request_base_endpoint(url, config, session)
+    except RegistryError:
+        if verified is not None:
+            verified.pop(config.base_url, None)
+        raise
+
+    if session is not None:
+        _verified_registries.setdefault(session, {})[config.base_url] = time.monotonic()
+
+    if warmup > 0 and session is not None:
+        await warm_up_connections(config, session, warmup)
+
+    return True
+
+
+async def warm_up_connections(
+    config: RegistryConfig, session: aiohttp.ClientSession, count: int
+) -> None:
+    """Open idle keep-alive connections to the registry in advance.
+
+    Concurrent requests force the connector to open one connection each, and
+    those connections stay pooled, so a later burst of requests (such as the
+    fan-out of a push) skips the DNS lookups and handshakes. Failures are
+    ignored; the connectivity check itself has already succeeded.
 
+    Args:
+        config: Registry configuration
+        session: HTTP session whose connection pool to fill
+        count: Number of connections to open
+    """
+    url = config.api_url / ""
+    timeout = ClientTimeout(total=config.timeout)
+
+    async def open_connection() -> None:
         async with session.get(url, timeout=timeout) as response:
+            await response.read()
+
+    await asyncio.gather(
+        *[open_connection() for _ in range(count)], return_exceptions=True
+    )
+
+
+async def request_base_endpoint(
+    url: URL, config: RegistryConfig, session: aiohttp.ClientSession | None
+) -> None:
+    """Request the API v2 base endpoint and validate the response."""
+    async with session_scope(session) as session:
+        try:
+            timeout = ClientTimeout(total=config.timeout)
+
+            async with session.get(url, timeout=timeout) as response:
+                result = RequestResult(
+                    status_code=response.status, headers=dict(response.headers)
+                )
+
+                validate_connectivity_response(result)
+
+        except ClientConnectorError as e:
+            raise RegistryError(f"Failed to connect to registry: {e}") from e
+        except ClientResponseError as e:
+            # Don't raise for expected status codes, let validate_connectivity_response handle them
             result = RequestResult(
-                status_code=response.status, headers=dict(response.headers)
+                status_code=e.status, headers=dict(e.headers) if e.headers else {}
             )
-
             validate_connectivity_response(result)
-            return True
-
-    except ClientConnectorError as e:
-        raise RegistryError(f"Failed to connect to registry: {e}") from e
-    except ClientResponseError as e:
-        # Don't raise for expected status codes, let validate_connectivity_response handle them
-        result = RequestResult(
-            status_code=e.status, headers=dict(e.headers) if e.headers else {}
-        )
-        validate_connectivity_response(result)
-        return True
-    except Exception as e:
-        raise RegistryError(f"Failed to connect to registry: {e}") from e
-    finally:
-        await session.close()
+        except Exception as e:
+            raise RegistryError(f"Failed to connect to registry: {e}") from e
+
+
+async def ensure_connectivity(
+    config: RegistryConfig, session: aiohttp.ClientSession | None = None
+) -> None:
+    """Check connectivity unless the session verified the registry recently.
+
+    Used as a preflight by operations that talk to the registry anyway, so a
+    script pushing many images over one shared session pays for the ``/v2/``
+    round trip once per ``CONNECTIVITY_CACHE_TTL`` instead of once per call.
+    Without a session the registry is always checked.
+
+    Args:
+        config: Registry configuration
+        session: Optional HTTP session to reuse
+
+    Raises:
+        RegistryError: If registry is not accessible or doesn't support v2
+    """
+    verified = _verified_registries.get(session) if session is not None else None
+    verified_at = verified.get(config.base_url) if verified is not None else None
+    if (
+        verified_at is not None
+        and time.monotonic() - verified_at < CONNECTIVITY_CACHE_TTL
+    ):
+        return
+
+    await check_connectivity(config, session)
+
+
+def clear_connectivity_cache(session: aiohttp.ClientSession | None = None) -> None:
+    """Forget previously verified registries.
+
+    Args:
+        session: Session whose entries are cleared; all sessions if omitted
+    """
+    if session is None:
+        _verified_registries.clear()
+    else:
+        _verified_registries.pop(session, None)
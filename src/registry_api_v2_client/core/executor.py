@@ -0,0 +1,46 @@
+"""Thread pool for blocking tar file I/O."""
+
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Enough workers for every concurrent upload to keep a read in flight
+TAR_IO_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_tar_io_executor: ThreadPoolExecutor | None = None
+
+
+def get_tar_io_executor() -> ThreadPoolExecutor:
+    """Get the thread pool for tar file I/O, creating it on first use.
+
+    Tar reads and hashing get their own pool instead of the event loop's
+    default executor, so they neither wait behind nor starve unrelated
+    blocking work such as aiohttp's DNS lookups.
+
+    Returns:
+        Shared thread pool executor
+    """
+    global _tar_io_executor
+    if _tar_io_executor is None:
+        _tar_io_executor = ThreadPoolExecutor(
+            max_workers=TAR_IO_MAX_WORKERS, thread_name_prefix="registry-tar-io"
+        )
+    return _tar_io_executor
+
+
+def run_tar_io(func: Callable[..., T], *args: Any) -> asyncio.Future[T]:
+    """Run blocking tar file I/O in the dedicated thread pool.
+
+    Args:
+        func: Blocking function to call
+        *args: Positional arguments for ``func``
+
+    Returns:
+        Future resolving to the function's result
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(get_tar_io_executor(), func, *args)
@@ -0,0 +1,53 @@
+"""JSON encoding and decoding for registry payloads.
+
+Uses ``orjson`` when installed (``pip install registry-api-v2-client[fast]``)
+and falls back to the standard library otherwise. Both backends emit compact
+UTF-8 JSON without whitespace, but they are not byte-for-byte identical for
+every input (float formatting and non-string keys differ), so a digest is only
+stable for the backend that serialized the document. The manifests built here
+contain only strings, integers, lists and string-keyed objects, for which the
+output matches.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON without insignificant whitespace
+    """
+    if HAS_ORJSON:
+        encoded: bytes = orjson.dumps(obj)
+        return encoded
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize JSON bytes or text.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if HAS_ORJSON:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
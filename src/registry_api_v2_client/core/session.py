@@ -1,19 +1,30 @@
 """Async HTTP session management for registry operations."""
 
 import json
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 import aiohttp
 from aiohttp import ClientConnectorError, ClientResponseError, ClientTimeout
+from yarl import URL
 
 from ..exceptions import RegistryError
+from . import json_codec
 from .types import RegistryConfig, RequestResult
 
 
 async def create_session() -> aiohttp.ClientSession:
     """Create async HTTP session with retry and timeout configuration."""
     timeout = ClientTimeout(total=30, connect=10)
-    connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
+    # Keep idle connections around long enough to be reused by the many small
+    # HEAD/PUT requests of a push, and cache DNS lookups for the session.
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=30,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+    )
 
     return aiohttp.ClientSession(
         timeout=timeout,
@@ -22,10 +33,37 @@ async def create_session() -> aiohttp.ClientSession:
     )
 
 
-def parse_json_response(text: str) -> dict[str, Any] | None:
+@asynccontextmanager
+async def session_scope(
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield a session for a registry operation.
+
+    If a session is given it is reused as-is and left open, so several
+    operations can share one connection pool and its keep-alive connections.
+    Otherwise a temporary session is created and closed on exit.
+
+    Args:
+        session: Optional existing session to reuse
+
+    Yields:
+        Async HTTP session
+    """
+    if session is not None:
+        yield session
+        return
+
+    owned_session = await create_session()
+    try:
+        yield owned_session
+    finally:
+        await owned_session.close()
+
+
+def parse_json_response(text: bytes | str) -> dict[str, Any] | None:
     """Parse JSON response safely."""
     try:
-        result = json.loads(text)
+        result = json_codec.loads(text)
         # Ensure we return proper Dict type
         return dict(result) if isinstance(result, dict) else None
     except (json.JSONDecodeError, ValueError):
@@ -35,10 +73,10 @@ def parse_json_response(text: str) -> dict[str, Any] | None:
 async def make_request(
     session: aiohttp.ClientSession,
     method: str,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
-    data: bytes | str | None = None,
+    data: bytes | str | AsyncIterable[bytes] | None = None,
     expect_json: bool = False,
 ) -> RequestResult:
     """Make async HTTP request and return structured result.
@@ -49,7 +87,7 @@ async def make_request(
         url: Request URL
         config: Registry configuration
         headers: Optional request headers
-        data: Optional request body
+        data: Optional request body, or an async iterable streaming it
         expect_json: Whether to parse response as JSON
 
     Returns:
@@ -75,8 +113,8 @@ async def make_request(
             if content:
                 result_data = content
                 if expect_json:
-                    text = await response.text()
-                    json_data = parse_json_response(text)
+                    # Parse the raw body directly instead of decoding it to text
+                    json_data = parse_json_response(content)
 
             return RequestResult(
                 status_code=response.status,
@@ -95,7 +133,7 @@ async def make_request(
 
 async def make_get_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
     expect_json: bool = True,
@@ -108,7 +146,7 @@ async def make_get_request(
 
 async def make_post_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
     data: bytes | str | None = None,
@@ -119,10 +157,10 @@ async def make_post_request(
 
 async def make_put_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
-    data: bytes | str | None = None,
+    data: bytes | str | AsyncIterable[bytes] | None = None,
 ) -> RequestResult:
     """Make async PUT request."""
     return await make_request(session, "PUT", url, config, headers, data)
@@ -130,7 +168,7 @@ async def make_put_request(
 
 async def make_patch_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
     data: bytes | str | None = None,
@@ -141,7 +179,7 @@ async def make_patch_request(
 
 async def make_delete_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
 ) -> RequestResult:
@@ -151,7 +189,7 @@ async def make_delete_request(
 
 async def make_head_request(
     session: aiohttp.ClientSession,
-    url: str,
+    url: str | URL,
     config: RegistryConfig,
     headers: dict[str, str] | None = None,
 ) -> RequestResult:
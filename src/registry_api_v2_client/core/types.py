@@ -1,8 +1,15 @@
 """Type definitions for registry operations."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, NamedTuple
 
+from yarl import URL
+
+# Called with (blob digest, bytes uploaded so far, blob size)
+ProgressCallback = Callable[[str, int, int], None]
+
 
 @dataclass(frozen=True)
 class RegistryConfig:
@@ -10,12 +17,25 @@ class RegistryConfig:
 
     url: str
     timeout: int = 30
+    max_concurrent_uploads: int = 8
+    # Hash blobs while uploading them; the registry checks digests anyway
+    verify_digests: bool = False
 
     @property
     def base_url(self) -> str:
         """Get base URL without trailing slash."""
         return self.url.rstrip("/")
 
+    @cached_property
+    def api_url(self) -> URL:
+        """Get API v2 root URL, parsed once per configuration."""
+        return URL(self.base_url) / "v2"
+
+    @cached_property
+    def origin(self) -> str:
+        """Get scheme, host and port of the registry URL."""
+        return str(self.api_url.origin())
+
 
 class RequestResult(NamedTuple):
     """Result of an HTTP request."""
@@ -26,7 +46,7 @@ class RequestResult(NamedTuple):
     json_data: dict[str, Any] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BlobInfo:
     """Information about a blob."""
 
@@ -42,7 +62,7 @@ class BlobInfo:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ManifestInfo:
     """Information about a manifest."""
 
@@ -58,7 +78,7 @@ class ManifestInfo:
         return self.config.size + sum(layer.size for layer in self.layers)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UploadSession:
     """Upload session information."""
 
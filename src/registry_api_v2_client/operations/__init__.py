@@ -1,18 +1,20 @@
 """Registry operations."""
 
-from .blobs import check_blob_exists, upload_blob
+from .blobs import check_blob_exists, clear_blob_cache, upload_blob
 from .images import delete_image, get_image_info
 from .manifests import delete_manifest, get_manifest, upload_manifest
-from .repositories import list_repositories, list_tags
+from .repositories import iter_tags, list_repositories, list_tags
 
 __all__ = [
     "check_blob_exists",
+    "clear_blob_cache",
     "upload_blob",
     "get_manifest",
     "upload_manifest",
     "delete_manifest",
     "list_repositories",
     "list_tags",
+    "iter_tags",
     "get_image_info",
     "delete_image",
 ]
@@ -1,25 +1,124 @@
 """Async blob operations for registry."""
 
 import asyncio
-import hashlib
-import tarfile
-from collections.abc import Iterator
+import io
+import lzma
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
 
 import aiohttp
+from yarl import URL
 
+from ..core.executor import run_tar_io
 from ..core.session import (
-    create_session,
     make_head_request,
     make_patch_request,
     make_post_request,
     make_put_request,
+    session_scope,
 )
-from ..core.types import BlobInfo, RegistryConfig, UploadSession
+from ..core.types import BlobInfo, ProgressCallback, RegistryConfig, UploadSession
 from ..exceptions import RegistryError
+from ..tar.members import (
+    get_tar_index,
+    get_tar_members,
+    open_tar_stream,
+    resolve_tar_member,
+)
+from ..utils.digest import digest_matches, get_hasher, is_valid_digest
+
+# Seconds a session trusts a blob seen in a repository without another HEAD
+BLOB_CACHE_TTL = 600.0
+BLOB_CACHE_MAX_SIZE = 10000
+
+# Upper bound on progress callbacks per blob, besides the one on completion
+PROGRESS_REPORTS_PER_BLOB = 20
+
+# Blobs up to this size are sent in a single PUT. Larger ones are sent as
+# PATCH requests of UPLOAD_CHUNK_SIZE bytes, so each request stays small
+# enough to finish within the request timeout on a slow link.
+MONOLITHIC_UPLOAD_MAX_SIZE = 32 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
+# Bytes read from the tar per step when streaming a blob for a single PUT
+TAR_READ_CHUNK_SIZE = 1024 * 1024
+
+# Blobs seen per session: (registry base URL, repository, digest) -> monotonic
+# time the blob was seen. Entries live only as long as their session, so a
+# new push always asks the registry again instead of trusting a previous one.
+_known_blobs: weakref.WeakKeyDictionary[
+    aiohttp.ClientSession, OrderedDict[tuple[str, str, str], float]
+] = weakref.WeakKeyDictionary()
+
+
+def remember_blob(
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    session: aiohttp.ClientSession | None,
+) -> None:
+    """Record that a blob exists in a repository, for the given session."""
+    if session is None:
+        return
+    known = _known_blobs.setdefault(session, OrderedDict())
+    key = (config.base_url, repository, digest)
+    known[key] = time.monotonic()
+    known.move_to_end(key)
+    while len(known) > BLOB_CACHE_MAX_SIZE:
+        known.popitem(last=False)
+
+
+def is_blob_known(
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    session: aiohttp.ClientSession | None,
+) -> bool:
+    """Check if a blob was recently seen in a repository by the given session."""
+    if session is None or session not in _known_blobs:
+        return False
+    seen_at = _known_blobs[session].get((config.base_url, repository, digest))
+    return seen_at is not None and time.monotonic() - seen_at < BLOB_CACHE_TTL
+
+
+def forget_blobs(
+    config: RegistryConfig,
+    repository: str,
+    session: aiohttp.ClientSession | None,
+) -> None:
+    """Forget all blobs the given session recorded for a repository."""
+    if session is None or session not in _known_blobs:
+        return
+    known = _known_blobs[session]
+    for key in [key for key in known if key[:2] == (config.base_url, repository)]:
+        del known[key]
+
+
+def clear_blob_cache(session: aiohttp.ClientSession | None = None) -> None:
+    """Forget blobs recorded as present in the registry.
+
+    Within one session, blobs that were uploaded, mounted or found by a HEAD
+    request are trusted for ``BLOB_CACHE_TTL`` seconds without asking the
+    registry again. Clear the cache when a session outlives a registry
+    restart or garbage collection that may have deleted those blobs.
+
+    Args:
+        session: Session whose entries are cleared; all sessions if omitted
+    """
+    if session is None:
+        _known_blobs.clear()
+    else:
+        _known_blobs.pop(session, None)
 
 
 async def check_blob_exists(
-    config: RegistryConfig, repository: str, digest: str
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    session: aiohttp.ClientSession | None = None,
 ) -> bool:
     """Check if blob exists in registry.
 
@@ -27,20 +126,28 @@ async def check_blob_exists(
         config: Registry configuration
         repository: Repository name
         digest: Blob digest
+        session: Optional HTTP session to reuse
 
     Returns:
         True if blob exists
     """
-    url = f"{config.base_url}/v2/{repository}/blobs/{digest}"
+    # Blobs this session pushed or saw recently need no HEAD request
+    if is_blob_known(config, repository, digest, session):
+        return True
 
-    session = await create_session()
-    try:
-        result = await make_head_request(session, url, config)
-        return result.status_code == 200
-    except RegistryError:
+    url = config.api_url / repository / "blobs" / digest
+
+    async with session_scope(session) as session:
+        try:
+            result = await make_head_request(session, url, config)
+        except RegistryError:
+            return False
+
+    if result.status_code != 200:
         return False
-    finally:
-        await session.close()
+
+    remember_blob(config, repository, digest, session)
+    return True
 
 
 async def extract_blob_from_tar(tar_path: str, digest: str) -> bytes:
@@ -56,40 +163,251 @@ async def extract_blob_from_tar(tar_path: str, digest: str) -> bytes:
     Raises:
         RegistryError: If blob not found or digest mismatch
     """
-    blob_filename = f"blobs/sha256/{digest.split(':')[1]}"
-
-    # Run tar extraction in thread pool to avoid blocking
-    def _extract_blob() -> bytes:
-        with tarfile.open(tar_path, "r") as tar:
-            try:
-                blob_member = tar.getmember(blob_filename)
-                extracted_file = tar.extractfile(blob_member)
-                if extracted_file is None:
-                    raise RegistryError(f"Could not extract blob from tar: {digest}")
-                return extracted_file.read()
-            except KeyError as e:
-                raise RegistryError(f"Blob not found in tar: {digest}") from e
-
-    blob_data: bytes = await asyncio.get_event_loop().run_in_executor(
-        None, _extract_blob
-    )
+    offset, size = await run_tar_io(locate_blob_in_tar, tar_path, digest)
 
-    # Verify digest
-    calculated_digest = f"sha256:{hashlib.sha256(blob_data).hexdigest()}"
-    if calculated_digest != digest:
-        raise RegistryError(
-            f"Blob digest mismatch. Expected: {digest}, Calculated: {calculated_digest}"
-        )
+    # Hash chunks in the reader threads as they are read, rather than hashing
+    # the whole blob again on the event loop once it is in memory
+    chunks = [
+        chunk async for chunk in stream_blob_from_tar(tar_path, digest, offset, size)
+    ]
+    return b"".join(chunks)
 
-    return blob_data
 
+def locate_blob_in_tar(tar_path: str, digest: str) -> tuple[int, int]:
+    """Locate blob data inside tar file.
+
+    Args:
+        tar_path: Path to tar file
+        digest: Blob digest
+
+    Returns:
+        Tuple of (data offset, size) of the blob within the uncompressed tar
+        stream, which ``open_tar_data`` opens
+
+    Raises:
+        RegistryError: If blob not found or not stored as a regular file
+            or a link to one
+    """
+    if not is_valid_digest(digest):
+        raise RegistryError(f"Invalid blob digest: {digest}")
+
+    # Docker and OCI archives store blobs under blobs/<algorithm>/<hex>
+    algorithm, _, hex_digest = digest.partition(":")
+    blob_filename = f"blobs/{algorithm}/{hex_digest}"
+
+    members = get_tar_members(tar_path)
+    if blob_filename not in members:
+        raise RegistryError(f"Blob not found in tar: {digest}")
+
+    # A blob stored as a link is read from the member holding its data
+    blob_member = resolve_tar_member(members, blob_filename)
+    if blob_member is None:
+        raise RegistryError(f"Blob is not a regular file in tar: {digest}")
+
+    return blob_member.offset_data, blob_member.size
+
+
+def open_tar_data(tar_path: str) -> io.BufferedIOBase:
+    """Open the uncompressed stream of a tar file that blob offsets point into.
+
+    Plain archives are opened as they are. Compressed ones (which ``tarfile``
+    and so validation accept) are opened through their decompressor, so
+    seeking to a blob decompresses the data before it.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Binary stream of the uncompressed archive
+    """
+    return open_tar_stream(tar_path, get_tar_index(tar_path).compression)
+
+
+async def stream_blob_from_tar(
+    tar_path: str,
+    digest: str,
+    offset: int,
+    size: int,
+    chunk_size: int = TAR_READ_CHUNK_SIZE,
+    verify: bool = True,
+) -> AsyncIterator[bytes]:
+    """Stream blob data from tar file, verifying its digest on the fly.
+
+    The next chunk is read from disk while the current one is being sent, so
+    at most two chunks are held in memory. The digest is checked before the
+    final chunk is yielded, so a corrupt blob never completes an upload.
+
+    Args:
+        tar_path: Path to tar file
+        digest: Expected blob digest
+        offset: Offset of blob data within the uncompressed tar stream
+        size: Blob size in bytes
+        chunk_size: Size of each chunk read from disk
+        verify: Hash the data and check it against ``digest``. Without it
+            the blob is trusted to match the digest its tar path names.
+
+    Yields:
+        Blob data chunks
+
+    Raises:
+        RegistryError: If the tar file is truncated or the digest mismatches
+    """
+    hasher = get_hasher(digest.partition(":")[0]) if verify else None
+    remaining = size
+
+    def read_and_hash(tar_file: io.BufferedIOBase, length: int) -> bytes:
+        # Hash in the worker thread next to the read: OpenSSL releases the GIL
+        # while hashing, and the event loop never spends time on SHA-256
+        try:
+            chunk = tar_file.read(length)
+        except (EOFError, zlib.error, lzma.LZMAError) as e:
+            raise RegistryError(f"Cannot decompress tar file reading {digest}") from e
+        if hasher is not None:
+            hasher.update(chunk)
+        return chunk
+
+    def seek(tar_file: io.BufferedIOBase) -> None:
+        try:
+            tar_file.seek(offset)
+        except (EOFError, zlib.error, lzma.LZMAError) as e:
+            raise RegistryError(f"Cannot decompress tar file reading {digest}") from e
+
+    tar_file = await run_tar_io(open_tar_data, tar_path)
+    pending_read: asyncio.Future[bytes] | None = None
+    try:
+        # Seeking a compressed stream decompresses, so it stays off the loop
+        await run_tar_io(seek, tar_file)
+
+        length = min(chunk_size, remaining)
+        pending_read = run_tar_io(read_and_hash, tar_file, length)
+
+        while True:
+            chunk = await pending_read
+            pending_read = None
+            if len(chunk) != length:
+                raise RegistryError(f"Unexpected end of tar file reading {digest}")
+
+            remaining -= len(chunk)
+
+            if remaining == 0:
+                if hasher is not None and not digest_matches(hasher, digest):
+                    raise RegistryError(
+                        f"Blob digest mismatch. Expected: {digest}, "
+                        f"Calculated: {hasher.name}:{hasher.hexdigest()}"
+                    )
+                yield chunk
+                return
+
+            # Read ahead while the current chunk is written to the socket
+            length = min(chunk_size, remaining)
+            pending_read = run_tar_io(read_and_hash, tar_file, length)
+            yield chunk
+    finally:
+        if pending_read is not None:
+            # Never close the file under a read still running in the executor
+            await asyncio.wait([pending_read])
+        tar_file.close()
 
-def chunk_data(data: bytes, chunk_size: int = 5 * 1024 * 1024) -> Iterator[bytes]:
+
+async def report_progress(
+    chunks: AsyncIterable[bytes],
+    digest: str,
+    size: int,
+    progress_callback: ProgressCallback,
+) -> AsyncIterator[bytes]:
+    """Pass chunks through, reporting upload progress at coarse granularity.
+
+    Progress is reported after a chunk has been consumed by the uploader, at
+    most ``PROGRESS_REPORTS_PER_BLOB`` times per blob and always once when
+    the last byte is sent, so callbacks stay off the per-chunk hot path.
+
+    Args:
+        chunks: Blob data chunks
+        digest: Blob digest
+        size: Blob size in bytes
+        progress_callback: Called with (digest, bytes sent, size)
+
+    Yields:
+        Blob data chunks
+    """
+    report_interval = max(1, size // PROGRESS_REPORTS_PER_BLOB)
+    sent = reported = 0
+
+    async for chunk in chunks:
+        yield chunk
+
+        sent += len(chunk)
+        if sent - reported >= report_interval or sent == size:
+            progress_callback(digest, sent, size)
+            reported = sent
+
+
+def chunk_data(data: bytes, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
     """Split data into chunks for upload."""
     for i in range(0, len(data), chunk_size):
         yield data[i : i + chunk_size]
 
 
+async def iter_blob_chunks(
+    blob_data: bytes | AsyncIterable[bytes], chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Iterate over blob data as chunks, whether in memory or streamed.
+
+    Args:
+        blob_data: Blob data, or an async iterable streaming it
+        chunk_size: Size of each chunk when splitting in-memory data
+
+    Yields:
+        Blob data chunks
+    """
+    if isinstance(blob_data, bytes):
+        for chunk in chunk_data(blob_data, chunk_size):
+            yield chunk
+        return
+
+    async for chunk in blob_data:
+        yield chunk
+
+
+def resolve_location(config: RegistryConfig, location: str) -> str:
+    """Resolve an upload Location header to an absolute URL.
+
+    Registries usually return an absolute URL or an absolute path. Both are
+    handled with plain string checks; only other relative references fall
+    back to full URL resolution.
+
+    Args:
+        config: Registry configuration
+        location: Location header value
+
+    Returns:
+        Absolute upload URL, keeping any query parameters
+    """
+    if location.startswith(("http://", "https://")):
+        return location
+
+    if location.startswith("/"):
+        # Absolute paths are relative to the origin, not to a path prefix
+        return f"{config.origin}{location}"
+
+    return str(config.api_url.join(URL(location)))
+
+
+def build_digest_url(location: str, digest: str) -> str:
+    """Build the URL completing an upload with the blob digest.
+
+    Args:
+        location: Upload location URL, possibly with query parameters
+        digest: Blob digest
+
+    Returns:
+        Location URL with the digest query parameter appended
+    """
+    # Use & if URL already has query parameters, otherwise use ?
+    separator = "&" if "?" in location else "?"
+    return f"{location}{separator}digest={digest}"
+
+
 async def start_upload(
     session: aiohttp.ClientSession, config: RegistryConfig, repository: str
 ) -> UploadSession:
@@ -103,7 +421,7 @@ async def start_upload(
     Returns:
         Upload session information
     """
-    url = f"{config.base_url}/v2/{repository}/blobs/uploads/"
+    url = config.api_url / repository / "blobs" / "uploads" / ""
 
     result = await make_post_request(session, url, config)
 
@@ -111,16 +429,59 @@ async def start_upload(
     if not location:
         raise RegistryError("No Location header in upload response")
 
-    if not location.startswith("http"):
-        location = f"{config.base_url}{location}"
+    location = resolve_location(config, location)
 
     upload_uuid = result.headers.get("Docker-Upload-UUID", "")
 
     return UploadSession(upload_url=location, upload_uuid=upload_uuid)
 
 
+async def mount_blob(
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    from_repository: str,
+    session: aiohttp.ClientSession | None = None,
+) -> bool:
+    """Mount a blob from another repository of the same registry.
+
+    A cross-repository mount links an existing blob into the repository with
+    a single request, without transferring its data.
+
+    Args:
+        config: Registry configuration
+        repository: Repository to mount the blob into
+        digest: Blob digest
+        from_repository: Repository that already has the blob
+        session: Optional HTTP session to reuse
+
+    Returns:
+        True if the blob was mounted, False if the registry started a
+        regular upload instead (mounting unsupported or source lacks blob)
+
+    Raises:
+        RegistryError: If the request fails
+    """
+    url = (config.api_url / repository / "blobs" / "uploads" / "").with_query(
+        {"mount": digest, "from": from_repository}
+    )
+
+    async with session_scope(session) as session:
+        result = await make_post_request(session, url, config)
+
+    if result.status_code != 201:
+        return False
+
+    remember_blob(config, repository, digest, session)
+    return True
+
+
 async def upload_chunk(
-    session: aiohttp.ClientSession, location: str, config: RegistryConfig, chunk: bytes
+    session: aiohttp.ClientSession,
+    location: str,
+    config: RegistryConfig,
+    chunk: bytes,
+    offset: int | None = None,
 ) -> str:
     """Upload single chunk to registry.
 
@@ -129,6 +490,9 @@ async def upload_chunk(
         location: Upload location URL
         config: Registry configuration
         chunk: Chunk data
+        offset: Position of the chunk within the blob. When given, the
+            chunk's byte range is sent so the registry can reject a chunk
+            that does not continue the upload.
 
     Returns:
         Updated location URL
@@ -137,6 +501,8 @@ async def upload_chunk(
         "Content-Type": "application/octet-stream",
         "Content-Length": str(len(chunk)),
     }
+    if offset is not None:
+        headers["Content-Range"] = f"{offset}-{offset + len(chunk) - 1}"
 
     result = await make_patch_request(session, location, config, headers, chunk)
 
@@ -144,10 +510,7 @@ async def upload_chunk(
     if not new_location:
         raise RegistryError("No Location header in chunked upload response")
 
-    if not new_location.startswith("http"):
-        new_location = f"{config.base_url}{new_location}"
-
-    return new_location
+    return resolve_location(config, new_location)
 
 
 async def complete_upload(
@@ -164,7 +527,7 @@ async def complete_upload(
     Returns:
         Blob digest from registry
     """
-    url = f"{location}&digest={digest}"
+    url = build_digest_url(location, digest)
 
     headers = {"Content-Type": "application/octet-stream", "Content-Length": "0"}
 
@@ -177,7 +540,7 @@ async def upload_blob_chunked(
     session: aiohttp.ClientSession,
     config: RegistryConfig,
     repository: str,
-    blob_data: bytes,
+    blob_data: bytes | AsyncIterable[bytes],
     digest: str,
 ) -> str:
     """Upload blob using chunked upload.
@@ -186,7 +549,7 @@ async def upload_blob_chunked(
         session: HTTP session
         config: Registry configuration
         repository: Repository name
-        blob_data: Blob data
+        blob_data: Blob data, or an async iterable streaming it
         digest: Blob digest
 
     Returns:
@@ -196,9 +559,12 @@ async def upload_blob_chunked(
     upload_session = await start_upload(session, config, repository)
     location = upload_session.upload_url
 
-    # Upload chunks
-    for chunk in chunk_data(blob_data):
-        location = await upload_chunk(session, location, config, chunk)
+    # Upload chunks in order; the registry appends each one at the current
+    # end of the upload, so chunks of one blob cannot be sent in parallel
+    offset = 0
+    async for chunk in iter_blob_chunks(blob_data):
+        location = await upload_chunk(session, location, config, chunk, offset)
+        offset += len(chunk)
 
     # Complete upload
     return await complete_upload(session, location, config, digest)
@@ -208,8 +574,9 @@ async def upload_blob_monolithic(
     session: aiohttp.ClientSession,
     config: RegistryConfig,
     repository: str,
-    blob_data: bytes,
+    blob_data: bytes | AsyncIterable[bytes],
     digest: str,
+    size: int | None = None,
 ) -> str:
     """Upload blob in single request.
 
@@ -217,8 +584,9 @@ async def upload_blob_monolithic(
         session: HTTP session
         config: Registry configuration
         repository: Repository name
-        blob_data: Blob data
+        blob_data: Blob data, or an async iterable streaming it
         digest: Blob digest
+        size: Blob size in bytes, required when streaming blob data
 
     Returns:
         Blob digest from registry
@@ -227,13 +595,16 @@ async def upload_blob_monolithic(
     upload_session = await start_upload(session, config, repository)
 
     # Complete upload with digest
-    # Use & if URL already has query parameters, otherwise use ?
-    separator = "&" if "?" in upload_session.upload_url else "?"
-    url = f"{upload_session.upload_url}{separator}digest={digest}"
+    url = build_digest_url(upload_session.upload_url, digest)
+
+    if size is None:
+        if not isinstance(blob_data, bytes):
+            raise RegistryError("Blob size is required when streaming blob data")
+        size = len(blob_data)
 
     headers = {
         "Content-Type": "application/octet-stream",
-        "Content-Length": str(len(blob_data)),
+        "Content-Length": str(size),
     }
 
     result = await make_put_request(session, url, config, headers, blob_data)
@@ -242,7 +613,13 @@ async def upload_blob_monolithic(
 
 
 async def upload_blob(
-    config: RegistryConfig, repository: str, tar_path: str, blob_info: BlobInfo
+    config: RegistryConfig,
+    repository: str,
+    tar_path: str,
+    blob_info: BlobInfo,
+    check_exists: bool = True,
+    progress_callback: ProgressCallback | None = None,
+    session: aiohttp.ClientSession | None = None,
 ) -> str:
     """Upload blob from tar file to registry.
 
@@ -251,6 +628,11 @@ async def upload_blob(
         repository: Repository name
         tar_path: Path to tar file
         blob_info: Blob information
+        check_exists: Skip the upload if the registry already has the blob.
+            Callers that already checked existence can pass False.
+        progress_callback: Optional callback receiving (digest, bytes
+            uploaded, blob size) a bounded number of times per blob
+        session: Optional HTTP session to reuse
 
     Returns:
         Blob digest from registry
@@ -259,25 +641,44 @@ async def upload_blob(
         RegistryError: If upload fails
     """
     # Check if blob already exists
-    if await check_blob_exists(config, repository, blob_info.digest):
+    if check_exists and await check_blob_exists(
+        config, repository, blob_info.digest, session
+    ):
+        if progress_callback is not None:
+            progress_callback(blob_info.digest, blob_info.size, blob_info.size)
         return blob_info.digest
 
-    # Extract blob data from tar
-    blob_data = await extract_blob_from_tar(tar_path, blob_info.digest)
+    # Locate blob data in tar so it can be streamed without loading it whole
+    offset, size = await run_tar_io(locate_blob_in_tar, tar_path, blob_info.digest)
+    chunked = size > MONOLITHIC_UPLOAD_MAX_SIZE
+    blob_stream = stream_blob_from_tar(
+        tar_path,
+        blob_info.digest,
+        offset,
+        size,
+        # Chunked uploads send each chunk read from the tar as one PATCH
+        chunk_size=UPLOAD_CHUNK_SIZE if chunked else TAR_READ_CHUNK_SIZE,
+        verify=config.verify_digests,
+    )
+    if progress_callback is not None:
+        blob_stream = report_progress(
+            blob_stream, blob_info.digest, size, progress_callback
+        )
 
-    session = await create_session()
-    try:
-        # Use chunked upload for large blobs (>5MB), monolithic for smaller ones
-        if len(blob_data) > 5 * 1024 * 1024:
-            return await upload_blob_chunked(
-                session, config, repository, blob_data, blob_info.digest
-            )
-        else:
-            return await upload_blob_monolithic(
-                session, config, repository, blob_data, blob_info.digest
-            )
-
-    except Exception as e:
-        raise RegistryError(f"Failed to upload blob {blob_info.digest}: {e}") from e
-    finally:
-        await session.close()
+    async with session_scope(session) as session:
+        try:
+            if chunked:
+                digest = await upload_blob_chunked(
+                    session, config, repository, blob_stream, blob_info.digest
+                )
+            else:
+                # A single monolithic PUT sends the whole blob in one HTTP
+                # transaction, instead of one PATCH round trip per chunk
+                digest = await upload_blob_monolithic(
+                    session, config, repository, blob_stream, blob_info.digest, size
+                )
+            remember_blob(config, repository, blob_info.digest, session)
+            return digest
+
+        except Exception as e:
+            raise RegistryError(f"Failed to upload blob {blob_info.digest}: {e}") from e
@@ -4,7 +4,7 @@ from typing import Any
 
 import aiohttp
 
-from ..core.session import create_session, make_get_request
+from ..core.session import make_get_request, session_scope
 from ..core.types import RegistryConfig
 from ..exceptions import RegistryError
 from .manifests import delete_manifest, get_manifest
@@ -41,7 +41,7 @@ async def get_config_blob(
     Returns:
         Config blob data
     """
-    config_url = f"{config.base_url}/v2/{repository}/blobs/{config_digest}"
+    config_url = config.api_url / repository / "blobs" / config_digest
     result = await make_get_request(session, config_url, config, expect_json=True)
 
     if not result.json_data:
@@ -82,7 +82,10 @@ def create_image_info(
 
 
 async def get_image_info(
-    config: RegistryConfig, repository: str, tag: str
+    config: RegistryConfig,
+    repository: str,
+    tag: str,
+    session: aiohttp.ClientSession | None = None,
 ) -> dict[str, Any]:
     """Get detailed image information.
 
@@ -90,6 +93,7 @@ async def get_image_info(
         config: Registry configuration
         repository: Repository name
         tag: Tag name
+        session: Optional HTTP session to reuse
 
     Returns:
         Dictionary with image information
@@ -97,40 +101,48 @@ async def get_image_info(
     Raises:
         RegistryError: If request fails
     """
-    # Get manifest first
-    manifest = await get_manifest(config, repository, tag)
-
-    # Extract config blob info
-    config_info = manifest.get("config", {})
-    config_digest = config_info.get("digest")
-
-    if not config_digest:
-        return {
-            "repository": repository,
-            "tag": tag,
-            "manifest": manifest,
-            "config": None,
-        }
-
-    # Get config blob
-    session = await create_session()
-    try:
-        config_blob = await get_config_blob(session, config, repository, config_digest)
-        return create_image_info(repository, tag, manifest, config_blob)
-
-    except Exception as e:
-        raise RegistryError(f"Failed to get config for {repository}:{tag}: {e}") from e
-    finally:
-        await session.close()
-
-
-async def delete_image(config: RegistryConfig, repository: str, tag: str) -> bool:
+    async with session_scope(session) as session:
+        # Get manifest first
+        manifest = await get_manifest(config, repository, tag, session=session)
+
+        # Extract config blob info
+        config_info = manifest.get("config", {})
+        config_digest = config_info.get("digest")
+
+        if not config_digest:
+            return {
+                "repository": repository,
+                "tag": tag,
+                "manifest": manifest,
+                "config": None,
+            }
+
+        # Get config blob
+        try:
+            config_blob = await get_config_blob(
+                session, config, repository, config_digest
+            )
+            return create_image_info(repository, tag, manifest, config_blob)
+
+        except Exception as e:
+            raise RegistryError(
+                f"Failed to get config for {repository}:{tag}: {e}"
+            ) from e
+
+
+async def delete_image(
+    config: RegistryConfig,
+    repository: str,
+    tag: str,
+    session: aiohttp.ClientSession | None = None,
+) -> bool:
     """Delete an image from registry.
 
     Args:
         config: Registry configuration
         repository: Repository name
         tag: Tag name
+        session: Optional HTTP session to reuse
 
     Returns:
         True if deletion successful
@@ -138,19 +150,23 @@ async def delete_image(config: RegistryConfig, repository: str, tag: str) -> boo
     Raises:
         RegistryError: If deletion fails
     """
-    # Get manifest to get digest
-    manifest = await get_manifest(config, repository, tag)
-    manifest_digest = manifest.get("digest")
+    async with session_scope(session) as session:
+        # Get manifest to get digest
+        manifest = await get_manifest(config, repository, tag, session=session)
+        manifest_digest = manifest.get("digest")
 
-    if not manifest_digest:
-        raise RegistryError(f"Could not get digest for {repository}:{tag}")
+        if not manifest_digest:
+            raise RegistryError(f"Could not get digest for {repository}:{tag}")
 
-    # Delete using digest
-    return await delete_manifest(config, repository, manifest_digest)
+        # Delete using digest
+        return await delete_manifest(config, repository, manifest_digest, session)
 
 
 async def delete_image_by_digest(
-    config: RegistryConfig, repository: str, digest: str
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    session: aiohttp.ClientSession | None = None,
 ) -> bool:
     """Delete an image by its digest.
 
@@ -158,6 +174,7 @@ async def delete_image_by_digest(
         config: Registry configuration
         repository: Repository name
         digest: Manifest digest
+        session: Optional HTTP session to reuse
 
     Returns:
         True if deletion successful
@@ -165,4 +182,4 @@ async def delete_image_by_digest(
     Raises:
         RegistryError: If deletion fails
     """
-    return await delete_manifest(config, repository, digest)
+    return await delete_manifest(config, repository, digest, session)
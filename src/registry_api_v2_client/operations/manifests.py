@@ -1,17 +1,19 @@
 """Async manifest operations for registry."""
 
-import hashlib
-import json
 from typing import Any
 
+import aiohttp
+
+from ..core import json_codec
 from ..core.session import (
-    create_session,
     make_delete_request,
     make_get_request,
     make_put_request,
+    session_scope,
 )
 from ..core.types import ManifestInfo, RegistryConfig, RequestResult
 from ..exceptions import RegistryError
+from ..utils.digest import calculate_digest
 
 
 def create_manifest_headers(accept_type: str | None = None) -> dict[str, str]:
@@ -77,9 +79,7 @@ def calculate_manifest_digest(manifest: dict[str, Any]) -> str:
     Returns:
         SHA256 digest
     """
-    manifest_json = json.dumps(manifest, separators=(",", ":")).encode()
-    digest = hashlib.sha256(manifest_json).hexdigest()
-    return f"sha256:{digest}"
+    return calculate_digest(json_codec.dumps(manifest))
 
 
 async def get_manifest(
@@ -87,6 +87,7 @@ async def get_manifest(
     repository: str,
     reference: str,
     media_type: str = "application/vnd.docker.distribution.manifest.v2+json",
+    session: aiohttp.ClientSession | None = None,
 ) -> dict[str, Any]:
     """Get manifest from registry.
 
@@ -95,23 +96,26 @@ async def get_manifest(
         repository: Repository name
         reference: Tag or digest
         media_type: Accept media type
+        session: Optional HTTP session to reuse
 
     Returns:
         Manifest dictionary
     """
-    url = f"{config.base_url}/v2/{repository}/manifests/{reference}"
+    url = config.api_url / repository / "manifests" / reference
     headers = create_manifest_headers(media_type)
 
-    session = await create_session()
-    try:
+    async with session_scope(session) as session:
         result = await make_get_request(session, url, config, headers, expect_json=True)
         return parse_manifest_response(result)
-    finally:
-        await session.close()
 
 
 async def upload_manifest(
-    config: RegistryConfig, repository: str, reference: str, manifest: dict[str, Any]
+    config: RegistryConfig,
+    repository: str,
+    reference: str,
+    manifest: dict[str, Any],
+    session: aiohttp.ClientSession | None = None,
+    manifest_bytes: bytes | None = None,
 ) -> str:
     """Upload manifest to registry.
 
@@ -120,43 +124,48 @@ async def upload_manifest(
         repository: Repository name
         reference: Tag or digest
         manifest: Manifest dictionary
+        session: Optional HTTP session to reuse
+        manifest_bytes: Optional pre-serialized manifest, used as the request
+            body so pushing one manifest under many tags serializes it once
 
     Returns:
         Manifest digest
     """
-    url = f"{config.base_url}/v2/{repository}/manifests/{reference}"
-    manifest_json = json.dumps(manifest, separators=(",", ":"))
+    url = config.api_url / repository / "manifests" / reference
+    manifest_json = manifest_bytes or json_codec.dumps(manifest)
 
     headers = {"Content-Type": "application/vnd.docker.distribution.manifest.v2+json"}
 
-    session = await create_session()
-    try:
+    async with session_scope(session) as session:
         result = await make_put_request(session, url, config, headers, manifest_json)
 
         # Return digest from header or calculate it
         manifest_digest = result.headers.get("Docker-Content-Digest")
-        return manifest_digest or calculate_manifest_digest(manifest)
+        if manifest_digest:
+            return manifest_digest
+        # Hash the bytes that were sent instead of serializing the manifest again
+        return calculate_digest(manifest_json)
 
-    finally:
-        await session.close()
 
-
-async def delete_manifest(config: RegistryConfig, repository: str, digest: str) -> bool:
+async def delete_manifest(
+    config: RegistryConfig,
+    repository: str,
+    digest: str,
+    session: aiohttp.ClientSession | None = None,
+) -> bool:
     """Delete manifest from registry.
 
     Args:
         config: Registry configuration
         repository: Repository name
         digest: Manifest digest
+        session: Optional HTTP session to reuse
 
     Returns:
         True if deletion successful
     """
-    url = f"{config.base_url}/v2/{repository}/manifests/{digest}"
+    url = config.api_url / repository / "manifests" / digest
 
-    session = await create_session()
-    try:
+    async with session_scope(session) as session:
         await make_delete_request(session, url, config)
         return True
-    finally:
-        await session.close()
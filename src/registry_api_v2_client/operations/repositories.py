@@ -1,12 +1,20 @@
 """Async repository operations for registry."""
 
+import re
+from collections.abc import AsyncIterator
 from typing import Any
 
-from ..core.connectivity import check_connectivity
-from ..core.session import create_session, make_get_request
+import aiohttp
+from yarl import URL
+
+from ..core.connectivity import ensure_connectivity
+from ..core.session import make_get_request, session_scope
 from ..core.types import RegistryConfig
 from ..exceptions import RegistryError
 
+# Matches the target of a rel="next" entry in an RFC 8288 Link header
+NEXT_LINK_PATTERN = re.compile(r'<([^>]+)>\s*;[^,]*\brel="?next"?')
+
 
 def extract_repositories_from_response(json_data: dict[str, Any] | None) -> list[str]:
     """Extract repositories list from API response.
@@ -40,11 +48,31 @@ def extract_tags_from_response(json_data: dict[str, Any] | None) -> list[str]:
     return tags if tags else []
 
 
-async def list_repositories(config: RegistryConfig) -> list[str]:
+def extract_next_link(headers: dict[str, str]) -> str | None:
+    """Extract next page URL from a paginated API response.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Target of the ``rel="next"`` Link header, or None on the last page
+    """
+    link = headers.get("Link") or headers.get("link")
+    if not link:
+        return None
+
+    match = NEXT_LINK_PATTERN.search(link)
+    return match.group(1) if match else None
+
+
+async def list_repositories(
+    config: RegistryConfig, session: aiohttp.ClientSession | None = None
+) -> list[str]:
     """List all repositories in registry.
 
     Args:
         config: Registry configuration
+        session: Optional HTTP session to reuse
 
     Returns:
         List of repository names
@@ -52,28 +80,31 @@ async def list_repositories(config: RegistryConfig) -> list[str]:
     Raises:
         RegistryError: If request fails
     """
-    # Check connectivity first
-    await check_connectivity(config)
+    url = config.api_url / "_catalog"
 
-    url = f"{config.base_url}/v2/_catalog"
+    async with session_scope(session) as session:
+        # Check connectivity first
+        await ensure_connectivity(config, session)
 
-    session = await create_session()
-    try:
-        result = await make_get_request(session, url, config, expect_json=True)
-        return extract_repositories_from_response(result.json_data)
+        try:
+            result = await make_get_request(session, url, config, expect_json=True)
+            return extract_repositories_from_response(result.json_data)
 
-    except Exception as e:
-        raise RegistryError(f"Failed to list repositories: {e}") from e
-    finally:
-        await session.close()
+        except Exception as e:
+            raise RegistryError(f"Failed to list repositories: {e}") from e
 
 
-async def list_tags(config: RegistryConfig, repository: str) -> list[str]:
+async def list_tags(
+    config: RegistryConfig,
+    repository: str,
+    session: aiohttp.ClientSession | None = None,
+) -> list[str]:
     """List all tags for a repository.
 
     Args:
         config: Registry configuration
         repository: Repository name
+        session: Optional HTTP session to reuse
 
     Returns:
         List of tag names
@@ -81,17 +112,49 @@ async def list_tags(config: RegistryConfig, repository: str) -> list[str]:
     Raises:
         RegistryError: If request fails
     """
-    # Check connectivity first
-    await check_connectivity(config)
+    return [tag async for tag in iter_tags(config, repository, session=session)]
+
+
+async def iter_tags(
+    config: RegistryConfig,
+    repository: str,
+    page_size: int = 1000,
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[str]:
+    """Iterate over all tags for a repository, one page at a time.
+
+    Follows the registry's ``Link`` header pagination, so only one page of
+    tags is held in memory and the first tags are available before the last
+    page has been requested.
+
+    Args:
+        config: Registry configuration
+        repository: Repository name
+        page_size: Maximum number of tags requested per page
+        session: Optional HTTP session to reuse
+
+    Yields:
+        Tag names
+
+    Raises:
+        RegistryError: If request fails
+    """
+    url: URL | None = (config.api_url / repository / "tags" / "list").with_query(
+        n=page_size
+    )
+
+    async with session_scope(session) as session:
+        # Check connectivity first
+        await ensure_connectivity(config, session)
 
-    url = f"{config.base_url}/v2/{repository}/tags/list"
+        while url is not None:
+            try:
+                result = await make_get_request(session, url, config, expect_json=True)
+            except Exception as e:
+                raise RegistryError(f"Failed to list tags for {repository}: {e}") from e
 
-    session = await create_session()
-    try:
-        result = await make_get_request(session, url, config, expect_json=True)
-        return extract_tags_from_response(result.json_data)
+            for tag in extract_tags_from_response(result.json_data):
+                yield tag
 
-    except Exception as e:
-        raise RegistryError(f"Failed to list tags for {repository}: {e}") from e
-    finally:
-        await session.close()
+            next_link = extract_next_link(result.headers)
+            url = config.api_url.join(URL(next_link)) if next_link else None
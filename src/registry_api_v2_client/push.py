@@ -1,18 +1,36 @@
 """Async functional style push operations."""
 
 import asyncio
+from collections.abc import Iterable, Sequence
+from typing import NoReturn
 
-from .core.connectivity import check_connectivity
-from .core.types import BlobInfo, ManifestInfo, RegistryConfig
+import aiohttp
+
+from .core import json_codec
+from .core.connectivity import check_connectivity, ensure_connectivity
+from .core.executor import run_tar_io
+from .core.session import session_scope
+from .core.types import BlobInfo, ManifestInfo, ProgressCallback, RegistryConfig
 from .exceptions import RegistryError
-from .operations.blobs import upload_blob
+from .operations.blobs import (
+    check_blob_exists,
+    forget_blobs,
+    is_blob_known,
+    mount_blob,
+    upload_blob,
+)
 from .operations.manifests import create_manifest_v2, upload_manifest
-from .tar.processor import process_tar_file
-from .tar.tags import extract_original_tags, get_primary_tag, parse_repository_tag
+from .tar.processor import process_tar_file_with_tags
+from .tar.tags import parse_repository_tag
 
 
 async def upload_all_blobs(
-    config: RegistryConfig, repository: str, tar_path: str, blob_infos: list[BlobInfo]
+    config: RegistryConfig,
+    repository: str,
+    tar_path: str,
+    blob_infos: Sequence[BlobInfo],
+    progress_callback: ProgressCallback | None = None,
+    session: aiohttp.ClientSession | None = None,
 ) -> list[str]:
     """Upload all blobs concurrently to registry.
 
@@ -21,20 +39,121 @@ async def upload_all_blobs(
         repository: Repository name
         tar_path: Path to tar file
         blob_infos: List of blob information
+        progress_callback: Optional callback receiving (digest, bytes
+            uploaded, blob size) as each blob progresses
+        session: Optional HTTP session to reuse
 
     Returns:
         List of uploaded blob digests
     """
-    # Upload blobs concurrently for better performance
-    tasks = [
-        upload_blob(config, repository, tar_path, blob_info) for blob_info in blob_infos
+    # Layers repeated within an image are checked and uploaded only once
+    unique_blobs = list(
+        {blob_info.digest: blob_info for blob_info in blob_infos}.values()
+    )
+
+    # Check all blobs in one concurrent round so existence checks don't
+    # serialize behind the uploads
+    exists = await asyncio.gather(
+        *[
+            check_blob_exists(config, repository, blob_info.digest, session)
+            for blob_info in unique_blobs
+        ]
+    )
+    missing_blobs = []
+    for blob_info, blob_exists in zip(unique_blobs, exists, strict=True):
+        if not blob_exists:
+            missing_blobs.append(blob_info)
+        elif progress_callback is not None:
+            progress_callback(blob_info.digest, blob_info.size, blob_info.size)
+
+    # Start the largest blobs first, so with a bounded number in flight their
+    # hashing and transfer overlap the small ones instead of trailing at the end
+    missing_blobs.sort(key=lambda blob_info: blob_info.size, reverse=True)
+
+    # Upload only missing blobs concurrently, but bound how many are in flight
+    # so images with many large layers don't overwhelm the registry
+    semaphore = asyncio.Semaphore(config.max_concurrent_uploads)
+
+    async def upload_guarded(blob_info: BlobInfo) -> str:
+        async with semaphore:
+            return await upload_blob(
+                config,
+                repository,
+                tar_path,
+                blob_info,
+                check_exists=False,
+                progress_callback=progress_callback,
+                session=session,
+            )
+
+    uploaded_digests = await asyncio.gather(
+        *[upload_guarded(blob_info) for blob_info in missing_blobs]
+    )
+
+    registry_digests = {
+        blob_info.digest: digest
+        for blob_info, digest in zip(missing_blobs, uploaded_digests, strict=True)
+    }
+    return [
+        registry_digests.get(blob_info.digest, blob_info.digest)
+        for blob_info in blob_infos
     ]
 
-    return await asyncio.gather(*tasks)
+
+async def mount_all_blobs(
+    config: RegistryConfig,
+    repository: str,
+    from_repository: str,
+    tar_path: str,
+    blob_infos: Iterable[BlobInfo],
+    session: aiohttp.ClientSession | None = None,
+) -> None:
+    """Make blobs available in a repository by mounting them from another.
+
+    Blobs the registry does not mount are uploaded from the tar file instead.
+
+    Args:
+        config: Registry configuration
+        repository: Repository that needs the blobs
+        from_repository: Repository that already has the blobs
+        tar_path: Path to tar file
+        blob_infos: List of blob information
+        session: Optional HTTP session to reuse
+    """
+    unique_blobs = list(
+        {blob_info.digest: blob_info for blob_info in blob_infos}.values()
+    )
+    semaphore = asyncio.Semaphore(config.max_concurrent_uploads)
+
+    async def mount_guarded(blob_info: BlobInfo) -> bool:
+        if is_blob_known(config, repository, blob_info.digest, session):
+            return True
+        async with semaphore:
+            return await mount_blob(
+                config, repository, blob_info.digest, from_repository, session
+            )
+
+    mounted = await asyncio.gather(
+        *[mount_guarded(blob_info) for blob_info in unique_blobs]
+    )
+
+    unmounted_blobs = [
+        blob_info
+        for blob_info, blob_mounted in zip(unique_blobs, mounted, strict=True)
+        if not blob_mounted
+    ]
+    if unmounted_blobs:
+        await upload_all_blobs(
+            config, repository, tar_path, unmounted_blobs, session=session
+        )
 
 
 async def create_and_upload_manifest(
-    config: RegistryConfig, repository: str, tag: str, manifest_info: ManifestInfo
+    config: RegistryConfig,
+    repository: str,
+    tag: str,
+    manifest_info: ManifestInfo,
+    session: aiohttp.ClientSession | None = None,
 ) -> str:
     """Create manifest and upload to registry.
 
@@ -43,22 +162,93 @@ async def create_and_upload_manifest(
         repository: Repository name
         tag: Tag name
         manifest_info: Manifest information
+        session: Optional HTTP session to reuse
 
     Returns:
         Manifest digest
     """
-    # Create manifest
+    digests = await upload_manifest_tags(
+        config, [(repository, tag)], manifest_info, session
+    )
+    return digests[0]
+
+
+async def upload_manifest_tags(
+    config: RegistryConfig,
+    repo_tags: list[tuple[str, str]],
+    manifest_info: ManifestInfo,
+    session: aiohttp.ClientSession | None = None,
+) -> list[str]:
+    """Create manifest once and upload it under several tags concurrently.
+
+    Args:
+        config: Registry configuration
+        repo_tags: List of (repository, tag) references
+        manifest_info: Manifest information
+        session: Optional HTTP session to reuse
+
+    Returns:
+        Manifest digest for each reference, in order
+    """
+    # Create and serialize manifest once; every tag references the same content
     manifest = create_manifest_v2(manifest_info)
+    manifest_bytes = json_codec.dumps(manifest)
 
-    # Upload manifest
-    return await upload_manifest(config, repository, tag, manifest)
+    # Upload manifest for all tags concurrently over one shared connection pool
+    try:
+        async with session_scope(session) as session:
+            return await asyncio.gather(
+                *[
+                    upload_manifest(
+                        config,
+                        repository,
+                        tag,
+                        manifest,
+                        session=session,
+                        manifest_bytes=manifest_bytes,
+                    )
+                    for repository, tag in repo_tags
+                ]
+            )
+    except RegistryError:
+        # The registry may have lost blobs we assumed present; recheck next time
+        for repository in {repository for repository, _ in repo_tags}:
+            forget_blobs(config, repository, session)
+        raise
 
 
-async def check_registry_connectivity(registry_url: str) -> bool:
+def raise_tar_error(error: BaseException) -> NoReturn:
+    """Re-raise a failure to process the tar file as a registry error.
+
+    Library errors and a missing file propagate unchanged; anything else
+    (such as a truncated or corrupt archive) is wrapped in RegistryError, so
+    callers catching RegistryError see every tar processing failure.
+
+    Args:
+        error: Exception raised while processing the tar file
+
+    Raises:
+        RegistryError: Wrapping the error, unless it already is one
+    """
+    if isinstance(error, Exception) and not isinstance(
+        error, RegistryError | FileNotFoundError
+    ):
+        raise RegistryError(f"Failed to process tar file: {error}") from error
+    raise error
+
+
+async def check_registry_connectivity(
+    registry_url: str,
+    session: aiohttp.ClientSession | None = None,
+    warmup: int = 0,
+) -> bool:
     """Check registry connectivity.
 
     Args:
         registry_url: Registry URL
+        session: Optional HTTP session to reuse across calls
+        warmup: Number of keep-alive connections to open in ``session`` up
+            front, so later concurrent calls skip connection setup
 
     Returns:
         True if registry is accessible
@@ -67,7 +257,7 @@ async def check_registry_connectivity(registry_url: str) -> bool:
         RegistryError: If connectivity check fails
     """
     config = RegistryConfig(url=registry_url)
-    return await check_connectivity(config)
+    return await check_connectivity(config, session, warmup)
 
 
 async def push_docker_tar(
@@ -76,6 +266,10 @@ async def push_docker_tar(
     repository: str | None = None,
     tag: str | None = None,
     timeout: int = 300,
+    max_concurrent_uploads: int = 8,
+    verify_digests: bool = False,
+    progress_callback: ProgressCallback | None = None,
+    session: aiohttp.ClientSession | None = None,
 ) -> str:
     """Push Docker tar file to registry asynchronously.
 
@@ -88,6 +282,13 @@ async def push_docker_tar(
         repository: Repository name (optional, extracted from tar if not provided)
         tag: Tag name (optional, extracted from tar if not provided)
         timeout: Request timeout in seconds
+        max_concurrent_uploads: Maximum number of blobs uploaded at once
+        verify_digests: Hash each blob while uploading and fail on a digest
+            mismatch before the registry sees the whole blob
+        progress_callback: Optional callback receiving (digest, bytes
+            uploaded, blob size) as each blob progresses
+        session: Optional HTTP session to reuse; otherwise one session is
+            shared by every request of the push
 
     Returns:
         Manifest digest of pushed image
@@ -107,58 +308,75 @@ async def push_docker_tar(
         await push_docker_tar("nginx.tar", "http://localhost:15000", repository="my-nginx", tag="v1.0")
     """
     # Create registry configuration
-    config = RegistryConfig(url=registry_url, timeout=timeout)
-
-    # Check connectivity first
-    await check_connectivity(config)
+    config = RegistryConfig(
+        url=registry_url,
+        timeout=timeout,
+        max_concurrent_uploads=max_concurrent_uploads,
+        verify_digests=verify_digests,
+    )
 
-    # Extract original tags from tar file if not provided
-    original_repo: str | None = None
-    original_tag: str | None = None
+    # One session for the whole push, so every request reuses pooled
+    # keep-alive connections instead of paying a new handshake
+    async with session_scope(session) as session:
+        # Check connectivity while the tar file is processed; the original
+        # tags and the manifest info come from a single tar pass
+        connectivity, processed = await asyncio.gather(
+            ensure_connectivity(config, session),
+            run_tar_io(process_tar_file_with_tags, tar_path),
+            return_exceptions=True,
+        )
 
-    if repository is None or tag is None:
-        try:
-            # Run tag extraction in thread pool since it involves file I/O
-            primary_tag = await asyncio.get_event_loop().run_in_executor(
-                None, get_primary_tag, tar_path
-            )
+        # Report a connectivity failure first
+        if isinstance(connectivity, BaseException):
+            raise connectivity
 
-            if primary_tag:
-                original_repo, original_tag = primary_tag
-        except Exception:
-            # If tag extraction fails, we'll use defaults below
-            pass
+        if isinstance(processed, BaseException):
+            raise_tar_error(processed)
+        original_tags, manifest_info, validated_tar_path = processed
 
-    # Determine final repository and tag
-    final_repository = repository or original_repo
-    final_tag = tag or original_tag or "latest"
+        # Fall back to the primary (first) original tag if not provided
+        original_repo: str | None = None
+        original_tag: str | None = None
+        if original_tags:
+            original_repo, original_tag = parse_repository_tag(original_tags[0])
 
-    if not final_repository:
-        raise RegistryError(
-            "No repository specified and could not extract repository from tar file. "
-            "Please provide a repository name or ensure the tar file contains valid repository tags."
-        )
+        # Determine final repository and tag
+        final_repository = repository or original_repo
+        final_tag = tag or original_tag or "latest"
 
-    # Validate and process tar file
-    # This runs in thread pool since it involves file I/O
-    manifest_info, validated_tar_path = await asyncio.get_event_loop().run_in_executor(
-        None, process_tar_file, tar_path
-    )
-
-    # Collect all blobs (config + layers)
-    all_blobs = [manifest_info.config] + list(manifest_info.layers)
+        if not final_repository:
+            raise RegistryError(
+                "No repository specified and could not extract repository from tar file. "
+                "Please provide a repository name or ensure the tar file contains valid repository tags."
+            )
 
-    # Upload all blobs concurrently
-    await upload_all_blobs(config, final_repository, validated_tar_path, all_blobs)
+        # Collect all blobs (config + layers)
+        all_blobs = (manifest_info.config, *manifest_info.layers)
+
+        # Upload all blobs concurrently
+        await upload_all_blobs(
+            config,
+            final_repository,
+            validated_tar_path,
+            all_blobs,
+            progress_callback=progress_callback,
+            session=session,
+        )
 
-    # Create and upload manifest
-    return await create_and_upload_manifest(
-        config, final_repository, final_tag, manifest_info
-    )
+        # Create and upload manifest
+        return await create_and_upload_manifest(
+            config, final_repository, final_tag, manifest_info, session
+        )
 
 
 async def push_docker_tar_with_original_tags(
-    tar_path: str, registry_url: str, timeout: int = 300
+    tar_path: str,
+    registry_url: str,
+    timeout: int = 300,
+    max_concurrent_uploads: int = 8,
+    verify_digests: bool = False,
+    progress_callback: ProgressCallback | None = None,
+    session: aiohttp.ClientSession | None = None,
 ) -> str:
     """Push Docker tar file using its original repository and tag.
 
@@ -168,6 +386,13 @@ async def push_docker_tar_with_original_tags(
         tar_path: Path to Docker tar file
         registry_url: Registry URL
         timeout: Request timeout in seconds
+        max_concurrent_uploads: Maximum number of blobs uploaded at once
+        verify_digests: Hash each blob while uploading and fail on a digest
+            mismatch before the registry sees the whole blob
+        progress_callback: Optional callback receiving (digest, bytes
+            uploaded, blob size) as each blob progresses
+        session: Optional HTTP session to reuse; otherwise one session is
+            shared by every request of the push
 
     Returns:
         Manifest digest of pushed image
@@ -182,11 +407,21 @@ async def push_docker_tar_with_original_tags(
         repository=None,  # Force extraction from tar
         tag=None,  # Force extraction from tar
         timeout=timeout,
+        max_concurrent_uploads=max_concurrent_uploads,
+        verify_digests=verify_digests,
+        progress_callback=progress_callback,
+        session=session,
     )
 
 
 async def push_docker_tar_with_all_original_tags(
-    tar_path: str, registry_url: str, timeout: int = 300
+    tar_path: str,
+    registry_url: str,
+    timeout: int = 300,
+    max_concurrent_uploads: int = 8,
+    verify_digests: bool = False,
+    progress_callback: ProgressCallback | None = None,
+    session: aiohttp.ClientSession | None = None,
 ) -> list[str]:
     """Push Docker tar file with ALL original repository tags preserved.
 
@@ -197,6 +432,13 @@ async def push_docker_tar_with_all_original_tags(
         tar_path: Path to Docker tar file
         registry_url: Registry URL
         timeout: Request timeout in seconds
+        max_concurrent_uploads: Maximum number of blobs uploaded at once
+        verify_digests: Hash each blob while uploading and fail on a digest
+            mismatch before the registry sees the whole blob
+        progress_callback: Optional callback receiving (digest, bytes
+            uploaded, blob size) as each blob progresses
+        session: Optional HTTP session to reuse; otherwise one session is
+            shared by every request of the push
 
     Returns:
         List of manifest digests for each pushed tag
@@ -211,46 +453,71 @@ async def push_docker_tar_with_all_original_tags(
         digests = await push_docker_tar_with_all_original_tags("nginx.tar", "http://localhost:15000")
     """
     # Create registry configuration
-    config = RegistryConfig(url=registry_url, timeout=timeout)
-
-    # Check connectivity first
-    await check_connectivity(config)
+    config = RegistryConfig(
+        url=registry_url,
+        timeout=timeout,
+        max_concurrent_uploads=max_concurrent_uploads,
+        verify_digests=verify_digests,
+    )
 
-    # Extract all original tags from tar file
-    try:
-        original_tags = await asyncio.get_event_loop().run_in_executor(
-            None, extract_original_tags, tar_path
-        )
-    except Exception as e:
-        raise RegistryError(
-            f"Failed to extract original tags from tar file: {e}"
-        ) from e
-
-    if not original_tags:
-        raise RegistryError(
-            "No original tags found in tar file. "
-            "Please ensure the tar file contains valid repository tags."
+    # One session for the whole push, so every request reuses pooled
+    # keep-alive connections instead of paying a new handshake
+    async with session_scope(session) as session:
+        # Check connectivity while the tar file is processed; tags and
+        # manifest info (shared for all tags) come from a single tar pass
+        connectivity, processed = await asyncio.gather(
+            ensure_connectivity(config, session),
+            run_tar_io(process_tar_file_with_tags, tar_path),
+            return_exceptions=True,
         )
 
-    # Validate and process tar file once (shared for all tags)
-    manifest_info, validated_tar_path = await asyncio.get_event_loop().run_in_executor(
-        None, process_tar_file, tar_path
-    )
+        # Report a connectivity failure first
+        if isinstance(connectivity, BaseException):
+            raise connectivity
 
-    # Collect all blobs (config + layers)
-    all_blobs = [manifest_info.config] + list(manifest_info.layers)
+        if isinstance(processed, BaseException):
+            raise_tar_error(processed)
+        original_tags, manifest_info, validated_tar_path = processed
 
-    # Upload all blobs once (they're the same for all tags)
-    # We'll use the first repository for blob upload, but blobs are shared
-    first_repo, _ = parse_repository_tag(original_tags[0])
-    await upload_all_blobs(config, first_repo, validated_tar_path, all_blobs)
+        if not original_tags:
+            raise RegistryError(
+                "No original tags found in tar file. "
+                "Please ensure the tar file contains valid repository tags."
+            )
+
+        # Collect all blobs (config + layers)
+        all_blobs = (manifest_info.config, *manifest_info.layers)
+
+        repo_tags = [parse_repository_tag(repo_tag) for repo_tag in original_tags]
+
+        # Upload all blobs once (they're the same for all tags) to the first
+        # repository, then mount them into any other repository instead of
+        # sending the data again
+        first_repo, _ = repo_tags[0]
+        await upload_all_blobs(
+            config,
+            first_repo,
+            validated_tar_path,
+            all_blobs,
+            progress_callback=progress_callback,
+            session=session,
+        )
 
-    # Push manifest for each original tag concurrently
-    manifest_tasks = []
-    for repo_tag in original_tags:
-        repository, tag = parse_repository_tag(repo_tag)
-        task = create_and_upload_manifest(config, repository, tag, manifest_info)
-        manifest_tasks.append(task)
+        other_repos = dict.fromkeys(repository for repository, _ in repo_tags)
+        other_repos.pop(first_repo)
+        await asyncio.gather(
+            *[
+                mount_all_blobs(
+                    config,
+                    repository,
+                    first_repo,
+                    validated_tar_path,
+                    all_blobs,
+                    session,
+                )
+                for repository in other_repos
+            ]
+        )
 
-    # Execute all manifest uploads concurrently
-    return await asyncio.gather(*manifest_tasks)
+        # Push manifest for each original tag concurrently
+        return await upload_manifest_tags(config, repo_tags, manifest_info, session)
@@ -1,22 +1,31 @@
 """Async functional registry operations."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
+import aiohttp
+
 from .core.types import RegistryConfig
 from .operations.images import delete_image as _delete_image
 from .operations.images import delete_image_by_digest as _delete_image_by_digest
 from .operations.images import get_image_info as _get_image_info
 from .operations.manifests import get_manifest as _get_manifest
+from .operations.repositories import iter_tags as _iter_tags
 from .operations.repositories import list_repositories as _list_repositories
 from .operations.repositories import list_tags as _list_tags
 
 
-async def list_repositories(registry_url: str, timeout: int = 10) -> list[str]:
+async def list_repositories(
+    registry_url: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
+) -> list[str]:
     """List all repositories in registry.
 
     Args:
         registry_url: Registry URL
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         List of repository names
@@ -25,16 +34,22 @@ async def list_repositories(registry_url: str, timeout: int = 10) -> list[str]:
         RegistryError: If request fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _list_repositories(config)
+    return await _list_repositories(config, session=session)
 
 
-async def list_tags(registry_url: str, repository: str, timeout: int = 10) -> list[str]:
+async def list_tags(
+    registry_url: str,
+    repository: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
+) -> list[str]:
     """List all tags for a repository.
 
     Args:
         registry_url: Registry URL
         repository: Repository name
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         List of tag names
@@ -43,11 +58,42 @@ async def list_tags(registry_url: str, repository: str, timeout: int = 10) -> li
         RegistryError: If request fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _list_tags(config, repository)
+    return await _list_tags(config, repository, session=session)
+
+
+async def iter_tags(
+    registry_url: str,
+    repository: str,
+    page_size: int = 1000,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[str]:
+    """Iterate over all tags for a repository, one page at a time.
+
+    Args:
+        registry_url: Registry URL
+        repository: Repository name
+        page_size: Maximum number of tags requested per page
+        timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
+
+    Yields:
+        Tag names
+
+    Raises:
+        RegistryError: If request fails
+    """
+    config = RegistryConfig(url=registry_url, timeout=timeout)
+    async for tag in _iter_tags(config, repository, page_size, session=session):
+        yield tag
 
 
 async def get_manifest(
-    registry_url: str, repository: str, tag: str, timeout: int = 10
+    registry_url: str,
+    repository: str,
+    tag: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
 ) -> dict[str, Any]:
     """Get manifest for an image.
 
@@ -56,6 +102,7 @@ async def get_manifest(
         repository: Repository name
         tag: Tag name
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         Manifest dictionary
@@ -64,11 +111,15 @@ async def get_manifest(
         RegistryError: If request fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _get_manifest(config, repository, tag)
+    return await _get_manifest(config, repository, tag, session=session)
 
 
 async def get_image_info(
-    registry_url: str, repository: str, tag: str, timeout: int = 10
+    registry_url: str,
+    repository: str,
+    tag: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
 ) -> dict[str, Any]:
     """Get detailed image information.
 
@@ -77,6 +128,7 @@ async def get_image_info(
         repository: Repository name
         tag: Tag name
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         Dictionary with image information
@@ -85,11 +137,15 @@ async def get_image_info(
         RegistryError: If request fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _get_image_info(config, repository, tag)
+    return await _get_image_info(config, repository, tag, session=session)
 
 
 async def delete_image(
-    registry_url: str, repository: str, tag: str, timeout: int = 10
+    registry_url: str,
+    repository: str,
+    tag: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
 ) -> bool:
     """Delete an image from registry.
 
@@ -98,6 +154,7 @@ async def delete_image(
         repository: Repository name
         tag: Tag name
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         True if deletion successful
@@ -106,11 +163,15 @@ async def delete_image(
         RegistryError: If deletion fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _delete_image(config, repository, tag)
+    return await _delete_image(config, repository, tag, session=session)
 
 
 async def delete_image_by_digest(
-    registry_url: str, repository: str, digest: str, timeout: int = 10
+    registry_url: str,
+    repository: str,
+    digest: str,
+    timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
 ) -> bool:
     """Delete an image by its digest.
 
@@ -119,6 +180,7 @@ async def delete_image_by_digest(
         repository: Repository name
         digest: Manifest digest
         timeout: Request timeout in seconds
+        session: Optional HTTP session to reuse across calls
 
     Returns:
         True if deletion successful
@@ -127,4 +189,4 @@ async def delete_image_by_digest(
         RegistryError: If deletion fails
     """
     config = RegistryConfig(url=registry_url, timeout=timeout)
-    return await _delete_image_by_digest(config, repository, digest)
+    return await _delete_image_by_digest(config, repository, digest, session=session)
@@ -0,0 +1,119 @@
+"""On-disk cache of processed tar file metadata."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from ..core import json_codec
+from ..core.types import BlobInfo, ManifestInfo
+
+# Directory for cached tar metadata; caching is off unless this is set
+CACHE_DIR_ENV = "REGISTRY_API_V2_CLIENT_CACHE_DIR"
+
+# Bumped whenever the cached entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+
+def get_cache_dir() -> Path | None:
+    """Get the tar metadata cache directory, if caching is enabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    return Path(cache_dir) if cache_dir else None
+
+
+def get_cache_path(cache_dir: Path, tar_path: str) -> Path:
+    """Get the cache entry path for a tar file.
+
+    The entry is keyed by the file's identity, modification time and size,
+    so rewriting or replacing the tar file misses the cache.
+    """
+    stat = os.stat(tar_path)
+    key = f"{stat.st_dev}-{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+    return cache_dir / f"{key}.json"
+
+
+def blob_info_to_dict(blob_info: BlobInfo) -> dict[str, Any]:
+    """Convert blob info to a JSON-serializable dictionary."""
+    return {
+        "digest": blob_info.digest,
+        "size": blob_info.size,
+        "media_type": blob_info.media_type,
+    }
+
+
+def blob_info_from_dict(data: dict[str, Any]) -> BlobInfo:
+    """Create blob info from a cached dictionary."""
+    return BlobInfo(
+        digest=data["digest"], size=data["size"], media_type=data["media_type"]
+    )
+
+
+def load_processed_tar(tar_path: str) -> tuple[list[str], ManifestInfo] | None:
+    """Load the cached processing result for a tar file.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Tuple of (original tags, ManifestInfo), or None if caching is off or
+        the tar file has no valid cache entry
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+
+    try:
+        data = json_codec.loads(get_cache_path(cache_dir, tar_path).read_bytes())
+        if data["version"] != CACHE_FORMAT_VERSION:
+            return None
+
+        manifest_info = ManifestInfo(
+            schema_version=data["schema_version"],
+            media_type=data["media_type"],
+            config=blob_info_from_dict(data["config"]),
+            layers=tuple(blob_info_from_dict(layer) for layer in data["layers"]),
+        )
+        return list(data["original_tags"]), manifest_info
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing, unreadable or stale entries are simply recomputed
+        return None
+
+
+def store_processed_tar(
+    tar_path: str, original_tags: list[str], manifest_info: ManifestInfo
+) -> None:
+    """Cache the processing result for a tar file.
+
+    The entry is written atomically; failing to write it is not an error.
+
+    Args:
+        tar_path: Path to tar file
+        original_tags: Original tags found in the tar file
+        manifest_info: Manifest information for the image
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+
+    data = {
+        "version": CACHE_FORMAT_VERSION,
+        "original_tags": original_tags,
+        "schema_version": manifest_info.schema_version,
+        "media_type": manifest_info.media_type,
+        "config": blob_info_to_dict(manifest_info.config),
+        "layers": [blob_info_to_dict(layer) for layer in manifest_info.layers],
+    }
+
+    try:
+        cache_path = get_cache_path(cache_dir, tar_path)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.dumps(data))
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
@@ -0,0 +1,369 @@
+"""Cached tar member index."""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import posixpath
+import tarfile
+import threading
+import zlib
+from collections import OrderedDict
+from typing import NamedTuple
+
+# Number of tar files whose member index is kept
+TAR_INDEX_CACHE_MAX_SIZE = 8
+
+
+class TarIndex(NamedTuple):
+    """Member index of a tar file."""
+
+    # Member name -> member
+    members: dict[str, tarfile.TarInfo]
+    # Compression tarfile read through ("gz", "bz2" or "xz"), or None for a
+    # plain archive. Member offsets always point into the uncompressed stream.
+    compression: str | None
+
+
+# (tar path, mtime in ns, file size) -> member index
+_tar_indexes: OrderedDict[tuple[str, int, int], TarIndex] = OrderedDict()
+_tar_indexes_lock = threading.Lock()
+
+# Number of tar files whose parsed metadata (validity, inspection result,
+# original tags) is kept by each by-path reader
+TAR_METADATA_CACHE_MAX_SIZE = 32
+
+# Tar path, device, inode, mtime in ns and size
+TarFileKey = tuple[str, int, int, int, int]
+
+# Member types whose headers scan_tar_members understands
+SCANNABLE_TYPES = frozenset(
+    [
+        tarfile.REGTYPE,
+        tarfile.AREGTYPE,
+        tarfile.LNKTYPE,
+        tarfile.SYMTYPE,
+        tarfile.DIRTYPE,
+    ]
+)
+
+POSIX_MAGIC = b"ustar\x0000"
+EMPTY_BLOCK = bytes(tarfile.BLOCKSIZE)
+
+
+def scan_tar_members(tar_path: str) -> dict[str, tarfile.TarInfo] | None:
+    """Index an uncompressed ustar archive by reading its headers directly.
+
+    ``docker save`` writes plain ustar headers, and walking them in a memory
+    map skips the per-member work ``tarfile`` does for features such archives
+    never use. Anything unusual (pax or GNU extension headers, base-256
+    sizes, a bad checksum) makes the scan give up, so the caller can fall
+    back to ``tarfile``, which handles the general case and reports errors.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Dictionary of member name to member, or None if the archive needs
+        the full ``tarfile`` parser
+    """
+    with open(tar_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < tarfile.BLOCKSIZE:
+            return None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            members: dict[str, tarfile.TarInfo] = {}
+            offset = 0
+
+            while offset + tarfile.BLOCKSIZE <= file_size:
+                header = mm[offset : offset + tarfile.BLOCKSIZE]
+                if header == EMPTY_BLOCK:
+                    break
+
+                member = parse_ustar_header(header)
+                if member is None:
+                    return None
+
+                member.offset = offset
+                member.offset_data = offset + tarfile.BLOCKSIZE
+                members[member.name] = member
+
+                offset = member.offset_data
+                if member.isreg():
+                    # Data is padded to a whole number of blocks
+                    offset += -(-member.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+            return members
+
+
+def parse_ustar_header(header: bytes) -> tarfile.TarInfo | None:
+    """Parse a single ustar header block.
+
+    Args:
+        header: 512-byte header block
+
+    Returns:
+        Member described by the header, or None if it is not a plain ustar
+        header ``scan_tar_members`` can handle
+    """
+    if header[257:262] != b"ustar":
+        return None
+
+    # Checksum counts the checksum field itself as spaces
+    try:
+        checksum = int(header[148:156].split(b"\0", 1)[0].strip() or b"0", 8)
+        size_field = header[124:136]
+        if size_field[0] & 0x80:
+            return None
+        size = int(size_field.split(b"\0", 1)[0].strip() or b"0", 8)
+    except ValueError:
+        return None
+    if checksum != sum(header[:148]) + 256 + sum(header[156:]):
+        return None
+
+    member_type = header[156:157]
+    if member_type not in SCANNABLE_TYPES:
+        return None
+
+    name = header[:100].split(b"\0", 1)[0]
+    # Only POSIX ustar has a name prefix; GNU stores other fields there
+    if header[257:265] == POSIX_MAGIC:
+        prefix = header[345:500].split(b"\0", 1)[0]
+        if prefix:
+            name = prefix + b"/" + name
+
+    member = tarfile.TarInfo(name.decode("utf-8", "surrogateescape"))
+    member.size = size
+    member.type = member_type
+    member.linkname = (
+        header[157:257].split(b"\0", 1)[0].decode("utf-8", "surrogateescape")
+    )
+    if member.type == tarfile.AREGTYPE and member.name.endswith("/"):
+        member.type = tarfile.DIRTYPE
+    if member.isdir():
+        member.name = member.name.rstrip("/")
+    return member
+
+
+def index_tar_members(tar: tarfile.TarFile) -> dict[str, tarfile.TarInfo]:
+    """Map member names to members of an open tar file.
+
+    Like ``TarFile.getmember``, the last occurrence of a name wins.
+
+    Args:
+        tar: Open tar file
+
+    Returns:
+        Dictionary of member name to member
+    """
+    return {member.name: member for member in tar.getmembers()}
+
+
+def resolve_tar_member(
+    members: dict[str, tarfile.TarInfo], name: str
+) -> tarfile.TarInfo | None:
+    """Find the regular member holding the data of a member name.
+
+    Hard and symbolic links are followed the way ``TarFile.extractfile``
+    follows them: a hard link names another member of the archive, and a
+    symbolic link is relative to the directory of the link. Some
+    ``docker save`` and skopeo layouts store layers as links to one copy of
+    the data.
+
+    Args:
+        members: Member index of the tar file
+        name: Member name
+
+    Returns:
+        Regular member the name resolves to, or None if the name is missing,
+        is not a file, or is a dangling or circular link
+    """
+    member = members.get(name)
+    followed: set[str] = set()
+    while member is not None and (member.islnk() or member.issym()):
+        if member.name in followed:
+            return None
+        followed.add(member.name)
+        target = member.linkname
+        if member.issym():
+            target = posixpath.join(posixpath.dirname(member.name), target)
+        member = members.get(posixpath.normpath(target))
+
+    if member is None or not member.isreg():
+        return None
+    return member
+
+
+def get_tar_compression(tar: tarfile.TarFile) -> str | None:
+    """Get the compression an open tar file is read through.
+
+    Args:
+        tar: Open tar file
+
+    Returns:
+        "gz", "bz2" or "xz", or None if the archive is not compressed
+    """
+    if isinstance(tar.fileobj, gzip.GzipFile):
+        return "gz"
+    if isinstance(tar.fileobj, bz2.BZ2File):
+        return "bz2"
+    if isinstance(tar.fileobj, lzma.LZMAFile):
+        return "xz"
+    return None
+
+
+def open_tar_stream(tar_path: str, compression: str | None) -> io.BufferedIOBase:
+    """Open the uncompressed byte stream of a tar file.
+
+    Member offsets in a ``TarIndex`` point into this stream. For a plain
+    archive it is the file itself; for a compressed one, seeking to an
+    offset decompresses everything before it.
+
+    Args:
+        tar_path: Path to tar file
+        compression: Compression recorded in the tar file's index
+
+    Returns:
+        Binary stream of the uncompressed archive
+    """
+    if compression == "gz":
+        return gzip.open(tar_path, "rb")
+    if compression == "bz2":
+        return bz2.open(tar_path, "rb")
+    if compression == "xz":
+        return lzma.open(tar_path, "rb")
+    return open(tar_path, "rb")
+
+
+def get_tar_index(tar_path: str) -> TarIndex:
+    """Get the member index of a tar file, scanning it only once.
+
+    ``TarFile.getmember`` is a linear search, and pushing an image locates
+    every blob in the same tar file. The index is cached by path and
+    invalidated when the file's modification time or size changes. The
+    function is thread-safe, so concurrent lookups from the tar I/O thread
+    pool share a single scan.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Member index, with the compression its offsets are relative to
+
+    Raises:
+        OSError: If the file cannot be read
+        tarfile.TarError: If the file is not a valid tar archive
+    """
+    stat = os.stat(tar_path)
+    key = (tar_path, stat.st_mtime_ns, stat.st_size)
+
+    with _tar_indexes_lock:
+        index = _tar_indexes.get(key)
+        if index is None:
+            members = scan_tar_members(tar_path)
+            if members is not None:
+                index = TarIndex(members, None)
+            else:
+                try:
+                    with tarfile.open(tar_path, "r") as tar:
+                        index = TarIndex(
+                            index_tar_members(tar), get_tar_compression(tar)
+                        )
+                except (EOFError, zlib.error, lzma.LZMAError) as e:
+                    raise tarfile.ReadError(f"Cannot decompress tar file: {e}") from e
+            _tar_indexes[key] = index
+        _tar_indexes.move_to_end(key)
+        while len(_tar_indexes) > TAR_INDEX_CACHE_MAX_SIZE:
+            _tar_indexes.popitem(last=False)
+        return index
+
+
+def get_tar_members(tar_path: str) -> dict[str, tarfile.TarInfo]:
+    """Get the cached member index of a tar file as a name -> member map.
+
+    Offsets of the members point into the uncompressed stream, so data is
+    read through ``open_tar_stream`` with the compression ``get_tar_index``
+    records.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Dictionary of member name to member
+
+    Raises:
+        OSError: If the file cannot be read
+        tarfile.TarError: If the file is not a valid tar archive
+    """
+    return get_tar_index(tar_path).members
+
+
+def read_tar_member(tar_path: str, name: str) -> bytes | None:
+    """Read a file member's data using the cached member index.
+
+    Only the member's own bytes are read, so small metadata files can be
+    fetched from a large archive without opening it with ``tarfile``. In a
+    compressed archive the data before the member is decompressed and
+    skipped. Links are read as the member they point to.
+
+    Args:
+        tar_path: Path to tar file
+        name: Member name
+
+    Returns:
+        Member data, or None if the name does not resolve to a regular file
+
+    Raises:
+        OSError: If the file cannot be read
+        tarfile.TarError: If the file is not a valid tar archive or the
+            member's data is truncated
+    """
+    index = get_tar_index(tar_path)
+    member = resolve_tar_member(index.members, name)
+    if member is None:
+        return None
+
+    try:
+        with open_tar_stream(tar_path, index.compression) as f:
+            f.seek(member.offset_data)
+            data = f.read(member.size)
+    except (EOFError, zlib.error, lzma.LZMAError) as e:
+        raise tarfile.ReadError(f"Cannot decompress data reading {name}: {e}") from e
+    if len(data) != member.size:
+        raise tarfile.ReadError(f"Unexpected end of data reading {name}")
+    return data
+
+
+def get_tar_file_key(tar_path: str | os.PathLike[str]) -> TarFileKey | None:
+    """Get a cache key identifying a tar file and its current contents.
+
+    Rewriting or replacing the file changes the key, so results cached
+    under the old key are never returned for the new contents.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Cache key, or None if the file cannot be stat'ed (callers then read
+        it uncached and report the error themselves)
+    """
+    try:
+        stat = os.stat(tar_path)
+    except OSError:
+        return None
+    return (
+        os.fspath(tar_path),
+        stat.st_dev,
+        stat.st_ino,
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+def clear_tar_index_cache() -> None:
+    """Forget all cached tar member indexes."""
+    with _tar_indexes_lock:
+        _tar_indexes.clear()
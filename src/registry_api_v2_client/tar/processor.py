@@ -1,12 +1,16 @@
 """Tar file processing functions."""
 
+import json
+import tarfile
 from pathlib import Path
 from typing import Any
 
 from ..core.types import BlobInfo, ManifestInfo
-from ..exceptions import RegistryError
-from ..utils.inspect import inspect_docker_tar
-from ..utils.validator import validate_docker_tar
+from ..exceptions import RegistryError, TarReadError
+from ..utils.inspect import inspect_docker_tar, inspect_tar
+from ..utils.validator import open_docker_tar_with_manifest, validate_docker_tar
+from .cache import load_processed_tar, store_processed_tar
+from .tags import read_original_tags
 
 
 def validate_tar_file(tar_path: str) -> None:
@@ -93,19 +97,56 @@ def process_tar_file(tar_path: str) -> tuple[ManifestInfo, str]:
         RegistryError: If tar file is invalid
         ValidationError: If tar structure is invalid
     """
+    _, manifest_info, validated_tar_path = process_tar_file_with_tags(tar_path)
+    return manifest_info, validated_tar_path
+
+
+def process_tar_file_with_tags(tar_path: str) -> tuple[list[str], ManifestInfo, str]:
+    """Process tar file and extract its original tags in a single pass.
+
+    Validation, inspection and tag extraction all share one open tar file,
+    so its member table is read once instead of once per step. If the
+    ``REGISTRY_API_V2_CLIENT_CACHE_DIR`` environment variable names a
+    directory, the result is cached there and reused while the tar file is
+    unchanged.
+
+    Args:
+        tar_path: Path to tar file
+
+    Returns:
+        Tuple of (original tags, ManifestInfo, tar_path); the tag list is
+        empty if the tar file carries no tags
+
+    Raises:
+        FileNotFoundError: If tar file doesn't exist
+        RegistryError: If tar file is invalid
+        ValidationError: If tar structure is invalid
+        TarReadError: If tar contents cannot be read
+    """
     # Validate file existence
     validate_tar_file(tar_path)
 
-    # Validate tar structure
-    validate_docker_tar(Path(tar_path))
-
-    # Extract image information
-    image_info = inspect_docker_tar(Path(tar_path))
+    # Reuse the result of an earlier run on the same unchanged file
+    cached = load_processed_tar(tar_path)
+    if cached is not None:
+        original_tags, manifest_info = cached
+        return original_tags, manifest_info, tar_path
+
+    # Validate tar structure, then extract image information and tags
+    with open_docker_tar_with_manifest(Path(tar_path)) as (tar, manifest_data):
+        try:
+            image_info = inspect_tar(tar, manifest_data)
+            # Inspection already parsed manifest.json's RepoTags; only read
+            # the tar again for the repositories fallback
+            original_tags = list(image_info.repo_tags) or read_original_tags(tar)
+        except (tarfile.TarError, json.JSONDecodeError, KeyError) as e:
+            raise TarReadError(f"Failed to inspect tar file: {e}") from e
 
     # Create manifest info
     manifest_info = create_manifest_info(image_info)
+    store_processed_tar(tar_path, original_tags, manifest_info)
 
-    return manifest_info, tar_path
+    return original_tags, manifest_info, tar_path
 
 
 def extract_image_info_from_tar(tar_path: str) -> Any:
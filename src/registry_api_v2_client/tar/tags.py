@@ -1,14 +1,113 @@
 """Tag extraction from Docker tar files."""
 
+import functools
 import json
 import tarfile
 
+from ..core import json_codec
 from ..exceptions import TarReadError, ValidationError
+from .members import (
+    TAR_METADATA_CACHE_MAX_SIZE,
+    TarFileKey,
+    get_tar_file_key,
+    read_tar_member,
+)
+
+
+def parse_repo_tags_from_manifest(manifest_content: bytes) -> list[str]:
+    """Parse RepoTags from manifest.json content.
+
+    Args:
+        manifest_content: Raw manifest.json data
+
+    Returns:
+        List of repository tags (e.g., ["nginx:alpine", "myapp:latest"])
+
+    Raises:
+        ValidationError: If manifest.json is invalid
+    """
+    try:
+        # Parse the raw bytes; the JSON decoder validates UTF-8 itself
+        manifest_data = json_codec.loads(manifest_content)
+    except json.JSONDecodeError as e:
+        raise ValidationError(f"Invalid JSON in manifest.json: {e}") from e
+    except UnicodeDecodeError as e:
+        raise ValidationError(f"Cannot decode manifest.json: {e}") from e
+
+    # Validate manifest structure
+    if not isinstance(manifest_data, list) or not manifest_data:
+        raise ValidationError("manifest.json must be a non-empty array")
+
+    # Extract RepoTags from first manifest entry
+    first_manifest = manifest_data[0]
+    if not isinstance(first_manifest, dict):
+        raise ValidationError("Invalid manifest entry structure")
+
+    repo_tags = first_manifest.get("RepoTags", [])
+    if not isinstance(repo_tags, list):
+        raise ValidationError("RepoTags must be a list")
+
+    return repo_tags
+
+
+def parse_repo_tags_from_repositories(repos_content: bytes) -> list[str]:
+    """Parse repository tags from repositories file content.
+
+    Args:
+        repos_content: Raw repositories file data
+
+    Returns:
+        List of repository tags (e.g., ["nginx:alpine", "myapp:latest"])
+
+    Raises:
+        ValidationError: If repositories file is invalid
+    """
+    try:
+        repos_data = json_codec.loads(repos_content)
+    except json.JSONDecodeError as e:
+        raise ValidationError(f"Invalid JSON in repositories file: {e}") from e
+    except UnicodeDecodeError as e:
+        raise ValidationError(f"Cannot decode repositories file: {e}") from e
+
+    # Extract tags from repositories structure: {"repo": {"tag": "digest"}}
+    repo_tags = []
+    for repo_name, tag_dict in repos_data.items():
+        if isinstance(tag_dict, dict):
+            for tag_name in tag_dict:
+                repo_tags.append(f"{repo_name}:{tag_name}")
+
+    return repo_tags
+
+
+def read_repo_tags_from_manifest(tar: tarfile.TarFile) -> list[str]:
+    """Read RepoTags from manifest.json in an open tar file.
+
+    Args:
+        tar: Open Docker tar file
+
+    Returns:
+        List of repository tags (e.g., ["nginx:alpine", "myapp:latest"])
+
+    Raises:
+        tarfile.TarError: If tar file cannot be read
+        ValidationError: If manifest.json is invalid or missing
+    """
+    try:
+        manifest_member = tar.extractfile("manifest.json")
+    except KeyError as e:
+        raise ValidationError("manifest.json not found in tar file") from e
+    if manifest_member is None:
+        raise ValidationError("manifest.json not found in tar file")
+
+    return parse_repo_tags_from_manifest(manifest_member.read())
 
 
 def extract_repo_tags_from_manifest(tar_path: str) -> list[str]:
     """Extract RepoTags from manifest.json in tar file.
 
+    Only manifest.json's own bytes are read, located through the cached
+    member index.
+
     Args:
         tar_path: Path to Docker tar file
 
@@ -20,45 +119,44 @@ def extract_repo_tags_from_manifest(tar_path: str) -> list[str]:
         ValidationError: If manifest.json is invalid or missing
     """
     try:
-        with tarfile.open(tar_path, "r") as tar:
-            # Extract manifest.json
-            try:
-                manifest_member = tar.extractfile("manifest.json")
-                if manifest_member is None:
-                    raise ValidationError("manifest.json not found in tar file")
-
-                manifest_content = manifest_member.read().decode("utf-8")
-                manifest_data = json.loads(manifest_content)
-
-            except KeyError as e:
-                raise ValidationError("manifest.json not found in tar file") from e
-            except json.JSONDecodeError as e:
-                raise ValidationError(f"Invalid JSON in manifest.json: {e}") from e
-            except UnicodeDecodeError as e:
-                raise ValidationError(f"Cannot decode manifest.json: {e}") from e
-
-        # Validate manifest structure
-        if not isinstance(manifest_data, list) or not manifest_data:
-            raise ValidationError("manifest.json must be a non-empty array")
-
-        # Extract RepoTags from first manifest entry
-        first_manifest = manifest_data[0]
-        if not isinstance(first_manifest, dict):
-            raise ValidationError("Invalid manifest entry structure")
-
-        repo_tags = first_manifest.get("RepoTags", [])
-        if not isinstance(repo_tags, list):
-            raise ValidationError("RepoTags must be a list")
-
-        return repo_tags
-
+        manifest_content = read_tar_member(tar_path, "manifest.json")
     except tarfile.TarError as e:
         raise TarReadError(f"Cannot read tar file: {e}") from e
+    if manifest_content is None:
+        raise ValidationError("manifest.json not found in tar file")
+
+    return parse_repo_tags_from_manifest(manifest_content)
+
+
+def read_repo_tags_from_repositories(tar: tarfile.TarFile) -> list[str]:
+    """Read repository tags from the repositories file in an open tar file.
+
+    Args:
+        tar: Open Docker tar file
+
+    Returns:
+        List of repository tags (e.g., ["nginx:alpine", "myapp:latest"])
+
+    Raises:
+        tarfile.TarError: If tar file cannot be read
+        ValidationError: If repositories file is invalid or missing
+    """
+    try:
+        repos_member = tar.extractfile("repositories")
+    except KeyError as e:
+        raise ValidationError("repositories file not found in tar file") from e
+    if repos_member is None:
+        raise ValidationError("repositories file not found in tar file")
+
+    return parse_repo_tags_from_repositories(repos_member.read())
 
 
 def extract_repo_tags_from_repositories(tar_path: str) -> list[str]:
     """Extract repository tags from repositories file in tar.
 
+    Only the repositories file's own bytes are read, located through the
+    cached member index.
+
     Args:
         tar_path: Path to Docker tar file
 
@@ -70,37 +168,73 @@ def extract_repo_tags_from_repositories(tar_path: str) -> list[str]:
         ValidationError: If repositories file is invalid or missing
     """
     try:
-        with tarfile.open(tar_path, "r") as tar:
-            # Extract repositories file
-            try:
-                repos_member = tar.extractfile("repositories")
-                if repos_member is None:
-                    raise ValidationError("repositories file not found in tar file")
-
-                repos_content = repos_member.read().decode("utf-8")
-                repos_data = json.loads(repos_content)
-
-            except KeyError as e:
-                raise ValidationError("repositories file not found in tar file") from e
-            except json.JSONDecodeError as e:
-                raise ValidationError(f"Invalid JSON in repositories file: {e}") from e
-            except UnicodeDecodeError as e:
-                raise ValidationError(f"Cannot decode repositories file: {e}") from e
-
-        # Extract tags from repositories structure: {"repo": {"tag": "digest"}}
-        repo_tags = []
-        for repo_name, tag_dict in repos_data.items():
-            if isinstance(tag_dict, dict):
-                for tag_name in tag_dict:
-                    repo_tags.append(f"{repo_name}:{tag_name}")
-
-        return repo_tags
-
+        repos_content = read_tar_member(tar_path, "repositories")
     except tarfile.TarError as e:
         raise TarReadError(f"Cannot read tar file: {e}") from e
+    if repos_content is None:
+        raise ValidationError("repositories file not found in tar file")
+
+    return parse_repo_tags_from_repositories(repos_content)
+
+
+def read_original_tags(tar: tarfile.TarFile) -> list[str]:
+    """Read original image tags from an open Docker tar file.
+
+    Same lookup order as ``extract_original_tags``, for callers that already
+    have the tar file open.
+
+    Args:
+        tar: Open Docker tar file
+
+    Returns:
+        List of original repository tags, empty if none can be read
+    """
+    # Try manifest.json first (more reliable), then the repositories file
+    for read_repo_tags in (
+        read_repo_tags_from_manifest,
+        read_repo_tags_from_repositories,
+    ):
+        try:
+            repo_tags = read_repo_tags(tar)
+            if repo_tags:
+                return repo_tags
+        except (tarfile.TarError, ValidationError):
+            pass
+
+    return []
+
 
+def read_original_tags_from_path(tar_path: str) -> list[str]:
+    """Read original image tags from a Docker tar file by path.
 
-def extract_original_tags(tar_path: str) -> list[str]:
+    Args:
+        tar_path: Path to Docker tar file
+
+    Returns:
+        List of original repository tags, empty if none can be read
+    """
+    # Try manifest.json first (more reliable), then the repositories file
+    for extract_repo_tags in (
+        extract_repo_tags_from_manifest,
+        extract_repo_tags_from_repositories,
+    ):
+        try:
+            repo_tags = extract_repo_tags(tar_path)
+            if repo_tags:
+                return repo_tags
+        except (TarReadError, ValidationError):
+            pass
+
+    return []
+
+
+@functools.lru_cache(maxsize=TAR_METADATA_CACHE_MAX_SIZE)
+def read_original_tags_cached(key: TarFileKey) -> tuple[str, ...]:
+    """Read original image tags, cached by tar file identity."""
+    return tuple(read_original_tags_from_path(key[0]))
+
+
+def extract_original_tags(tar_path: str, use_cache: bool = True) -> list[str]:
     """Extract original image tags from Docker tar file.
 
     This function tries multiple methods to extract the original tags:
@@ -109,32 +243,17 @@ def extract_original_tags(tar_path: str) -> list[str]:
 
     Args:
         tar_path: Path to Docker tar file
+        use_cache: Reuse the tags read from a tar file that has not changed
+            since they were last extracted
 
     Returns:
-        List of original repository tags
-
-    Raises:
-        TarReadError: If tar file cannot be read
-        ValidationError: If no valid tags can be extracted
+        List of original repository tags, empty if the tar file cannot be
+        read or carries no tags
     """
-    # Try manifest.json first (more reliable)
-    try:
-        repo_tags = extract_repo_tags_from_manifest(tar_path)
-        if repo_tags:
-            return repo_tags
-    except (TarReadError, ValidationError):
-        pass
-
-    # Try repositories file as fallback
-    try:
-        repo_tags = extract_repo_tags_from_repositories(tar_path)
-        if repo_tags:
-            return repo_tags
-    except (TarReadError, ValidationError):
-        pass
-
-    # If no tags found, return empty list
-    return []
+    key = get_tar_file_key(tar_path) if use_cache else None
+    if key is not None:
+        return list(read_original_tags_cached(key))
+    return read_original_tags_from_path(tar_path)
 
 
 def parse_repository_tag(repo_tag: str) -> tuple[str, str]:
@@ -150,18 +269,17 @@ def parse_repository_tag(repo_tag: str) -> tuple[str, str]:
         "nginx:alpine" -> ("nginx", "alpine")
         "localhost:5000/myapp:latest" -> ("localhost:5000/myapp", "latest")
         "myapp" -> ("myapp", "latest")  # default tag
+        "localhost:5000/myapp" -> ("localhost:5000/myapp", "latest")
     """
-    if ":" in repo_tag:
-        # Split only on the last ':' to handle registry URLs like localhost:5000/repo:tag
-        parts = repo_tag.rsplit(":", 1)
-        if len(parts) == 2 and parts[1]:  # Ensure tag is not empty
-            return parts[0], parts[1]
-        else:
-            # Empty tag after colon (e.g., "app:")
-            return parts[0], "latest"
-
-    # No tag specified, use default
-    return repo_tag, "latest"
+    # Split only on the last ':' to handle registry URLs like localhost:5000/repo:tag
+    repository, separator, tag = repo_tag.rpartition(":")
+
+    # No tag specified, or the last ':' belongs to a registry port
+    if not separator or "/" in tag:
+        return repo_tag, "latest"
+
+    # Empty tag after colon (e.g., "app:") falls back to the default
+    return repository, tag or "latest"
 
 
 def get_primary_tag(tar_path: str) -> tuple[str, str] | None:
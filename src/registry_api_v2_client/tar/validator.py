@@ -20,9 +20,12 @@ def validate_tar_structure(tar_path: str) -> bool:
         TarReadError: If tar file cannot be read
     """
     try:
-        _validate_docker_tar(Path(tar_path) if isinstance(tar_path, str) else tar_path)
-        return True
+        valid = _validate_docker_tar(Path(tar_path))
     except (ValidationError, TarReadError):
         raise
     except Exception as e:
         raise TarReadError(f"Failed to validate tar file: {e}") from e
+
+    if not valid:
+        raise ValidationError(f"Invalid Docker tar file: {tar_path}")
+    return True
@@ -1,5 +1,6 @@
 """Utility functions for Registry API v2 client."""
 
+from .digest import calculate_digest
 from .inspect import inspect_docker_tar
 from .validator import get_tar_manifest, validate_docker_tar
 
@@ -7,4 +8,5 @@ __all__ = [
     "validate_docker_tar",
     "get_tar_manifest",
     "inspect_docker_tar",
+    "calculate_digest",
 ]
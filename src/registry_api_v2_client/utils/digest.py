@@ -0,0 +1,92 @@
+"""Content digest utilities."""
+
+import hashlib
+import hmac
+from collections.abc import Callable
+from typing import Any
+
+# Named constructors return OpenSSL-backed hashers without the by-name
+# lookup hashlib.new does on every call
+DIGEST_CONSTRUCTORS: dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+# Hex length of each supported algorithm's digest
+DIGEST_HEX_LENGTHS = {"sha256": 64, "sha384": 96, "sha512": 128}
+
+HEX_DIGITS = "0123456789abcdef"
+
+
+def is_valid_digest(digest: str) -> bool:
+    """Check if a string is a well-formed ``<algorithm>:<hex>`` digest.
+
+    Args:
+        digest: Digest string
+
+    Returns:
+        True if the algorithm is supported and the hex part is lowercase
+        hexadecimal of the algorithm's length
+    """
+    algorithm, _, hex_part = digest.partition(":")
+    if DIGEST_HEX_LENGTHS.get(algorithm) != len(hex_part):
+        return False
+    # Stripping every hex digit leaves nothing only if all characters are hex
+    return not hex_part.strip(HEX_DIGITS)
+
+
+def get_hasher(algorithm: str = "sha256") -> Any:
+    """Create a hash object for a digest algorithm.
+
+    Args:
+        algorithm: Digest algorithm name, as used in ``<algorithm>:<hex>``
+
+    Returns:
+        New hash object
+
+    Raises:
+        ValueError: If the algorithm is not supported
+    """
+    constructor = DIGEST_CONSTRUCTORS.get(algorithm)
+    if constructor is not None:
+        return constructor()
+    return hashlib.new(algorithm)
+
+
+def digest_matches(hasher: Any, digest: str) -> bool:
+    """Check a hasher's result against an expected digest.
+
+    The raw digest bytes are compared, without hex-encoding the result, in
+    constant time.
+
+    Args:
+        hasher: Hash object that has been fed all of the content
+        digest: Expected digest in ``<algorithm>:<hex>`` form
+
+    Returns:
+        True if the digest names the hasher's algorithm and matches its result
+    """
+    algorithm, _, hex_digest = digest.partition(":")
+    if algorithm != hasher.name:
+        return False
+    try:
+        expected = bytes.fromhex(hex_digest)
+    except ValueError:
+        return False
+    return hmac.compare_digest(hasher.digest(), expected)
+
+
+def calculate_digest(data: bytes, algorithm: str = "sha256") -> str:
+    """Calculate the content digest of in-memory data.
+
+    Args:
+        data: Content to hash
+        algorithm: Digest algorithm name
+
+    Returns:
+        Digest in ``<algorithm>:<hex>`` form
+    """
+    hasher = get_hasher(algorithm)
+    hasher.update(data)
+    return f"{algorithm}:{hasher.hexdigest()}"
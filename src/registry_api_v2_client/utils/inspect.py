@@ -1,26 +1,38 @@
 """Docker tar file inspection utilities."""
 
+import functools
 import json
 import tarfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from ..exceptions import TarReadError, ValidationError
+from ..core import json_codec
+from ..exceptions import TarReadError
 from ..models import ImageConfig, ImageInspect, LayerInfo
-from .validator import validate_docker_tar
+from ..tar.members import (
+    TAR_METADATA_CACHE_MAX_SIZE,
+    TarFileKey,
+    get_tar_file_key,
+    index_tar_members,
+)
+from .validator import open_docker_tar_with_manifest
 
 
 def extract_json_file(
-    tar: tarfile.TarFile, file_path: str
+    tar: tarfile.TarFile, file_path: str | tarfile.TarInfo
 ) -> dict[str, Any] | list[Any] | None:
-    """Extract and parse JSON file from tar."""
+    """Extract and parse JSON file from tar.
+
+    Passing the member itself rather than its name skips the linear member
+    search ``TarFile.extractfile`` does for a name.
+    """
     try:
         member = tar.extractfile(file_path)
         if member is None:
             return None
-        content = member.read().decode("utf-8")
-        return json.loads(content)  # type: ignore[no-any-return]
+        # Parse the raw bytes; the JSON decoder validates UTF-8 itself
+        return json_codec.loads(member.read())  # type: ignore[no-any-return]
     except (KeyError, json.JSONDecodeError, UnicodeDecodeError):
         return None
 
@@ -35,18 +47,17 @@ def validate_config_data(config_data: Any) -> bool:
     return config_data is not None and isinstance(config_data, dict)
 
 
-def get_layer_size_from_tar(tar: tarfile.TarFile, layer_path: str) -> int:
-    """Get layer size from tar member."""
-    try:
-        member = tar.getmember(layer_path)
-        return member.size
-    except KeyError:
-        return 0
+def get_layer_size_from_tar(
+    members: dict[str, tarfile.TarInfo], layer_path: str
+) -> int:
+    """Get layer size from tar member index."""
+    member = members.get(layer_path)
+    return member.size if member is not None else 0
 
 
 def extract_digest_from_path(layer_path: str) -> str:
     """Extract digest from layer path."""
-    return f"sha256:{layer_path.split('/')[-1]}"
+    return f"sha256:{layer_path.rpartition('/')[2]}"
 
 
 def get_layer_source_key(layer_digest: str) -> str:
@@ -73,21 +84,28 @@ def create_layer_info(
 
 
 def build_layers_info(
-    tar: tarfile.TarFile, layer_paths: list[str], layer_sources: dict[str, Any]
+    tar: tarfile.TarFile,
+    layer_paths: list[str],
+    layer_sources: dict[str, Any],
+    members: dict[str, tarfile.TarInfo] | None = None,
 ) -> tuple[list[LayerInfo], int]:
     """Build layer information and calculate total size."""
     layers = []
     total_size = 0
 
+    # Index members once; TarFile.getmember is a linear search per call
+    if members is None:
+        members = index_tar_members(tar)
+
     for layer_path in layer_paths:
-        layer_size = get_layer_size_from_tar(tar, layer_path)
+        layer_size = get_layer_size_from_tar(members, layer_path)
         layer_digest = extract_digest_from_path(layer_path)
-        layer_source_key = get_layer_source_key(layer_digest)
-        layer_source = layer_sources.get(f"sha256:{layer_source_key}", {})
+        # LayerSources is keyed by the full layer digest
+        layer_source = layer_sources.get(layer_digest, {})
 
         layer_info = create_layer_info(layer_digest, layer_source, layer_size)
         layers.append(layer_info)
-        total_size += layer_source.get("size", layer_size)
+        total_size += layer_info.size
 
     return layers, total_size
 
@@ -95,8 +113,9 @@ def build_layers_info(
 def parse_created_timestamp(created_str: str) -> datetime:
     """Parse created timestamp with fallback."""
     try:
-        return datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
+        # Python 3.11+ parses the "Z" suffix and nanosecond fractions itself
+        return datetime.fromisoformat(created_str)
+    except (ValueError, TypeError):
         return datetime.now()
 
 
@@ -181,12 +200,91 @@ def build_image_inspect(
     )
 
 
-def inspect_docker_tar(tar_path: Path) -> ImageInspect:
+def inspect_tar(
+    tar: tarfile.TarFile, manifest_data: list[dict[str, Any]] | None = None
+) -> ImageInspect:
+    """Inspect an open Docker tar file.
+
+    Args:
+        tar: Open Docker tar file with a validated structure
+        manifest_data: manifest.json entries already parsed during
+            validation; read from the tar file if not given
+
+    Returns:
+        ImageInspect object with complete image information
+
+    Raises:
+        TarReadError: If manifest.json or the image config cannot be read
+        KeyError: If the manifest entry lacks a config path
+    """
+    # Extract manifest unless validation already parsed it
+    manifest_json = (
+        extract_json_file(tar, "manifest.json")
+        if manifest_data is None
+        else manifest_data
+    )
+    if not validate_manifest_data(manifest_json):
+        raise TarReadError("Invalid manifest.json")
+
+    # Type guard ensures manifest_json is a list at this point
+    assert isinstance(manifest_json, list)
+    manifest = manifest_json[0]  # Use first image
+
+    # Config and layers are looked up in one member index
+    members = index_tar_members(tar)
+
+    # Extract config
+    config_path = manifest["Config"]
+    config_member = members.get(config_path)
+    config_data = (
+        extract_json_file(tar, config_member) if config_member is not None else None
+    )
+    if not validate_config_data(config_data):
+        raise TarReadError(f"Cannot read config file: {config_path}")
+
+    # Parse layers from manifest
+    layer_paths = manifest.get("Layers", [])
+    layer_sources = manifest.get("LayerSources", {})
+
+    # Build layer info
+    layers, total_size = build_layers_info(tar, layer_paths, layer_sources, members)
+
+    # Type guard ensures config_data is a dict at this point
+    assert isinstance(config_data, dict)
+    image_config = parse_image_config(config_data)
+
+    # Calculate config digest
+    config_digest = extract_config_digest(config_path)
+
+    # Build final result
+    return build_image_inspect(
+        manifest, image_config, layers, total_size, config_digest
+    )
+
+
+def read_docker_tar_inspect(tar_path: Path) -> ImageInspect:
+    """Open, validate and inspect a Docker tar file."""
+    with open_docker_tar_with_manifest(tar_path) as (tar, manifest_data):
+        try:
+            return inspect_tar(tar, manifest_data)
+        except (tarfile.TarError, json.JSONDecodeError, KeyError) as e:
+            raise TarReadError(f"Failed to inspect tar file: {e}") from e
+
+
+@functools.lru_cache(maxsize=TAR_METADATA_CACHE_MAX_SIZE)
+def read_docker_tar_inspect_cached(key: TarFileKey) -> ImageInspect:
+    """Inspect a Docker tar file, cached by tar file identity."""
+    return read_docker_tar_inspect(Path(key[0]))
+
+
+def inspect_docker_tar(tar_path: Path, use_cache: bool = True) -> ImageInspect:
     """
     Inspect a Docker tar file and return detailed image information.
 
     Args:
         tar_path: Path to the Docker tar file
+        use_cache: Reuse the result for a tar file that has not changed
+            since it was last inspected
 
     Returns:
         ImageInspect object with complete image information
@@ -195,44 +293,9 @@ def inspect_docker_tar(tar_path: Path) -> ImageInspect:
         ValidationError: If tar file is invalid
         TarReadError: If tar file cannot be read
     """
-    if not validate_docker_tar(tar_path):
-        raise ValidationError(f"Invalid Docker tar file: {tar_path}")
+    key = get_tar_file_key(tar_path) if use_cache else None
+    if key is None:
+        return read_docker_tar_inspect(tar_path)
 
-    try:
-        with tarfile.open(tar_path, "r") as tar:
-            # Extract manifest
-            manifest_data = extract_json_file(tar, "manifest.json")
-            if not validate_manifest_data(manifest_data):
-                raise TarReadError("Invalid manifest.json")
-
-            # Type guard ensures manifest_data is a list at this point
-            assert isinstance(manifest_data, list)
-            manifest = manifest_data[0]  # Use first image
-
-            # Extract config
-            config_path = manifest["Config"]
-            config_data = extract_json_file(tar, config_path)
-            if not validate_config_data(config_data):
-                raise TarReadError(f"Cannot read config file: {config_path}")
-
-            # Parse layers from manifest
-            layer_paths = manifest.get("Layers", [])
-            layer_sources = manifest.get("LayerSources", {})
-
-            # Build layer info
-            layers, total_size = build_layers_info(tar, layer_paths, layer_sources)
-
-            # Type guard ensures config_data is a dict at this point
-            assert isinstance(config_data, dict)
-            image_config = parse_image_config(config_data)
-
-            # Calculate config digest
-            config_digest = extract_config_digest(config_path)
-
-            # Build final result
-            return build_image_inspect(
-                manifest, image_config, layers, total_size, config_digest
-            )
-
-    except (tarfile.TarError, json.JSONDecodeError, KeyError) as e:
-        raise TarReadError(f"Failed to inspect tar file: {e}") from e
+    # Callers get their own copy, so changing it cannot affect the cache
+    return read_docker_tar_inspect_cached(key).model_copy(deep=True)
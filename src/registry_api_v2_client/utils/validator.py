@@ -1,16 +1,26 @@
 """Tar file validation utilities for Docker image tar files."""
 
+import copy
+import functools
 import json
+import os
 import tarfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+from ..core import json_codec
 from ..exceptions import ValidationError
+from ..tar.members import TAR_METADATA_CACHE_MAX_SIZE, TarFileKey, get_tar_file_key
+
+# Fields every manifest.json entry must have
+REQUIRED_MANIFEST_FIELDS = ("Config", "Layers")
 
 
 def is_path_exists(path: Path) -> bool:
     """Check if file path exists."""
-    return path.exists()
+    return os.path.exists(path)
 
 
 def is_valid_tarfile(path: Path) -> bool:
@@ -18,43 +28,54 @@ def is_valid_tarfile(path: Path) -> bool:
     return tarfile.is_tarfile(path)
 
 
+def iter_member_names(tar: tarfile.TarFile) -> Iterator[str]:
+    """Yield member names as their headers are read from the tar file."""
+    for member in tar:
+        yield member.name
+
+
 def get_tar_members(tar: tarfile.TarFile) -> set[str]:
     """Extract member names from tar file."""
-    return {member.name for member in tar.getmembers()}
+    return set(iter_member_names(tar))
 
 
 def has_required_files(tar_members: set[str], required_files: list[str]) -> bool:
     """Check if tar contains all required files."""
-    return all(required_file in tar_members for required_file in required_files)
+    return tar_members.issuperset(required_files)
 
 
-def extract_manifest_content(tar: tarfile.TarFile) -> str | None:
-    """Extract manifest.json content from tar file."""
+def extract_manifest_content(
+    tar: tarfile.TarFile, member: tarfile.TarInfo | str = "manifest.json"
+) -> bytes | None:
+    """Extract raw manifest.json content from tar file."""
     try:
-        manifest_member = tar.extractfile("manifest.json")
+        manifest_member = tar.extractfile(member)
         if manifest_member is None:
             return None
-        return manifest_member.read().decode("utf-8")
-    except (UnicodeDecodeError, KeyError):
+        return manifest_member.read()
+    except KeyError:
         return None
 
 
-def parse_manifest_json(manifest_content: str) -> list[dict[str, Any]] | None:
+def parse_manifest_json(
+    manifest_content: bytes | str,
+) -> list[dict[str, Any]] | None:
     """Parse manifest JSON content."""
     try:
-        manifest_data = json.loads(manifest_content)
+        # Raw bytes are parsed directly; the JSON decoder validates UTF-8
+        manifest_data = json_codec.loads(manifest_content)
         if not isinstance(manifest_data, list) or len(manifest_data) == 0:
             return None
         return manifest_data
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return None
 
 
 def has_required_fields(
-    manifest_entry: dict[str, Any], required_fields: list[str]
+    manifest_entry: dict[str, Any], required_fields: Iterable[str]
 ) -> bool:
     """Check if manifest entry has all required fields."""
-    return all(field in manifest_entry for field in required_fields)
+    return all(map(manifest_entry.__contains__, required_fields))
 
 
 def is_config_file_exists(config_path: str, tar_members: set[str]) -> bool:
@@ -69,16 +90,14 @@ def are_layers_valid(layers: Any) -> bool:
 
 def are_all_layers_exist(layers: list[str], tar_members: set[str]) -> bool:
     """Check if all layer files exist in tar members."""
-    return all(layer in tar_members for layer in layers)
+    return tar_members.issuperset(layers)
 
 
 def validate_manifest_entry(
     manifest_entry: dict[str, Any], tar_members: set[str]
 ) -> bool:
     """Validate a single manifest entry."""
-    required_fields = ["Config", "Layers"]
-
-    if not has_required_fields(manifest_entry, required_fields):
+    if not has_required_fields(manifest_entry, REQUIRED_MANIFEST_FIELDS):
         return False
 
     config_path = manifest_entry["Config"]
@@ -99,12 +118,152 @@ def validate_all_manifest_entries(
     return all(validate_manifest_entry(entry, tar_members) for entry in manifest_data)
 
 
-def validate_docker_tar(tar_path: Path) -> bool:
+def get_required_paths(manifest_data: list[dict[str, Any]]) -> set[str] | None:
+    """Collect the config and layer paths all manifest entries refer to."""
+    required_paths: set[str] = set()
+    for entry in manifest_data:
+        if not has_required_fields(entry, REQUIRED_MANIFEST_FIELDS):
+            return None
+        if not are_layers_valid(entry["Layers"]):
+            return None
+        required_paths.add(entry["Config"])
+        required_paths.update(entry["Layers"])
+    return required_paths
+
+
+def load_docker_tar_manifest(tar: tarfile.TarFile) -> list[dict[str, Any]] | None:
+    """Validate an open tar file's Docker image structure and load its manifest.
+
+    Members are read one header at a time. manifest.json is parsed as soon
+    as it is reached, and the scan stops once it and every config and layer
+    it lists have been seen, so headers after them are left unread.
+
+    Args:
+        tar: Open tar file
+
+    Returns:
+        Parsed manifest.json entries, or None if the structure is invalid
+    """
+    tar_members: set[str] = set()
+    manifest_data: list[dict[str, Any]] | None = None
+    # Paths the manifest needs that have not been seen yet
+    missing_paths: set[str] | None = None
+
+    for member in tar:
+        tar_members.add(member.name)
+
+        if missing_paths is None:
+            if member.name != "manifest.json":
+                continue
+
+            manifest_content = extract_manifest_content(tar, member)
+            if manifest_content is None:
+                return None
+
+            manifest_data = parse_manifest_json(manifest_content)
+            if manifest_data is None:
+                return None
+
+            required_paths = get_required_paths(manifest_data)
+            if required_paths is None:
+                return None
+            missing_paths = required_paths - tar_members
+        else:
+            missing_paths.discard(member.name)
+
+        if not missing_paths:
+            return manifest_data
+
+    return None
+
+
+def is_valid_docker_tar(tar: tarfile.TarFile) -> bool:
+    """Check if an open tar file has a valid Docker image structure."""
+    return load_docker_tar_manifest(tar) is not None
+
+
+def open_tarfile(tar_path: Path) -> tarfile.TarFile | None:
+    """
+    Open a tar file for reading, or return None if it is not a tar archive.
+
+    Opening is also the format check ``tarfile.is_tarfile`` would do, so
+    checking first and then opening would read the file's start twice. A
+    missing file surfaces as ``FileNotFoundError`` instead of a separate
+    existence check.
+
+    Args:
+        tar_path: Path to the tar file
+
+    Returns:
+        Open tar file, or None if the file is not a tar archive
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    try:
+        return tarfile.open(tar_path, "r")
+    except tarfile.TarError:
+        return None
+
+
+def read_docker_tar_manifest(tar_path: Path) -> list[dict[str, Any]] | None:
+    """Read a Docker tar file's manifest, or None if its structure is invalid."""
+    tar = open_tarfile(tar_path)
+    if tar is None:
+        return None
+
+    with tar:
+        return load_docker_tar_manifest(tar)
+
+
+@functools.lru_cache(maxsize=TAR_METADATA_CACHE_MAX_SIZE)
+def read_docker_tar_manifest_cached(key: TarFileKey) -> list[dict[str, Any]] | None:
+    """Read a Docker tar file's manifest, cached by tar file identity."""
+    return read_docker_tar_manifest(Path(key[0]))
+
+
+def find_docker_tar_manifest(
+    tar_path: Path, use_cache: bool = True
+) -> list[dict[str, Any]] | None:
+    """
+    Validate a Docker tar file and get its manifest.
+
+    Validation and manifest reads share one cache entry per tar file, so
+    validating a file and then reading its manifest parses it once. The
+    cached manifest is returned as is and must not be modified.
+
+    Args:
+        tar_path: Path to the tar file
+        use_cache: Reuse the manifest of a tar file that has not changed
+            since it was last read
+
+    Returns:
+        Manifest entries, or None if the file is not a valid Docker image
+        tar file
+
+    Raises:
+        ValidationError: If the tar file is missing or cannot be read
+    """
+    try:
+        key = get_tar_file_key(tar_path) if use_cache else None
+        if key is not None:
+            return read_docker_tar_manifest_cached(key)
+        return read_docker_tar_manifest(tar_path)
+
+    except FileNotFoundError as e:
+        raise ValidationError(f"Tar file does not exist: {tar_path}") from e
+    except (tarfile.TarError, OSError) as e:
+        raise ValidationError(f"Error reading tar file: {e}") from e
+
+
+def validate_docker_tar(tar_path: Path, use_cache: bool = True) -> bool:
     """
     Validate if a tar file is a valid Docker image tar file.
 
     Args:
         tar_path: Path to the tar file to validate
+        use_cache: Reuse the result for a tar file that has not changed
+            since it was last validated
 
     Returns:
         True if valid Docker image tar file, False otherwise
@@ -112,32 +271,71 @@ def validate_docker_tar(tar_path: Path) -> bool:
     Raises:
         ValidationError: If tar file is corrupted or invalid format
     """
+    return find_docker_tar_manifest(tar_path, use_cache) is not None
+
+
+@contextmanager
+def open_docker_tar_with_manifest(
+    tar_path: Path,
+) -> Iterator[tuple[tarfile.TarFile, list[dict[str, Any]]]]:
+    """
+    Open a valid Docker image tar file together with its parsed manifest.
+
+    Validation and the caller's reads share the open tar file, so its member
+    table is read once instead of once for validation and again for reading,
+    and the manifest.json parsed during validation is handed to the caller.
+
+    Args:
+        tar_path: Path to the tar file
+
+    Yields:
+        Tuple of (open, validated tar file, manifest entries)
+
+    Raises:
+        ValidationError: If tar file is missing, corrupted or not a valid
+            Docker image tar file
+    """
     try:
-        if not is_path_exists(tar_path):
-            raise ValidationError(f"Tar file does not exist: {tar_path}")
+        tar = open_tarfile(tar_path)
+    except FileNotFoundError as e:
+        raise ValidationError(f"Tar file does not exist: {tar_path}") from e
+    except OSError as e:
+        raise ValidationError(f"Error reading tar file: {e}") from e
 
-        if not is_valid_tarfile(tar_path):
-            return False
+    if tar is None:
+        raise ValidationError(f"Invalid Docker tar file: {tar_path}")
 
-        with tarfile.open(tar_path, "r") as tar:
-            tar_members = get_tar_members(tar)
-            required_files = ["manifest.json"]
+    with tar:
+        # Only errors from validating are validation errors; errors from the
+        # caller's reads propagate unchanged
+        try:
+            manifest_data = load_docker_tar_manifest(tar)
+        except (tarfile.TarError, OSError) as e:
+            raise ValidationError(f"Error reading tar file: {e}") from e
 
-            if not has_required_files(tar_members, required_files):
-                return False
+        if manifest_data is None:
+            raise ValidationError(f"Invalid Docker tar file: {tar_path}")
 
-            manifest_content = extract_manifest_content(tar)
-            if manifest_content is None:
-                return False
+        yield tar, manifest_data
 
-            manifest_data = parse_manifest_json(manifest_content)
-            if manifest_data is None:
-                return False
 
-            return validate_all_manifest_entries(manifest_data, tar_members)
+@contextmanager
+def open_docker_tar(tar_path: Path) -> Iterator[tarfile.TarFile]:
+    """
+    Open a tar file after checking it is a valid Docker image tar file.
 
-    except (tarfile.TarError, OSError) as e:
-        raise ValidationError(f"Error reading tar file: {e}") from e
+    Args:
+        tar_path: Path to the tar file
+
+    Yields:
+        Open, validated tar file
+
+    Raises:
+        ValidationError: If tar file is missing, corrupted or not a valid
+            Docker image tar file
+    """
+    with open_docker_tar_with_manifest(tar_path) as (tar, _):
+        yield tar
 
 
 def extract_and_parse_manifest(tar: tarfile.TarFile) -> list[dict[str, Any]]:
@@ -146,16 +344,17 @@ def extract_and_parse_manifest(tar: tarfile.TarFile) -> list[dict[str, Any]]:
     if manifest_member is None:
         raise ValidationError("Cannot extract manifest.json")
 
-    manifest_content = manifest_member.read().decode("utf-8")
-    return json.loads(manifest_content)  # type: ignore[no-any-return]
+    return json_codec.loads(manifest_member.read())  # type: ignore[no-any-return]
 
 
-def get_tar_manifest(tar_path: Path) -> list[dict[str, Any]]:
+def get_tar_manifest(tar_path: Path, use_cache: bool = True) -> list[dict[str, Any]]:
     """
     Extract and return the manifest from a Docker tar file.
 
     Args:
         tar_path: Path to the tar file
+        use_cache: Reuse the manifest of a tar file that has not changed
+            since it was last validated or read
 
     Returns:
         List of manifest entries
@@ -163,11 +362,9 @@ def get_tar_manifest(tar_path: Path) -> list[dict[str, Any]]:
     Raises:
         ValidationError: If tar file is invalid or manifest cannot be read
     """
-    if not validate_docker_tar(tar_path):
+    manifest_data = find_docker_tar_manifest(tar_path, use_cache)
+    if manifest_data is None:
         raise ValidationError(f"Invalid Docker tar file: {tar_path}")
 
-    try:
-        with tarfile.open(tar_path, "r") as tar:
-            return extract_and_parse_manifest(tar)
-    except (tarfile.TarError, json.JSONDecodeError, UnicodeDecodeError) as e:
-        raise ValidationError(f"Error reading manifest: {e}") from e
+    # Callers get their own copy, so changing it cannot affect the cache
+    return copy.deepcopy(manifest_data)
@@ -1,26 +1,28 @@
 """Test configuration and fixtures."""
 
 import asyncio
+import contextlib
 import os
-import socket
 
 import pytest
 import pytest_asyncio
 
-from registry_api_v2_client import check_registry_connectivity
+from registry_api_v2_client import check_registry_connectivity, create_session
 from tests.helpers import TestContext
 
 
-def is_port_open(host, port):
-    """Check if a port is open."""
+async def is_port_open(host, port, timeout=1.0):
+    """Check if a port is open without blocking the event loop."""
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(1)
-            result = sock.connect_ex((host, port))
-            return result == 0
-    except Exception:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError):
         return False
 
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
 
 @pytest.fixture(scope="session")
 def registry_port():
@@ -28,16 +30,16 @@ def registry_port():
     return int(os.getenv("REGISTRY_PORT", "15000"))
 
 
-@pytest_asyncio.fixture(scope="session")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def registry_url(registry_port):
     """Get registry URL and ensure it's available."""
     url = f"http://localhost:{registry_port}"
 
-    # Wait for registry to be available (for CI)
-    max_attempts = 30
+    # Wait for registry to be available (for CI), backing off up to 1s
+    max_attempts = 32
     for attempt in range(max_attempts):
         try:
-            if is_port_open("localhost", registry_port):
+            if await is_port_open("localhost", registry_port):
                 result = await check_registry_connectivity(url)
                 if result:
                     return url
@@ -45,15 +47,29 @@ async def registry_url(registry_port):
             pass
 
         if attempt < max_attempts - 1:
-            await asyncio.sleep(1)
+            await asyncio.sleep(min(0.1 * 2**attempt, 1.0))
 
     # Skip if registry not available
     pytest.skip(f"Registry not available at {url}")
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_session():
+    """Create one HTTP session shared by tests that only need a session."""
+    session = await create_session()
+    yield session
+    await session.close()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
 async def test_context(registry_url):
-    """Create isolated test context."""
+    """Create isolated test context, shared by the tests of a module.
+
+    Each test names its repositories with a distinct base name, so sharing
+    the context keeps them apart while the registry is cleaned up once per
+    module instead of once per test. Like the other async session fixtures
+    it runs on the session event loop, and so must the tests using it.
+    """
     async with TestContext(registry_url) as ctx:
         yield ctx
 
@@ -78,12 +94,3 @@ def pytest_collection_modifyitems(config, items):
             and os.getenv("REGISTRY_AVAILABLE", "false").lower() != "true"
         ):
             item.add_marker(skip_integration)
-
-
-# Async event loop fixture
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
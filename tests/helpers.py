@@ -1,10 +1,21 @@
-"""Test helper functions for isolation and cleanup."""
+"""Test helper functions for archives, isolation and cleanup."""
 
+import asyncio
+import io
 import os
+import tarfile
 import time
 import uuid
+from pathlib import Path
+from typing import Any
 
-from registry_api_v2_client import delete_image, list_repositories, list_tags
+from registry_api_v2_client import (
+    create_session,
+    delete_image,
+    list_repositories,
+    list_tags,
+)
+from registry_api_v2_client.core import json_codec
 
 
 def generate_test_id() -> str:
@@ -20,22 +31,63 @@ def make_repo_name(base_name: str, test_id: str) -> str:
     return f"test-{test_id}-{base_name}"
 
 
+def write_tar(tar_path: Path, members: dict[str, Any]) -> Path:
+    """Write a tar file of the given member names and contents.
+
+    Bytes are stored as they are; any other value is stored as compact
+    JSON, encoded by the library's own codec. The archive is built in memory
+    and written with a single call, without staging the members as files on
+    disk.
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, value in members.items():
+            content = value if isinstance(value, bytes) else json_codec.dumps(value)
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, fileobj=io.BytesIO(content))
+    tar_path.write_bytes(buffer.getvalue())
+    return tar_path
+
+
+# Cleanup requests in flight at once, to spare the registry
+CLEANUP_MAX_CONCURRENCY = 16
+
+
 async def cleanup_test_repositories(registry_url: str, test_id: str) -> None:
-    """Clean up all repositories created during test."""
+    """Clean up all repositories created during test.
+
+    Tags of all test repositories are listed, and their images deleted,
+    concurrently over one shared session.
+    """
     try:
-        repos = await list_repositories(registry_url)
-        test_repos = [repo for repo in repos if test_id in repo]
-
-        for repo in test_repos:
-            try:
-                tags = await list_tags(registry_url, repo)
-                for tag in tags:
-                    try:
-                        await delete_image(registry_url, repo, tag)
-                    except:
-                        pass  # Ignore cleanup errors
-            except:
-                pass  # Ignore cleanup errors
+        async with await create_session() as session:
+            repos = await list_repositories(registry_url, session=session)
+            test_repos = [repo for repo in repos if test_id in repo]
+            semaphore = asyncio.Semaphore(CLEANUP_MAX_CONCURRENCY)
+
+            async def bounded(coro):
+                async with semaphore:
+                    return await coro
+
+            tag_lists = await asyncio.gather(
+                *(
+                    bounded(list_tags(registry_url, repo, session=session))
+                    for repo in test_repos
+                ),
+                return_exceptions=True,
+            )
+
+            # Ignore cleanup errors
+            await asyncio.gather(
+                *(
+                    bounded(delete_image(registry_url, repo, tag, session=session))
+                    for repo, tags in zip(test_repos, tag_lists, strict=True)
+                    if not isinstance(tags, BaseException)
+                    for tag in tags
+                ),
+                return_exceptions=True,
+            )
     except:
         pass  # Ignore cleanup errors
 
@@ -1,67 +1,38 @@
 """Basic async functionality tests."""
 
+import inspect
+
 import aiohttp
 import pytest
 
+import registry_api_v2_client
 from registry_api_v2_client.core.connectivity import check_connectivity
-from registry_api_v2_client.core.session import create_session
-from registry_api_v2_client.core.types import RegistryConfig
-
-
-@pytest.fixture
-def registry_config():
-    """Registry configuration fixture."""
-    return RegistryConfig(url="http://localhost:15000", timeout=30)
 
 
-@pytest.mark.asyncio
-async def test_create_session():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_session(shared_session):
     """Test async session creation."""
-    session = await create_session()
-    assert isinstance(session, aiohttp.ClientSession)
-    await session.close()
-
-
-@pytest.mark.asyncio
-async def test_check_connectivity_success(registry_config):
-    """Test successful connectivity check."""
-    # Test the simple case - just check that the function is async
-    import asyncio
-
-    assert asyncio.iscoroutinefunction(check_connectivity)
-
-
-@pytest.mark.asyncio
-async def test_check_connectivity_network_error(registry_config):
-    """Test connectivity check with network error."""
-    # Test the simple case - just check that the function is async
-    import asyncio
-
-    assert asyncio.iscoroutinefunction(check_connectivity)
-
-
-@pytest.mark.asyncio
-async def test_registry_operations_are_async():
+    assert isinstance(shared_session, aiohttp.ClientSession)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "check_registry_connectivity",
+        "push_docker_tar",
+        "list_repositories",
+        "list_tags",
+        "get_manifest",
+        "get_image_info",
+        "delete_image",
+        "delete_image_by_digest",
+    ],
+)
+def test_registry_operations_are_async(name):
     """Test that main registry operations are async functions."""
-    import asyncio
+    assert inspect.iscoroutinefunction(getattr(registry_api_v2_client, name))
 
-    from registry_api_v2_client import (
-        check_registry_connectivity,
-        delete_image,
-        delete_image_by_digest,
-        get_image_info,
-        get_manifest,
-        list_repositories,
-        list_tags,
-        push_docker_tar,
-    )
 
-    # Check that all functions are coroutine functions
-    assert asyncio.iscoroutinefunction(check_registry_connectivity)
-    assert asyncio.iscoroutinefunction(push_docker_tar)
-    assert asyncio.iscoroutinefunction(list_repositories)
-    assert asyncio.iscoroutinefunction(list_tags)
-    assert asyncio.iscoroutinefunction(get_manifest)
-    assert asyncio.iscoroutinefunction(get_image_info)
-    assert asyncio.iscoroutinefunction(delete_image)
-    assert asyncio.iscoroutinefunction(delete_image_by_digest)
+def test_check_connectivity_is_async():
+    """Test that the connectivity check is an async function."""
+    assert inspect.iscoroutinefunction(check_connectivity)
@@ -4,18 +4,16 @@ import asyncio
 
 import pytest
 
-from registry_api_v2_client.core.session import create_session
+import registry_api_v2_client
 from registry_api_v2_client.tar.tags import (
     parse_repository_tag,
 )
 
 
-@pytest.mark.asyncio
-async def test_create_session():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_session(shared_session):
     """Test async session creation."""
-    session = await create_session()
-    assert session is not None
-    await session.close()
+    assert shared_session is not None
 
 
 def test_tag_functions_are_sync():
@@ -38,9 +36,10 @@ def test_tag_functions_are_sync():
 async def test_async_workflow_concepts():
     """Test that our async concepts work."""
 
-    # Test that we can use asyncio.gather
+    # Test that we can use asyncio.gather; sleep(0) yields to the loop
+    # without waiting on a timer
     async def dummy_task(n):
-        await asyncio.sleep(0.001)  # Very short sleep
+        await asyncio.sleep(0)
         return n * 2
 
     results = await asyncio.gather(dummy_task(1), dummy_task(2), dummy_task(3))
@@ -48,23 +47,18 @@ async def test_async_workflow_concepts():
     assert results == [2, 4, 6]
 
 
-def test_imports_work():
+@pytest.mark.parametrize(
+    "name",
+    [
+        "check_registry_connectivity",
+        "extract_original_tags",
+        "get_primary_tag",
+        "parse_repository_tag",
+        "push_docker_tar",
+        "push_docker_tar_with_all_original_tags",
+        "push_docker_tar_with_original_tags",
+    ],
+)
+def test_imports_work(name):
     """Test that all our main imports work."""
-    from registry_api_v2_client import (
-        check_registry_connectivity,
-        extract_original_tags,
-        get_primary_tag,
-        parse_repository_tag,
-        push_docker_tar,
-        push_docker_tar_with_all_original_tags,
-        push_docker_tar_with_original_tags,
-    )
-
-    # Test that functions are callable
-    assert callable(extract_original_tags)
-    assert callable(parse_repository_tag)
-    assert callable(get_primary_tag)
-    assert callable(check_registry_connectivity)
-    assert callable(push_docker_tar)
-    assert callable(push_docker_tar_with_original_tags)
-    assert callable(push_docker_tar_with_all_original_tags)
+    assert callable(getattr(registry_api_v2_client, name))
@@ -1,19 +1,34 @@
 """Comprehensive test coverage for core modules."""
 
+import bz2
+import gzip
 import hashlib
+import io
 import json
+import lzma
+import os
 import tarfile
-import tempfile
+import time
+from datetime import UTC, datetime
 from pathlib import Path
 
 import aiohttp
 import pytest
+import pytest_asyncio
 
+from registry_api_v2_client.core import connectivity, json_codec
 from registry_api_v2_client.core.connectivity import (
     check_api_version_header,
+    clear_connectivity_cache,
+    ensure_connectivity,
     validate_connectivity_response,
 )
-from registry_api_v2_client.core.session import create_session, parse_json_response
+from registry_api_v2_client.core.executor import run_tar_io
+from registry_api_v2_client.core.session import (
+    create_session,
+    parse_json_response,
+    session_scope,
+)
 from registry_api_v2_client.core.types import (
     BlobInfo,
     ManifestInfo,
@@ -25,17 +40,55 @@ from registry_api_v2_client.exceptions import (
     TarReadError,
     ValidationError,
 )
+from registry_api_v2_client.operations import blobs
+from registry_api_v2_client.operations.blobs import (
+    build_digest_url,
+    check_blob_exists,
+    clear_blob_cache,
+    extract_blob_from_tar,
+    forget_blobs,
+    is_blob_known,
+    iter_blob_chunks,
+    locate_blob_in_tar,
+    remember_blob,
+    report_progress,
+    resolve_location,
+    stream_blob_from_tar,
+)
 from registry_api_v2_client.operations.manifests import (
     calculate_manifest_digest,
     create_manifest_v2,
 )
+from registry_api_v2_client.operations.repositories import extract_next_link
+from registry_api_v2_client.tar.cache import CACHE_DIR_ENV, load_processed_tar
+from registry_api_v2_client.tar.members import (
+    get_tar_index,
+    get_tar_members,
+    read_tar_member,
+    scan_tar_members,
+)
+from registry_api_v2_client.tar.processor import (
+    process_tar_file,
+    process_tar_file_with_tags,
+)
 from registry_api_v2_client.tar.tags import (
     extract_original_tags,
     get_primary_tag,
     parse_repository_tag,
+    read_original_tags_cached,
+)
+from registry_api_v2_client.tar.validator import validate_tar_structure
+from registry_api_v2_client.utils.digest import (
+    calculate_digest,
+    digest_matches,
+    get_hasher,
+    is_valid_digest,
 )
 from registry_api_v2_client.utils.inspect import (
     extract_json_file,
+    inspect_docker_tar,
+    parse_created_timestamp,
+    read_docker_tar_inspect_cached,
     validate_manifest_data,
 )
 from registry_api_v2_client.utils.validator import (
@@ -43,20 +96,15 @@ from registry_api_v2_client.utils.validator import (
     is_valid_tarfile,
     validate_docker_tar,
 )
+from tests.helpers import write_tar
 
 
-@pytest.fixture
-def registry_config():
-    """Registry configuration fixture."""
-    return RegistryConfig(url="http://localhost:15000", timeout=30)
-
-
-@pytest.fixture
-def test_tar_file():
-    """Create a test tar file."""
-    config_content = json.dumps(
+@pytest.fixture(scope="session")
+def test_tar_file(tmp_path_factory):
+    """Create a test tar file, shared by every test that only reads it."""
+    config_content = json_codec.dumps(
         {"architecture": "amd64", "os": "linux", "created": "2024-01-01T00:00:00Z"}
-    ).encode("utf-8")
+    )
     layer_content = b"dummy layer data"
 
     config_hash = hashlib.sha256(config_content).hexdigest()
@@ -72,33 +120,32 @@ def test_tar_file():
 
     repositories = {"test": {"latest": config_hash}}
 
-    tar_path = tempfile.mktemp(suffix=".tar")
-
-    with tarfile.open(tar_path, "w") as tar:
-        # Add manifest.json
-        manifest_info = tarfile.TarInfo("manifest.json")
-        manifest_content = json.dumps(manifest).encode("utf-8")
-        manifest_info.size = len(manifest_content)
-        tar.addfile(manifest_info, fileobj=tarfile.io.BytesIO(manifest_content))
+    tar_path = write_tar(
+        tmp_path_factory.mktemp("tar") / "test.tar",
+        {
+            "manifest.json": manifest,
+            "repositories": repositories,
+            f"blobs/sha256/{config_hash}": config_content,
+            f"blobs/sha256/{layer_hash}": layer_content,
+        },
+    )
+    return str(tar_path)
 
-        # Add repositories
-        repos_info = tarfile.TarInfo("repositories")
-        repos_content = json.dumps(repositories).encode("utf-8")
-        repos_info.size = len(repos_content)
-        tar.addfile(repos_info, fileobj=tarfile.io.BytesIO(repos_content))
 
-        # Add config blob
-        config_info = tarfile.TarInfo(f"blobs/sha256/{config_hash}")
-        config_info.size = len(config_content)
-        tar.addfile(config_info, fileobj=tarfile.io.BytesIO(config_content))
+@pytest.fixture(scope="session", params=["gz", "bz2", "xz"])
+def compressed_tar_file(request, test_tar_file, tmp_path_factory):
+    """Compress the test tar file, as a .tar.gz, .tar.bz2 or .tar.xz."""
+    compress = {"gz": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+    tar_path = tmp_path_factory.mktemp("compressed") / f"test.tar.{request.param}"
+    tar_path.write_bytes(compress[request.param](Path(test_tar_file).read_bytes()))
+    return str(tar_path)
 
-        # Add layer blob
-        layer_info = tarfile.TarInfo(f"blobs/sha256/{layer_hash}")
-        layer_info.size = len(layer_content)
-        tar.addfile(layer_info, fileobj=tarfile.io.BytesIO(layer_content))
 
-    yield tar_path
-    Path(tar_path).unlink(missing_ok=True)
+@pytest.fixture(scope="session")
+def opened_tar(test_tar_file):
+    """Open the shared test tar file once for tests that only read members."""
+    with tarfile.open(test_tar_file, "r:") as tar:
+        yield tar
 
 
 class TestCoreTypes:
@@ -109,6 +156,15 @@ class TestCoreTypes:
         config = RegistryConfig(url="http://test.com", timeout=60)
         assert config.base_url == "http://test.com"
         assert config.timeout == 60
+        assert config.max_concurrent_uploads == 8
+        assert config.verify_digests is False
+
+    def test_registry_config_api_url(self):
+        """Test API URL keeps path prefixes and nested repository names."""
+        config = RegistryConfig(url="http://test.com/mirror/")
+        url = config.api_url / "library/nginx" / "manifests" / "latest"
+        assert str(url) == "http://test.com/mirror/v2/library/nginx/manifests/latest"
+        assert config.api_url is config.api_url
 
     def test_blob_info_creation(self):
         """Test BlobInfo creation."""
@@ -119,6 +175,9 @@ class TestCoreTypes:
         )
         assert blob.digest == "sha256:abc123"
         assert blob.size == 1024
+        assert not hasattr(blob, "__dict__")
+        assert blob == BlobInfo("sha256:abc123", 1024, blob.media_type)
+        assert len({blob, BlobInfo("sha256:abc123", 1024, blob.media_type)}) == 1
 
     def test_request_result_creation(self):
         """Test RequestResult creation."""
@@ -135,50 +194,51 @@ class TestCoreTypes:
 class TestSessionOperations:
     """Test session operations."""
 
-    @pytest.mark.asyncio
-    async def test_create_session(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_create_session(self, shared_session):
         """Test session creation."""
-        session = await create_session()
-        assert isinstance(session, aiohttp.ClientSession)
-        await session.close()
-
-    def test_parse_json_response_valid(self):
-        """Test JSON response parsing with valid JSON."""
-        json_text = '{"key": "value", "number": 42}'
-        result = parse_json_response(json_text)
-        assert result == {"key": "value", "number": 42}
+        assert isinstance(shared_session, aiohttp.ClientSession)
 
-    def test_parse_json_response_invalid(self):
-        """Test JSON response parsing with invalid JSON."""
-        result = parse_json_response("invalid json")
-        assert result is None
+    @pytest.mark.asyncio
+    async def test_create_session_connector_defaults(self):
+        """Test session connector is tuned for connection reuse."""
+        session = await create_session()
+        try:
+            connector = session.connector
+            assert isinstance(connector, aiohttp.TCPConnector)
+            assert connector.limit_per_host == 30
+            assert connector.use_dns_cache
+            assert not connector.force_close
+        finally:
+            await session.close()
 
-    def test_parse_json_response_empty(self):
-        """Test JSON response parsing with empty string."""
-        result = parse_json_response("")
-        assert result is None
+    @pytest.mark.parametrize(
+        ("payload", "expected"),
+        [
+            ('{"key": "value", "number": 42}', {"key": "value", "number": 42}),
+            ("invalid json", None),
+            ("", None),
+        ],
+    )
+    def test_parse_json_response(self, payload, expected):
+        """Test JSON response parsing with valid, invalid and empty text."""
+        assert parse_json_response(payload) == expected
 
 
 class TestConnectivity:
     """Test connectivity functions."""
 
-    def test_check_api_version_header_valid(self):
-        """Test API version header check with valid header."""
-        headers = {"Docker-Distribution-Api-Version": "registry/2.0"}
-        result = check_api_version_header(headers)
-        assert result is True
-
-    def test_check_api_version_header_invalid(self):
-        """Test API version header check with invalid header."""
-        headers = {"Docker-Distribution-Api-Version": "registry/1.0"}
-        result = check_api_version_header(headers)
-        assert result is False
-
-    def test_check_api_version_header_missing(self):
-        """Test API version header check with missing header."""
-        headers = {}
-        result = check_api_version_header(headers)
-        assert result is False
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"Docker-Distribution-Api-Version": "registry/2.0"}, True),
+            ({"Docker-Distribution-Api-Version": "registry/1.0"}, False),
+            ({}, False),
+        ],
+    )
+    def test_check_api_version_header(self, headers, expected):
+        """Test API version header check with valid, invalid and missing header."""
+        assert check_api_version_header(headers) is expected
 
     def test_validate_connectivity_response_success(self):
         """Test connectivity response validation with success."""
@@ -194,52 +254,177 @@ class TestConnectivity:
         with pytest.raises(RegistryError):
             validate_connectivity_response(result)
 
+    @pytest.mark.asyncio
+    async def test_ensure_connectivity_uses_session_cache(self):
+        """Test that a registry the session verified is not checked again."""
+        # Nothing listens on port 1, so a real check would fail
+        config = RegistryConfig(url="http://127.0.0.1:1", timeout=1)
+        async with aiohttp.ClientSession() as session:
+            connectivity._verified_registries[session] = {
+                config.base_url: time.monotonic()
+            }
+            await ensure_connectivity(config, session)
+
+            # Another session, or none at all, checks the registry itself
+            async with aiohttp.ClientSession() as other_session:
+                with pytest.raises(RegistryError):
+                    await ensure_connectivity(config, other_session)
+            with pytest.raises(RegistryError):
+                await ensure_connectivity(config)
+
+            clear_connectivity_cache(session)
+            with pytest.raises(RegistryError):
+                await ensure_connectivity(config, session)
+
+    @pytest.mark.asyncio
+    async def test_ensure_connectivity_checks_unverified_registry(self):
+        """Test that an unverified registry is actually checked."""
+        config = RegistryConfig(url="http://127.0.0.1:1", timeout=1)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(RegistryError):
+                await ensure_connectivity(config, session)
+            assert config.base_url not in connectivity._verified_registries.get(
+                session, {}
+            )
+
+
+CONFIG_MEDIA_TYPE = "application/vnd.docker.container.image.v1+json"
+LAYER_MEDIA_TYPE = "application/vnd.docker.image.rootfs.diff.tar.gzip"
+MANIFEST_MEDIA_TYPE = "application/vnd.docker.distribution.manifest.v2+json"
+
+CONFIG_BLOB = BlobInfo(
+    digest="sha256:config123", size=1024, media_type=CONFIG_MEDIA_TYPE
+)
+LAYER_BLOBS = (
+    BlobInfo(digest="sha256:layer123", size=2048, media_type=LAYER_MEDIA_TYPE),
+    BlobInfo(digest="sha256:layer456", size=4096, media_type=LAYER_MEDIA_TYPE),
+)
+
+MANIFEST_INFO = ManifestInfo(
+    config=CONFIG_BLOB,
+    layers=LAYER_BLOBS[:1],
+    schema_version=2,
+    media_type=MANIFEST_MEDIA_TYPE,
+)
+
+# (layers, expected manifest)
+MANIFEST_CASES = [
+    (
+        layers,
+        {
+            "schemaVersion": 2,
+            "mediaType": MANIFEST_MEDIA_TYPE,
+            "config": {
+                "mediaType": CONFIG_MEDIA_TYPE,
+                "size": 1024,
+                "digest": "sha256:config123",
+            },
+            "layers": [
+                {
+                    "mediaType": LAYER_MEDIA_TYPE,
+                    "size": layer.size,
+                    "digest": layer.digest,
+                }
+                for layer in layers
+            ],
+        },
+    )
+    for layers in (LAYER_BLOBS[:1], LAYER_BLOBS, ())
+]
+
+# (manifest, digest of its compact JSON form)
+MANIFEST_DIGEST_CASES = [
+    (
+        {"schemaVersion": 2, "mediaType": MANIFEST_MEDIA_TYPE},
+        "sha256:74650f9ea72d624d418435f57b997feec86725c0dccb55d3c9e96d6b8d0669b0",
+    ),
+    (
+        {"schemaVersion": 2, "layers": []},
+        "sha256:6ece6defe7067e1c5455a7720c1189ad30f7f8efe78587bd7c06e64a80fe7770",
+    ),
+]
+
 
 class TestManifestOperations:
     """Test manifest operations."""
 
-    def test_create_manifest_v2(self):
+    @pytest.mark.parametrize(("layers", "expected"), MANIFEST_CASES)
+    def test_create_manifest_v2(self, layers, expected):
         """Test Docker manifest v2 creation."""
-        config = BlobInfo(
-            digest="sha256:config123",
-            size=1024,
-            media_type="application/vnd.docker.container.image.v1+json",
-        )
-        layers = [
-            BlobInfo(
-                digest="sha256:layer123",
-                size=2048,
-                media_type="application/vnd.docker.image.rootfs.diff.tar.gzip",
-            )
-        ]
-
         manifest_info = ManifestInfo(
-            config=config,
+            config=CONFIG_BLOB,
             layers=layers,
             schema_version=2,
-            media_type="application/vnd.docker.distribution.manifest.v2+json",
+            media_type=MANIFEST_MEDIA_TYPE,
         )
-
-        manifest = create_manifest_v2(manifest_info)
-
-        assert manifest["schemaVersion"] == 2
-        assert (
-            manifest["mediaType"]
-            == "application/vnd.docker.distribution.manifest.v2+json"
-        )
-        assert manifest["config"]["digest"] == "sha256:config123"
-        assert len(manifest["layers"]) == 1
-        assert manifest["layers"][0]["digest"] == "sha256:layer123"
-
-    def test_calculate_manifest_digest(self):
-        """Test manifest digest calculation."""
-        manifest = {
-            "schemaVersion": 2,
-            "mediaType": "application/vnd.docker.distribution.manifest.v2+json",
-        }
-        digest = calculate_manifest_digest(manifest)
-        assert digest.startswith("sha256:")
-        assert len(digest) == 71  # "sha256:" + 64 hex chars
+        assert create_manifest_v2(manifest_info) == expected
+
+    @pytest.mark.parametrize(("manifest", "expected"), MANIFEST_DIGEST_CASES)
+    def test_calculate_manifest_digest(self, manifest, expected):
+        """Test manifest digests are reproducible across runs and backends."""
+        assert calculate_manifest_digest(manifest) == expected
+
+
+class TestJsonCodec:
+    """Test JSON encoding of registry payloads."""
+
+    MANIFEST = {"schemaVersion": 2, "annotations": {"title": "café"}}
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_dumps_is_compact_utf8(self, monkeypatch, has_orjson):
+        """Test both backends produce identical bytes."""
+        if has_orjson and not json_codec.HAS_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(json_codec, "HAS_ORJSON", has_orjson)
+        expected = '{"schemaVersion":2,"annotations":{"title":"café"}}'.encode()
+        assert json_codec.dumps(self.MANIFEST) == expected
+        assert json_codec.loads(expected) == self.MANIFEST
+
+    def test_loads_invalid_json(self):
+        """Test invalid documents raise JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads(b"{not json")
+
+
+class TestDigest:
+    """Test content digest utilities."""
+
+    def test_calculate_digest(self):
+        """Test digests match hashlib and carry the algorithm prefix."""
+        data = b"digest me"
+        assert calculate_digest(data) == f"sha256:{hashlib.sha256(data).hexdigest()}"
+        assert calculate_digest(data, "sha512").startswith("sha512:")
+
+    def test_is_valid_digest(self):
+        """Test digest format checks for supported algorithms."""
+        assert is_valid_digest(f"sha256:{'a' * 64}")
+        assert is_valid_digest(f"sha512:{'0' * 128}")
+        assert not is_valid_digest(f"sha256:{'a' * 63}")
+        assert not is_valid_digest(f"sha256:{'A' * 64}")
+        assert not is_valid_digest(f"sha256:{'a' * 62}/x")
+        assert not is_valid_digest(f"md5:{'a' * 32}")
+        assert not is_valid_digest("a" * 64)
+
+    def test_locate_blob_rejects_invalid_digest(self):
+        """Test malformed digests are rejected before touching the tar."""
+        with pytest.raises(RegistryError, match="Invalid blob digest"):
+            locate_blob_in_tar("/nonexistent.tar", "sha256:../../etc/passwd")
+
+    def test_digest_matches(self):
+        """Test hasher results are compared against expected digests."""
+        data = b"digest me"
+        digest = calculate_digest(data)
+        hasher = get_hasher()
+        hasher.update(data)
+        assert digest_matches(hasher, digest)
+        assert not digest_matches(hasher, calculate_digest(b"other"))
+        assert not digest_matches(hasher, digest.replace("sha256", "sha512"))
+        assert not digest_matches(hasher, "sha256:not-hex")
+
+    def test_get_hasher_unknown_algorithm(self):
+        """Test unsupported algorithms are rejected."""
+        with pytest.raises(ValueError):
+            get_hasher("not-an-algorithm")
 
 
 class TestTagOperations:
@@ -256,23 +441,31 @@ class TestTagOperations:
         assert repo == "test"
         assert tag == "latest"
 
-    def test_parse_repository_tag_with_tag(self):
-        """Test repository tag parsing with tag."""
-        repo, tag = parse_repository_tag("myrepo:v1.0")
-        assert repo == "myrepo"
-        assert tag == "v1.0"
+    @pytest.mark.parametrize(
+        ("reference", "expected"),
+        [
+            ("myrepo:v1.0", ("myrepo", "v1.0")),
+            ("myrepo", ("myrepo", "latest")),
+            ("registry.io/user/repo:v2.0", ("registry.io/user/repo", "v2.0")),
+        ],
+    )
+    def test_parse_repository_tag(self, reference, expected):
+        """Test repository tag parsing with tag, without tag and with registry."""
+        assert parse_repository_tag(reference) == expected
 
-    def test_parse_repository_tag_without_tag(self):
-        """Test repository tag parsing without tag."""
-        repo, tag = parse_repository_tag("myrepo")
-        assert repo == "myrepo"
-        assert tag == "latest"
 
-    def test_parse_repository_tag_with_registry(self):
-        """Test repository tag parsing with registry."""
-        repo, tag = parse_repository_tag("registry.io/user/repo:v2.0")
-        assert repo == "registry.io/user/repo"
-        assert tag == "v2.0"
+class TestTagPagination:
+    """Test Link header pagination helpers."""
+
+    def test_extract_next_link(self):
+        """Test extracting the next page from a Link header."""
+        headers = {"Link": '</v2/repo/tags/list?n=2&last=b>; rel="next"'}
+        assert extract_next_link(headers) == "/v2/repo/tags/list?n=2&last=b"
+
+    def test_extract_next_link_last_page(self):
+        """Test no next page without a Link header or next relation."""
+        assert extract_next_link({}) is None
+        assert extract_next_link({"Link": '</v2/repo/tags/list>; rel="prev"'}) is None
 
 
 class TestValidationOperations:
@@ -298,17 +491,11 @@ class TestValidationOperations:
         result = is_valid_tarfile(Path(test_tar_file))
         assert result is True
 
-    def test_is_valid_tarfile_false(self):
+    def test_is_valid_tarfile_false(self, tmp_path):
         """Test tarfile validation with non-tar file."""
-        # Create a temporary non-tar file
-        temp_file = tempfile.mktemp()
-        with open(temp_file, "w") as f:
-            f.write("not a tar file")
-        try:
-            result = is_valid_tarfile(Path(temp_file))
-            assert result is False
-        finally:
-            Path(temp_file).unlink(missing_ok=True)
+        not_tar = tmp_path / "not-a-tar"
+        not_tar.write_bytes(b"not a tar file")
+        assert is_valid_tarfile(not_tar) is False
 
 
 class TestInspectOperations:
@@ -331,14 +518,97 @@ class TestInspectOperations:
         result = validate_manifest_data("not a list")
         assert result is False
 
-    def test_extract_json_file(self, test_tar_file):
+    def test_parse_created_timestamp(self):
+        """Test RFC 3339 timestamps from image configs are parsed."""
+        created = parse_created_timestamp("2024-01-01T00:00:00.123456789Z")
+        assert created == datetime(2024, 1, 1, 0, 0, 0, 123456, tzinfo=UTC)
+        assert isinstance(parse_created_timestamp(None), datetime)
+
+    def test_extract_json_file(self, opened_tar):
         """Test JSON file extraction from tar."""
-        with tarfile.open(test_tar_file, "r") as tar:
-            data = extract_json_file(tar, "manifest.json")
-            assert data is not None
-            assert isinstance(data, list)
-            assert len(data) == 1
-            assert "Config" in data[0]
+        data = extract_json_file(opened_tar, "manifest.json")
+        assert data is not None
+        assert isinstance(data, list)
+        assert len(data) == 1
+        assert "Config" in data[0]
+
+    def test_process_tar_file_with_tags(self, test_tar_file):
+        """Test tags and manifest info come from one tar pass."""
+        tags, manifest_info, tar_path = process_tar_file_with_tags(test_tar_file)
+        assert tags == ["test:latest"]
+        assert tar_path == test_tar_file
+        assert len(manifest_info.layers) == 1
+        assert process_tar_file(test_tar_file) == (manifest_info, test_tar_file)
+
+    def test_process_tar_file_with_tags_cached(
+        self, test_tar_file, tmp_path, monkeypatch
+    ):
+        """Test processing results are cached on disk while the tar is unchanged."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        assert load_processed_tar(test_tar_file) is None
+
+        tags, manifest_info, _ = process_tar_file_with_tags(test_tar_file)
+        assert load_processed_tar(test_tar_file) == (tags, manifest_info)
+        assert process_tar_file_with_tags(test_tar_file)[:2] == (tags, manifest_info)
+
+        stat = os.stat(test_tar_file)
+        os.utime(test_tar_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert load_processed_tar(test_tar_file) is None
+
+    def test_process_tar_file_with_tags_repositories_fallback(self, tmp_path):
+        """Test tags fall back to the repositories file without RepoTags."""
+        config_content = b'{"architecture": "amd64", "os": "linux"}'
+        tar_path = write_tar(
+            tmp_path / "legacy.tar",
+            {
+                "manifest.json": [
+                    {"Config": "config.json", "RepoTags": [], "Layers": []}
+                ],
+                "repositories": {"legacy": {"v1": "abc"}},
+                "config.json": config_content,
+            },
+        )
+
+        tags, _, _ = process_tar_file_with_tags(str(tar_path))
+        assert tags == ["legacy:v1"]
+
+    def test_tar_metadata_readers_cached(self, test_tar_file):
+        """Test by-path readers reuse results while the tar is unchanged."""
+        read_docker_tar_inspect_cached.cache_clear()
+        read_original_tags_cached.cache_clear()
+
+        image = inspect_docker_tar(Path(test_tar_file))
+        image.repo_tags.append("changed:latest")
+        assert inspect_docker_tar(Path(test_tar_file)).repo_tags == ["test:latest"]
+        assert read_docker_tar_inspect_cached.cache_info().hits == 1
+
+        tags = extract_original_tags(test_tar_file)
+        tags.append("changed:latest")
+        assert extract_original_tags(test_tar_file) == ["test:latest"]
+        assert read_original_tags_cached.cache_info().hits == 1
+
+        stat = os.stat(test_tar_file)
+        os.utime(test_tar_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        inspect_docker_tar(Path(test_tar_file))
+        assert read_docker_tar_inspect_cached.cache_info().misses == 2
+
+        inspect_docker_tar(Path(test_tar_file), use_cache=False)
+        assert read_docker_tar_inspect_cached.cache_info().misses == 2
+
+    def test_process_tar_file_with_tags_invalid(self, tmp_path):
+        """Test a file that is not a tar archive is rejected."""
+        tar_path = tmp_path / "not-a-tar.tar"
+        tar_path.write_bytes(b"not a tar file")
+        with pytest.raises(ValidationError):
+            process_tar_file_with_tags(str(tar_path))
+
+    def test_validate_tar_structure(self, test_tar_file, tmp_path):
+        """Test tar structure validation raises for invalid tars."""
+        assert validate_tar_structure(test_tar_file) is True
+
+        tar_path = write_tar(tmp_path / "not-docker.tar", {"file.txt": b"data"})
+        with pytest.raises(ValidationError, match="Invalid Docker tar file"):
+            validate_tar_structure(str(tar_path))
 
 
 class TestExceptionHandling:
@@ -363,15 +633,361 @@ class TestExceptionHandling:
 class TestAsyncFunctions:
     """Test async function behavior."""
 
-    @pytest.mark.asyncio
-    async def test_async_session_context_manager(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_async_session_context_manager(self, shared_session):
         """Test async session context manager."""
-        session = await create_session()
-        try:
-            assert session is not None
-            assert isinstance(session, aiohttp.ClientSession)
-        finally:
-            await session.close()
+        assert shared_session is not None
+        assert isinstance(shared_session, aiohttp.ClientSession)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_session_scope_reuses_given_session(self, shared_session):
+        """Test that a provided session is reused and left open."""
+        async with session_scope(shared_session) as scoped:
+            assert scoped is shared_session
+        assert not shared_session.closed
+
+    @pytest.mark.asyncio
+    async def test_session_scope_closes_owned_session(self):
+        """Test that a temporary session is closed on exit."""
+        async with session_scope() as scoped:
+            assert isinstance(scoped, aiohttp.ClientSession)
+        assert scoped.closed
+
+
+class TestTarExecutor:
+    """Test the dedicated tar I/O thread pool."""
+
+    @pytest.mark.asyncio
+    async def test_run_tar_io_uses_dedicated_threads(self):
+        """Test blocking calls run in the tar I/O pool."""
+        import threading
+
+        thread_name = await run_tar_io(lambda: threading.current_thread().name)
+        assert thread_name.startswith("registry-tar-io")
+
+
+class TestBlobStreaming:
+    """Test streaming blobs out of tar files."""
+
+    LAYER_CONTENT = b"dummy layer data"
+    LAYER_DIGEST = f"sha256:{hashlib.sha256(LAYER_CONTENT).hexdigest()}"
+
+    def test_locate_blob_in_tar(self, test_tar_file):
+        """Test locating blob data offset and size."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        assert size == len(self.LAYER_CONTENT)
+        with open(test_tar_file, "rb") as f:
+            f.seek(offset)
+            assert f.read(size) == self.LAYER_CONTENT
+
+    def test_locate_blob_in_tar_missing(self, test_tar_file):
+        """Test locating a blob that is not in the tar."""
+        with pytest.raises(RegistryError, match="Blob not found"):
+            locate_blob_in_tar(test_tar_file, "sha256:" + "0" * 64)
+
+    def test_tar_member_index_is_cached(self, test_tar_file):
+        """Test the member index is reused until the tar file changes."""
+        members = get_tar_members(test_tar_file)
+        assert get_tar_members(test_tar_file) is members
+        assert "manifest.json" in members
+
+        stat = os.stat(test_tar_file)
+        os.utime(test_tar_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert get_tar_members(test_tar_file) is not members
+
+    def test_read_tar_member(self, test_tar_file, opened_tar):
+        """Test member data is read through the cached index."""
+        expected = opened_tar.extractfile("manifest.json").read()
+        assert read_tar_member(test_tar_file, "manifest.json") == expected
+        assert read_tar_member(test_tar_file, "missing.json") is None
+
+    def test_read_tar_member_compressed(self, compressed_tar_file, opened_tar):
+        """Test members of compressed archives are read from the decompressed data."""
+        index = get_tar_index(compressed_tar_file)
+        assert index.compression == compressed_tar_file.rpartition(".")[2]
+
+        for name in ("manifest.json", "repositories"):
+            expected = opened_tar.extractfile(name).read()
+            assert read_tar_member(compressed_tar_file, name) == expected
+
+    def test_truncated_compressed_tar(self, compressed_tar_file, tmp_path):
+        """Test a truncated compressed archive fails as a tar read error."""
+        data = Path(compressed_tar_file).read_bytes()
+        tar_path = tmp_path / Path(compressed_tar_file).name
+        tar_path.write_bytes(data[: len(data) // 2])
+
+        with pytest.raises(tarfile.ReadError):
+            get_tar_members(str(tar_path))
+
+    def test_scan_tar_members_matches_tarfile(self, test_tar_file, opened_tar):
+        """Test the direct header scan agrees with tarfile."""
+        members = scan_tar_members(test_tar_file)
+        assert members is not None
+        expected = {member.name: member for member in opened_tar.getmembers()}
+        assert members.keys() == expected.keys()
+        for name, member in members.items():
+            assert member.offset_data == expected[name].offset_data
+            assert member.size == expected[name].size
+            assert member.type == expected[name].type
+
+    def test_scan_tar_members_gives_up_on_pax_headers(self, tmp_path):
+        """Test archives with extension headers are left to tarfile."""
+        tar_path = tmp_path / "pax.tar"
+        with tarfile.open(tar_path, "w", format=tarfile.PAX_FORMAT) as tar:
+            info = tarfile.TarInfo("x" * 150)
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"data"))
+
+        assert scan_tar_members(str(tar_path)) is None
+        assert get_tar_members(str(tar_path))["x" * 150].size == 4
+
+    @pytest.fixture
+    def linked_tar_file(self, tmp_path):
+        """Create a tar whose blob is a hard link and whose layer is a symlink."""
+        blob_name = f"blobs/sha256/{self.LAYER_DIGEST[7:]}"
+        tar_path = tmp_path / "linked.tar"
+        with tarfile.open(tar_path, "w", format=tarfile.USTAR_FORMAT) as tar:
+            info = tarfile.TarInfo("abc123/layer.tar")
+            info.size = len(self.LAYER_CONTENT)
+            tar.addfile(info, io.BytesIO(self.LAYER_CONTENT))
+            for name, link_type, linkname in (
+                (blob_name, tarfile.LNKTYPE, "abc123/layer.tar"),
+                ("def456/layer.tar", tarfile.SYMTYPE, f"../{blob_name}"),
+                ("dangling/layer.tar", tarfile.SYMTYPE, "../missing.tar"),
+            ):
+                link = tarfile.TarInfo(name)
+                link.type = link_type
+                link.linkname = linkname
+                tar.addfile(link)
+        return str(tar_path)
+
+    @pytest.mark.asyncio
+    async def test_hardlinked_blob(self, linked_tar_file):
+        """Test a blob stored as a hard link is read from its target."""
+        members = scan_tar_members(linked_tar_file)
+        assert members is not None
+        with tarfile.open(linked_tar_file) as tar:
+            for name, member in members.items():
+                assert member.linkname == tar.getmember(name).linkname
+
+        offset, size = locate_blob_in_tar(linked_tar_file, self.LAYER_DIGEST)
+        assert size == len(self.LAYER_CONTENT)
+        blob = await extract_blob_from_tar(linked_tar_file, self.LAYER_DIGEST)
+        assert blob == self.LAYER_CONTENT
+
+    def test_read_tar_member_follows_links(self, linked_tar_file):
+        """Test links are read like TarFile.extractfile reads them."""
+        with tarfile.open(linked_tar_file) as tar:
+            expected = tar.extractfile("def456/layer.tar").read()
+        assert expected == self.LAYER_CONTENT
+        assert read_tar_member(linked_tar_file, "def456/layer.tar") == expected
+        assert read_tar_member(linked_tar_file, "dangling/layer.tar") is None
+
+    def test_locate_dangling_linked_blob(self, tmp_path):
+        """Test a blob linking to a missing member is rejected."""
+        tar_path = tmp_path / "dangling.tar"
+        with tarfile.open(tar_path, "w", format=tarfile.USTAR_FORMAT) as tar:
+            link = tarfile.TarInfo(f"blobs/sha256/{self.LAYER_DIGEST[7:]}")
+            link.type = tarfile.LNKTYPE
+            link.linkname = "missing.tar"
+            tar.addfile(link)
+
+        with pytest.raises(RegistryError, match="not a regular file"):
+            locate_blob_in_tar(str(tar_path), self.LAYER_DIGEST)
+
+    @pytest.mark.asyncio
+    async def test_stream_blob_from_tar(self, test_tar_file):
+        """Test streaming blob data in chunks."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        chunks = [
+            chunk
+            async for chunk in stream_blob_from_tar(
+                test_tar_file, self.LAYER_DIGEST, offset, size, chunk_size=5
+            )
+        ]
+        assert len(chunks) == 4
+        assert b"".join(chunks) == self.LAYER_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_extract_blob_from_tar(self, test_tar_file):
+        """Test extracting a whole blob verifies it on the way."""
+        blob = await extract_blob_from_tar(test_tar_file, self.LAYER_DIGEST)
+        assert blob == self.LAYER_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_stream_blob_from_compressed_tar(self, compressed_tar_file):
+        """Test blobs of compressed archives come from the decompressed data."""
+        offset, size = locate_blob_in_tar(compressed_tar_file, self.LAYER_DIGEST)
+        chunks = [
+            chunk
+            async for chunk in stream_blob_from_tar(
+                compressed_tar_file,
+                self.LAYER_DIGEST,
+                offset,
+                size,
+                chunk_size=5,
+                verify=False,
+            )
+        ]
+        assert b"".join(chunks) == self.LAYER_CONTENT
+        blob = await extract_blob_from_tar(compressed_tar_file, self.LAYER_DIGEST)
+        assert blob == self.LAYER_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_stream_blob_from_tar_closed_early(self, test_tar_file):
+        """Test closing the stream while a read-ahead is pending."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        stream = stream_blob_from_tar(
+            test_tar_file, self.LAYER_DIGEST, offset, size, chunk_size=5
+        )
+        assert await anext(stream) == self.LAYER_CONTENT[:5]
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_blob_from_tar_digest_mismatch(self, test_tar_file):
+        """Test streaming fails before the last chunk on digest mismatch."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        wrong_digest = "sha256:" + "0" * 64
+        with pytest.raises(RegistryError, match="digest mismatch"):
+            async for _ in stream_blob_from_tar(
+                test_tar_file, wrong_digest, offset, size
+            ):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_stream_blob_from_tar_without_verification(self, test_tar_file):
+        """Test streaming trusts the digest when verification is off."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        wrong_digest = "sha256:" + "0" * 64
+        chunks = [
+            chunk
+            async for chunk in stream_blob_from_tar(
+                test_tar_file, wrong_digest, offset, size, verify=False
+            )
+        ]
+        assert b"".join(chunks) == self.LAYER_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_iter_blob_chunks(self, test_tar_file):
+        """Test in-memory and streamed blob data yield the same chunks."""
+        offset, size = locate_blob_in_tar(test_tar_file, self.LAYER_DIGEST)
+        stream = stream_blob_from_tar(
+            test_tar_file, self.LAYER_DIGEST, offset, size, chunk_size=5
+        )
+        streamed = [chunk async for chunk in iter_blob_chunks(stream)]
+        in_memory = [
+            chunk async for chunk in iter_blob_chunks(self.LAYER_CONTENT, chunk_size=5)
+        ]
+        assert streamed == in_memory
+
+    @pytest.mark.asyncio
+    async def test_report_progress_is_coarse(self):
+        """Test progress is reported a bounded number of times."""
+
+        async def one_byte_chunks():
+            for _ in range(100):
+                yield b"x"
+
+        calls = []
+        chunks = [
+            chunk
+            async for chunk in report_progress(
+                one_byte_chunks(), self.LAYER_DIGEST, 100, lambda *a: calls.append(a)
+            )
+        ]
+        assert len(chunks) == 100
+        assert len(calls) == 20
+        assert calls[-1] == (self.LAYER_DIGEST, 100, 100)
+
+    def test_resolve_location(self):
+        """Test Location headers resolve against the registry origin."""
+        config = RegistryConfig(url="http://r:5000/mirror")
+        absolute = "http://other/v2/repo/blobs/uploads/u?_state=x"
+        assert resolve_location(config, absolute) == absolute
+        assert (
+            resolve_location(config, "/v2/repo/blobs/uploads/u?_state=x")
+            == "http://r:5000/v2/repo/blobs/uploads/u?_state=x"
+        )
+        assert (
+            resolve_location(config, "repo/blobs/uploads/u")
+            == "http://r:5000/mirror/repo/blobs/uploads/u"
+        )
+
+    def test_build_digest_url(self):
+        """Test the digest is appended with the right separator."""
+        digest = self.LAYER_DIGEST
+        assert build_digest_url("http://r/u", digest) == f"http://r/u?digest={digest}"
+        assert (
+            build_digest_url("http://r/u?_state=x", digest)
+            == f"http://r/u?_state=x&digest={digest}"
+        )
+
+
+class TestBlobCache:
+    """Test caching of blobs known to exist in a repository."""
+
+    DIGEST = "sha256:" + "a" * 64
+
+    @pytest_asyncio.fixture
+    async def session(self):
+        async with aiohttp.ClientSession() as session:
+            yield session
+
+    @pytest.mark.asyncio
+    async def test_check_blob_exists_uses_cache(self, session):
+        """Test a known blob is reported without contacting the registry."""
+        config = RegistryConfig(url="http://127.0.0.1:1", timeout=1)
+        remember_blob(config, "repo", self.DIGEST, session)
+        assert await check_blob_exists(config, "repo", self.DIGEST, session) is True
+        assert await check_blob_exists(config, "other", self.DIGEST, session) is False
+
+    @pytest.mark.asyncio
+    async def test_cache_is_per_session(self, session):
+        """Test another session asks the registry instead of trusting the cache."""
+        config = RegistryConfig(url="http://127.0.0.1:1", timeout=1)
+        remember_blob(config, "repo", self.DIGEST, session)
+        async with aiohttp.ClientSession() as other_session:
+            assert not is_blob_known(config, "repo", self.DIGEST, other_session)
+            assert not await check_blob_exists(
+                config, "repo", self.DIGEST, other_session
+            )
+        assert not await check_blob_exists(config, "repo", self.DIGEST)
+
+    @pytest.mark.asyncio
+    async def test_cache_expires(self, session, monkeypatch):
+        """Test cached blobs are trusted only within the TTL."""
+        config = RegistryConfig(url="http://localhost:5000")
+        remember_blob(config, "repo", self.DIGEST, session)
+        monkeypatch.setattr(blobs, "BLOB_CACHE_TTL", 0.0)
+        assert not is_blob_known(config, "repo", self.DIGEST, session)
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, session, monkeypatch):
+        """Test the oldest entries are evicted beyond the maximum size."""
+        config = RegistryConfig(url="http://localhost:5000")
+        monkeypatch.setattr(blobs, "BLOB_CACHE_MAX_SIZE", 2)
+        for repository in ("a", "b", "c"):
+            remember_blob(config, repository, self.DIGEST, session)
+        assert not is_blob_known(config, "a", self.DIGEST, session)
+        assert is_blob_known(config, "c", self.DIGEST, session)
+
+    @pytest.mark.asyncio
+    async def test_forget_blobs(self, session):
+        """Test forgetting blobs of a single repository."""
+        config = RegistryConfig(url="http://localhost:5000")
+        remember_blob(config, "repo", self.DIGEST, session)
+        remember_blob(config, "other", self.DIGEST, session)
+        forget_blobs(config, "repo", session)
+        assert not is_blob_known(config, "repo", self.DIGEST, session)
+        assert is_blob_known(config, "other", self.DIGEST, session)
+
+    @pytest.mark.asyncio
+    async def test_clear_blob_cache(self, session):
+        """Test clearing the blobs recorded by a session."""
+        config = RegistryConfig(url="http://localhost:5000")
+        remember_blob(config, "repo", self.DIGEST, session)
+        clear_blob_cache(session)
+        assert not is_blob_known(config, "repo", self.DIGEST, session)
 
 
 class TestErrorConditions:
@@ -409,30 +1025,7 @@ class TestManifestInfo:
 
     def test_manifest_info_creation(self):
         """Test ManifestInfo creation."""
-        config = BlobInfo(
-            digest="sha256:config123",
-            size=1024,
-            media_type="application/vnd.docker.container.image.v1+json",
-        )
-        layers = [
-            BlobInfo(
-                digest="sha256:layer123",
-                size=2048,
-                media_type="application/vnd.docker.image.rootfs.diff.tar.gzip",
-            )
-        ]
-
-        manifest_info = ManifestInfo(
-            config=config,
-            layers=layers,
-            schema_version=2,
-            media_type="application/vnd.docker.distribution.manifest.v2+json",
-        )
-
-        assert manifest_info.config == config
-        assert manifest_info.layers == layers
-        assert manifest_info.schema_version == 2
-        assert (
-            manifest_info.media_type
-            == "application/vnd.docker.distribution.manifest.v2+json"
-        )
+        assert MANIFEST_INFO.config == CONFIG_BLOB
+        assert MANIFEST_INFO.layers == LAYER_BLOBS[:1]
+        assert MANIFEST_INFO.schema_version == 2
+        assert MANIFEST_INFO.media_type == MANIFEST_MEDIA_TYPE
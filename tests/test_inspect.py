@@ -1,8 +1,7 @@
 """Tests for Docker tar file inspection utilities."""
 
-import json
 import tarfile
-from datetime import datetime
+from datetime import UTC, datetime
 
 import pytest
 
@@ -24,38 +23,44 @@ from registry_api_v2_client.utils.inspect import (
     validate_config_data,
     validate_manifest_data,
 )
+from tests.helpers import write_tar
 
 
-def test_inspect_synthetic_docker_tar(tmp_path):
-    """Test inspection of a synthetic Docker tar file."""
-    # Create synthetic tar file structure
-    tar_dir = tmp_path / "synthetic_image"
-    tar_dir.mkdir()
+def write_image_tar(tar_path, config_name, config, layers=None, **manifest):
+    """Write a Docker tar file with one image.
+
+    Args:
+        tar_path: Path of the tar file to create
+        config_name: Config blob name under ``blobs/sha256``
+        config: Config content, either a JSON-serializable object or raw bytes
+        layers: Dictionary of layer blob name to content bytes
+        **manifest: Extra manifest entry fields such as ``RepoTags``
 
-    # Create realistic manifest.json
+    Returns:
+        Path of the created tar file
+    """
+    layers = layers or {}
     manifest_data = [
         {
-            "Config": "blobs/sha256/config_abc123",
-            "RepoTags": ["test/myapp:v1.0", "test/myapp:latest"],
-            "Layers": ["blobs/sha256/layer_def456", "blobs/sha256/layer_ghi789"],
-            "LayerSources": {
-                "sha256:layer_def456": {
-                    "mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip",
-                    "size": 5242880,
-                    "digest": "sha256:layer_def456",
-                },
-                "sha256:layer_ghi789": {
-                    "mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip",
-                    "size": 1048576,
-                    "digest": "sha256:layer_ghi789",
-                },
-            },
+            "Config": f"blobs/sha256/{config_name}",
+            **manifest,
+            "Layers": [f"blobs/sha256/{name}" for name in layers],
         }
     ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest_data))
+    members = {
+        "manifest.json": manifest_data,
+        f"blobs/sha256/{config_name}": config,
+    }
+    members.update(
+        (f"blobs/sha256/{name}", content) for name, content in layers.items()
+    )
+    return write_tar(tar_path, members)
+
 
-    # Create realistic config file
-    config_data = {
+@pytest.fixture(scope="session")
+def synthetic_tar_path(tmp_path_factory):
+    """Create a realistic Docker tar file with two layers."""
+    config = {
         "architecture": "amd64",
         "os": "linux",
         "created": "2025-01-15T10:30:45.123456789Z",
@@ -81,107 +86,133 @@ def test_inspect_synthetic_docker_tar(tmp_path):
             "diff_ids": ["sha256:diff_layer_1_abc", "sha256:diff_layer_2_def"],
         },
     }
+    return write_image_tar(
+        tmp_path_factory.mktemp("synthetic") / "synthetic_image.tar",
+        "config_abc123",
+        config,
+        # Sizes come from LayerSources; the blobs only need to exist
+        layers={
+            "layer_def456": b"fake layer data 1",
+            "layer_ghi789": b"fake layer data 2",
+        },
+        RepoTags=["test/myapp:v1.0", "test/myapp:latest"],
+        LayerSources={
+            "sha256:layer_def456": {
+                "mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip",
+                "size": 5242880,
+                "digest": "sha256:layer_def456",
+            },
+            "sha256:layer_ghi789": {
+                "mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip",
+                "size": 1048576,
+                "digest": "sha256:layer_ghi789",
+            },
+        },
+    )
 
-    # Create blobs directory structure
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "config_abc123").write_text(json.dumps(config_data))
-
-    # Create dummy layer files
-    (blobs_dir / "layer_def456").write_text("fake layer data 1" * 1000)
-    (blobs_dir / "layer_ghi789").write_text("fake layer data 2" * 500)
-
-    # Create tar file
-    tar_path = tmp_path / "synthetic_image.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "config_abc123", arcname="blobs/sha256/config_abc123")
-        tar.add(blobs_dir / "layer_def456", arcname="blobs/sha256/layer_def456")
-        tar.add(blobs_dir / "layer_ghi789", arcname="blobs/sha256/layer_ghi789")
-
-    # Inspect the tar file
-    result = inspect_docker_tar(tar_path)
-
-    # Validate basic metadata
-    assert isinstance(result, ImageInspect)
-    assert result.id == "sha256:config_abc123"
-    assert result.repo_tags == ["test/myapp:v1.0", "test/myapp:latest"]
-    assert result.architecture == "amd64"
-    assert result.os == "linux"
-    assert result.rootfs_type == "layers"
-
-    # Validate config
-    assert isinstance(result.config, ImageConfig)
-    assert result.config.architecture == "amd64"
-    assert result.config.os == "linux"
-    assert result.config.cmd == ["/bin/sh", "-c", "echo hello"]
-    assert result.config.entrypoint == ["/entrypoint.sh"]
-    assert result.config.user == "1001"
-    assert result.config.working_dir == "/app"
-    assert "APP_VERSION=1.0.0" in result.config.env
-    assert "8080/tcp" in result.config.exposed_ports
-    assert result.config.labels["maintainer"] == "test@example.com"
-
-    # Validate layers
-    assert len(result.layers) == 2
-    layer1, layer2 = result.layers
-
-    assert isinstance(layer1, LayerInfo)
-    assert layer1.digest == "sha256:layer_def456"
-    assert layer1.size == 5242880  # From LayerSources
-    assert layer1.media_type == "application/vnd.docker.image.rootfs.diff.tar.gzip"
-
-    assert isinstance(layer2, LayerInfo)
-    assert layer2.digest == "sha256:layer_ghi789"
-    assert layer2.size == 1048576  # From LayerSources
-
-    # Validate size calculations
-    assert result.size == 5242880 + 1048576
-    assert result.virtual_size == result.size
-
-    # Validate diff_ids
-    assert result.rootfs_layers == [
-        "sha256:diff_layer_1_abc",
-        "sha256:diff_layer_2_def",
-    ]
 
+@pytest.fixture(scope="session")
+def minimal_tar_path(tmp_path_factory):
+    """Create a Docker tar file with an empty runtime config."""
+    config = {
+        "architecture": "arm64",
+        "os": "linux",
+        "created": "2025-01-01T00:00:00Z",
+        "config": {},
+        "rootfs": {"type": "layers", "diff_ids": []},
+    }
+    return write_image_tar(
+        tmp_path_factory.mktemp("minimal") / "minimal.tar",
+        "minimal_config",
+        config,
+        layers={"minimal_layer": b"minimal layer"},
+        RepoTags=["minimal:latest"],
+    )
 
-def test_inspect_minimal_tar(tmp_path):
-    """Test inspection of minimal Docker tar file."""
-    tar_dir = tmp_path / "minimal_image"
-    tar_dir.mkdir()
 
-    # Minimal manifest
-    manifest = [
-        {
-            "Config": "blobs/sha256/minimal_config",
-            "RepoTags": ["minimal:latest"],
-            "Layers": ["blobs/sha256/minimal_layer"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
+@pytest.fixture(scope="session")
+def malformed_tar_path(tmp_path_factory):
+    """Create a Docker tar file whose config is not valid JSON."""
+    return write_image_tar(
+        tmp_path_factory.mktemp("malformed") / "malformed.tar",
+        "bad_config",
+        b"invalid json content",
+        RepoTags=["malformed:latest"],
+    )
+
 
-    # Minimal config
+@pytest.fixture(scope="session")
+def datetime_tar_path(tmp_path_factory):
+    """Create a Docker tar file with an unparseable creation time."""
     config = {
-        "architecture": "arm64",
+        "architecture": "amd64",
         "os": "linux",
-        "created": "2025-01-01T00:00:00Z",
+        "created": "invalid-datetime",
         "config": {},
         "rootfs": {"type": "layers", "diff_ids": []},
     }
+    return write_image_tar(
+        tmp_path_factory.mktemp("datetime") / "datetime_test.tar",
+        "datetime_config",
+        config,
+        RepoTags=["datetime:test"],
+    )
 
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "minimal_config").write_text(json.dumps(config))
-    (blobs_dir / "minimal_layer").write_text("minimal layer")
 
-    tar_path = tmp_path / "minimal.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "minimal_config", arcname="blobs/sha256/minimal_config")
-        tar.add(blobs_dir / "minimal_layer", arcname="blobs/sha256/minimal_layer")
+def test_inspect_synthetic_docker_tar(synthetic_tar_path):
+    """Test inspection of a synthetic Docker tar file."""
+    result = inspect_docker_tar(synthetic_tar_path)
+
+    created = datetime(2025, 1, 15, 10, 30, 45, 123456, tzinfo=UTC)
+    diff_ids = ["sha256:diff_layer_1_abc", "sha256:diff_layer_2_def"]
+    gzip_layer = "application/vnd.docker.image.rootfs.diff.tar.gzip"
+    expected = ImageInspect(
+        id="sha256:config_abc123",
+        repo_tags=["test/myapp:v1.0", "test/myapp:latest"],
+        created=created,
+        config=ImageConfig(
+            architecture="amd64",
+            os="linux",
+            created=created,
+            cmd=["/bin/sh", "-c", "echo hello"],
+            entrypoint=["/entrypoint.sh"],
+            env=[
+                "PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin",
+                "APP_VERSION=1.0.0",
+                "NODE_ENV=production",
+            ],
+            user="1001",
+            working_dir="/app",
+            exposed_ports={"8080/tcp": {}, "9090/tcp": {}},
+            labels={
+                "maintainer": "test@example.com",
+                "version": "1.0.0",
+                "org.opencontainers.image.source": "https://github.com/test/myapp",
+            },
+            diff_ids=diff_ids,
+        ),
+        # Layer sizes come from LayerSources, not the blobs in the tar
+        layers=[
+            LayerInfo(
+                digest="sha256:layer_def456", size=5242880, media_type=gzip_layer
+            ),
+            LayerInfo(
+                digest="sha256:layer_ghi789", size=1048576, media_type=gzip_layer
+            ),
+        ],
+        size=5242880 + 1048576,
+        virtual_size=5242880 + 1048576,
+        architecture="amd64",
+        os="linux",
+        rootfs_type="layers",
+        rootfs_layers=diff_ids,
+    )
+    assert result == expected
 
-    result = inspect_docker_tar(tar_path)
+
+def test_inspect_minimal_tar(minimal_tar_path):
+    """Test inspection of minimal Docker tar file."""
+    result = inspect_docker_tar(minimal_tar_path)
 
     assert result.id == "sha256:minimal_config"
     assert result.repo_tags == ["minimal:latest"]
@@ -204,9 +235,6 @@ def test_inspect_invalid_tar(tmp_path):
 
 def test_inspect_missing_config(tmp_path):
     """Test inspection fails when config file is missing."""
-    tar_dir = tmp_path / "broken_image"
-    tar_dir.mkdir()
-
     # Manifest pointing to non-existent config (but validator will catch this first)
     manifest = [
         {
@@ -215,78 +243,23 @@ def test_inspect_missing_config(tmp_path):
             "Layers": [],
         }
     ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    tar_path = tmp_path / "broken.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
+    tar_path = write_tar(tmp_path / "broken.tar", {"manifest.json": manifest})
 
     # Since validator runs first, it will fail with ValidationError
     with pytest.raises(ValidationError, match="Invalid Docker tar file"):
         inspect_docker_tar(tar_path)
 
 
-def test_inspect_malformed_config(tmp_path):
+def test_inspect_malformed_config(malformed_tar_path):
     """Test inspection fails with malformed config JSON."""
-    tar_dir = tmp_path / "malformed_image"
-    tar_dir.mkdir()
-
-    manifest = [
-        {
-            "Config": "blobs/sha256/bad_config",
-            "RepoTags": ["malformed:latest"],
-            "Layers": [],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "bad_config").write_text("invalid json content")
-
-    tar_path = tmp_path / "malformed.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "bad_config", arcname="blobs/sha256/bad_config")
-
     # The inspect function will detect the malformed config and fail
     with pytest.raises(TarReadError, match="Cannot read config file"):
-        inspect_docker_tar(tar_path)
+        inspect_docker_tar(malformed_tar_path)
 
 
-def test_inspect_datetime_parsing(tmp_path):
+def test_inspect_datetime_parsing(datetime_tar_path):
     """Test various datetime formats are parsed correctly."""
-    tar_dir = tmp_path / "datetime_test"
-    tar_dir.mkdir()
-
-    manifest = [
-        {
-            "Config": "blobs/sha256/datetime_config",
-            "RepoTags": ["datetime:test"],
-            "Layers": [],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    # Test with malformed datetime (should fallback to current time)
-    config = {
-        "architecture": "amd64",
-        "os": "linux",
-        "created": "invalid-datetime",
-        "config": {},
-        "rootfs": {"type": "layers", "diff_ids": []},
-    }
-
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "datetime_config").write_text(json.dumps(config))
-
-    tar_path = tmp_path / "datetime_test.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "datetime_config", arcname="blobs/sha256/datetime_config")
-
-    result = inspect_docker_tar(tar_path)
+    result = inspect_docker_tar(datetime_tar_path)
 
     # Should not raise error and created should be a valid datetime
     assert isinstance(result.created, datetime)
@@ -296,54 +269,66 @@ def test_inspect_datetime_parsing(tmp_path):
 # Individual function tests
 
 
-def test_validate_manifest_data():
-    """Test manifest data validation."""
-    valid_manifest = [{"Config": "test", "Layers": []}]
-    invalid_manifest = {"invalid": "structure"}
-    none_manifest = None
-
-    assert validate_manifest_data(valid_manifest) is True
-    assert validate_manifest_data(invalid_manifest) is False
-    assert validate_manifest_data(none_manifest) is False
-
-
-def test_validate_config_data():
-    """Test config data validation."""
-    valid_config = {"architecture": "amd64", "os": "linux"}
-    invalid_config = ["invalid", "structure"]
-    none_config = None
-
-    assert validate_config_data(valid_config) is True
-    assert validate_config_data(invalid_config) is False
-    assert validate_config_data(none_config) is False
-
-
-def test_extract_digest_from_path():
-    """Test digest extraction from layer path."""
-    layer_path = "blobs/sha256/abc123def456"
-    expected_digest = "sha256:abc123def456"
-
-    assert extract_digest_from_path(layer_path) == expected_digest
-
-
-def test_get_layer_source_key():
-    """Test layer source key extraction."""
-    layer_digest = "sha256:abc123def456"
-    expected_key = "abc123def456"
-
-    assert get_layer_source_key(layer_digest) == expected_key
-
-
-def test_get_layer_media_type():
-    """Test layer media type extraction with default."""
-    layer_source_with_type = {"mediaType": "application/custom.type"}
-    layer_source_without_type = {}
-
-    assert get_layer_media_type(layer_source_with_type) == "application/custom.type"
-    assert (
-        get_layer_media_type(layer_source_without_type)
-        == "application/vnd.docker.image.rootfs.diff.tar"
-    )
+# (helper, argument, expected result)
+INSPECT_HELPER_CASES = [
+    (validate_manifest_data, [{"Config": "test", "Layers": []}], True),
+    (validate_manifest_data, {"invalid": "structure"}, False),
+    (validate_manifest_data, None, False),
+    (validate_config_data, {"architecture": "amd64", "os": "linux"}, True),
+    (validate_config_data, ["invalid", "structure"], False),
+    (validate_config_data, None, False),
+    (extract_digest_from_path, "blobs/sha256/abc123def456", "sha256:abc123def456"),
+    (extract_config_digest, "blobs/sha256/config_abc123", "sha256:config_abc123"),
+    (get_layer_source_key, "sha256:abc123def456", "abc123def456"),
+    (
+        get_layer_media_type,
+        {"mediaType": "application/custom.type"},
+        "application/custom.type",
+    ),
+    (get_layer_media_type, {}, "application/vnd.docker.image.rootfs.diff.tar"),
+    (
+        get_runtime_config,
+        {"config": {"Cmd": ["/bin/sh"], "Env": ["PATH=/usr/bin"]}},
+        {"Cmd": ["/bin/sh"], "Env": ["PATH=/usr/bin"]},
+    ),
+    (get_runtime_config, {}, {}),
+    (
+        get_environment_variables,
+        {"Env": ["PATH=/usr/bin", "HOME=/root"]},
+        ["PATH=/usr/bin", "HOME=/root"],
+    ),
+    (get_environment_variables, {}, []),
+    (
+        get_exposed_ports,
+        {"ExposedPorts": {"8080/tcp": {}, "9090/tcp": {}}},
+        {"8080/tcp": {}, "9090/tcp": {}},
+    ),
+    (get_exposed_ports, {}, {}),
+    (
+        get_labels,
+        {"Labels": {"version": "1.0", "maintainer": "test@example.com"}},
+        {"version": "1.0", "maintainer": "test@example.com"},
+    ),
+    (get_labels, {}, {}),
+    (get_labels, {"Labels": None}, {}),
+    (
+        get_diff_ids,
+        {"rootfs": {"diff_ids": ["sha256:abc123", "sha256:def456"]}},
+        ["sha256:abc123", "sha256:def456"],
+    ),
+    (get_diff_ids, {}, []),
+    (get_diff_ids, {"rootfs": {}}, []),
+]
+
+
+@pytest.mark.parametrize(
+    ("helper", "argument", "expected"),
+    INSPECT_HELPER_CASES,
+    ids=[helper.__name__ for helper, _, _ in INSPECT_HELPER_CASES],
+)
+def test_inspect_helpers(helper, argument, expected):
+    """Test pure inspection helpers on well-formed and missing input."""
+    assert helper(argument) == expected
 
 
 def test_parse_created_timestamp():
@@ -358,95 +343,26 @@ def test_parse_created_timestamp():
     assert isinstance(result_invalid, datetime)  # Should fallback to datetime.now()
 
 
-def test_get_runtime_config():
-    """Test runtime config extraction."""
-    config_data = {"config": {"Cmd": ["/bin/sh"], "Env": ["PATH=/usr/bin"]}}
-    config_data_no_runtime = {}
-
-    assert get_runtime_config(config_data) == {
-        "Cmd": ["/bin/sh"],
-        "Env": ["PATH=/usr/bin"],
-    }
-    assert get_runtime_config(config_data_no_runtime) == {}
-
-
-def test_get_environment_variables():
-    """Test environment variables extraction."""
-    runtime_config = {"Env": ["PATH=/usr/bin", "HOME=/root"]}
-    runtime_config_no_env = {}
-
-    assert get_environment_variables(runtime_config) == ["PATH=/usr/bin", "HOME=/root"]
-    assert get_environment_variables(runtime_config_no_env) == []
-
-
-def test_get_exposed_ports():
-    """Test exposed ports extraction."""
-    runtime_config = {"ExposedPorts": {"8080/tcp": {}, "9090/tcp": {}}}
-    runtime_config_no_ports = {}
-
-    assert get_exposed_ports(runtime_config) == {"8080/tcp": {}, "9090/tcp": {}}
-    assert get_exposed_ports(runtime_config_no_ports) == {}
-
-
-def test_get_labels():
-    """Test labels extraction."""
-    runtime_config = {"Labels": {"version": "1.0", "maintainer": "test@example.com"}}
-    runtime_config_no_labels = {}
-    runtime_config_null_labels = {"Labels": None}
-
-    assert get_labels(runtime_config) == {
-        "version": "1.0",
-        "maintainer": "test@example.com",
-    }
-    assert get_labels(runtime_config_no_labels) == {}
-    assert get_labels(runtime_config_null_labels) == {}
-
-
-def test_get_diff_ids():
-    """Test diff_ids extraction."""
-    config_data = {"rootfs": {"diff_ids": ["sha256:abc123", "sha256:def456"]}}
-    config_data_no_rootfs = {}
-    config_data_no_diff_ids = {"rootfs": {}}
-
-    assert get_diff_ids(config_data) == ["sha256:abc123", "sha256:def456"]
-    assert get_diff_ids(config_data_no_rootfs) == []
-    assert get_diff_ids(config_data_no_diff_ids) == []
-
-
-def test_extract_config_digest():
-    """Test config digest extraction."""
-    config_path = "blobs/sha256/config_abc123"
-    expected_digest = "sha256:config_abc123"
-
-    assert extract_config_digest(config_path) == expected_digest
-
-
 def test_extract_json_file(tmp_path):
     """Test JSON file extraction from tar."""
-    tar_dir = tmp_path / "test_tar"
-    tar_dir.mkdir()
-
-    # Create JSON file
     json_data = {"test": "data", "array": [1, 2, 3]}
-    (tar_dir / "test.json").write_text(json.dumps(json_data))
-
-    # Create invalid JSON file
-    (tar_dir / "invalid.json").write_text("invalid json")
-
-    tar_path = tmp_path / "test.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "test.json", arcname="test.json")
-        tar.add(tar_dir / "invalid.json", arcname="invalid.json")
+    tar_path = write_tar(
+        tmp_path / "test.tar",
+        {
+            "test.json": json_data,
+            "invalid.json": b"invalid json",
+        },
+    )
 
     with tarfile.open(tar_path, "r") as tar:
-        # Test valid JSON
-        result = extract_json_file(tar, "test.json")
-        assert result == json_data
+        members = {member.name: member for member in tar.getmembers()}
+
+        # Test valid JSON, looked up by name or by member
+        assert extract_json_file(tar, "test.json") == json_data
+        assert extract_json_file(tar, members["test.json"]) == json_data
 
         # Test invalid JSON
-        result = extract_json_file(tar, "invalid.json")
-        assert result is None
+        assert extract_json_file(tar, members["invalid.json"]) is None
 
         # Test missing file
-        result = extract_json_file(tar, "missing.json")
-        assert result is None
+        assert extract_json_file(tar, "missing.json") is None
@@ -1,40 +1,55 @@
 """Isolated integration tests with test context."""
 
+import gzip
 import hashlib
-import json
-import tarfile
-import tempfile
-from pathlib import Path
 
 import pytest
 
 from registry_api_v2_client import (
+    check_registry_connectivity,
+    create_session,
     extract_original_tags,
     get_primary_tag,
+    iter_tags,
     list_repositories,
     list_tags,
+    push_docker_tar,
     push_docker_tar_with_all_original_tags,
     push_docker_tar_with_original_tags,
 )
+from registry_api_v2_client.core import json_codec
+from registry_api_v2_client.core.types import BlobInfo, RegistryConfig
+from registry_api_v2_client.exceptions import RegistryError
+from registry_api_v2_client.operations import blobs
+from registry_api_v2_client.operations.blobs import (
+    check_blob_exists,
+    clear_blob_cache,
+    iter_blob_chunks,
+    upload_blob_chunked,
+)
+from registry_api_v2_client.push import upload_all_blobs
+from registry_api_v2_client.tar.processor import process_tar_file
+from tests.helpers import write_tar
 
 pytestmark = pytest.mark.integration
 
 
-def create_test_tar_with_tags(repo_tags):
-    """Create a test tar file with specified tags."""
-    config_content = json.dumps(
-        {"architecture": "amd64", "os": "linux", "created": "2024-01-01T00:00:00Z"}
-    ).encode("utf-8")
-    layer_content = b"dummy layer data for testing"
+# Image blobs shared by every test archive; only the tags differ
+CONFIG_CONTENT = json_codec.dumps(
+    {"architecture": "amd64", "os": "linux", "created": "2024-01-01T00:00:00Z"}
+)
+LAYER_CONTENT = b"dummy layer data for testing"
+CONFIG_HASH = hashlib.sha256(CONFIG_CONTENT).hexdigest()
+LAYER_HASH = hashlib.sha256(LAYER_CONTENT).hexdigest()
 
-    config_hash = hashlib.sha256(config_content).hexdigest()
-    layer_hash = hashlib.sha256(layer_content).hexdigest()
 
+def create_test_tar_with_tags(tar_path, repo_tags):
+    """Create a test tar file with specified tags."""
     manifest = [
         {
-            "Config": f"blobs/sha256/{config_hash}",
+            "Config": f"blobs/sha256/{CONFIG_HASH}",
             "RepoTags": repo_tags,
-            "Layers": [f"blobs/sha256/{layer_hash}"],
+            "Layers": [f"blobs/sha256/{LAYER_HASH}"],
         }
     ]
 
@@ -45,161 +60,270 @@ def create_test_tar_with_tags(repo_tags):
             repo, tag = repo_tag.rsplit(":", 1)
         else:
             repo, tag = repo_tag, "latest"
+        repositories.setdefault(repo, {})[tag] = CONFIG_HASH
 
-        if repo not in repositories:
-            repositories[repo] = {}
-        repositories[repo][tag] = config_hash
-
-    tar_path = tempfile.mktemp(suffix=".tar")
-
-    with tarfile.open(tar_path, "w") as tar:
-        # Add manifest.json
-        manifest_info = tarfile.TarInfo("manifest.json")
-        manifest_content = json.dumps(manifest).encode("utf-8")
-        manifest_info.size = len(manifest_content)
-        tar.addfile(manifest_info, fileobj=tarfile.io.BytesIO(manifest_content))
-
-        # Add repositories
-        repos_info = tarfile.TarInfo("repositories")
-        repos_content = json.dumps(repositories).encode("utf-8")
-        repos_info.size = len(repos_content)
-        tar.addfile(repos_info, fileobj=tarfile.io.BytesIO(repos_content))
-
-        # Add config blob
-        config_info = tarfile.TarInfo(f"blobs/sha256/{config_hash}")
-        config_info.size = len(config_content)
-        tar.addfile(config_info, fileobj=tarfile.io.BytesIO(config_content))
-
-        # Add layer blob
-        layer_info = tarfile.TarInfo(f"blobs/sha256/{layer_hash}")
-        layer_info.size = len(layer_content)
-        tar.addfile(layer_info, fileobj=tarfile.io.BytesIO(layer_content))
-
-    return tar_path
+    write_tar(
+        tar_path,
+        {
+            "manifest.json": manifest,
+            "repositories": repositories,
+            f"blobs/sha256/{CONFIG_HASH}": CONFIG_CONTENT,
+            f"blobs/sha256/{LAYER_HASH}": LAYER_CONTENT,
+        },
+    )
+    return str(tar_path)
 
 
-@pytest.mark.asyncio
-async def test_isolated_single_tag_push(test_context):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_single_tag_push(test_context, tmp_path):
     """Test pushing single tag with isolation."""
     repo_name = test_context.repo_name("single")
-    tar_path = create_test_tar_with_tags([f"{repo_name}:v1.0"])
+    tar_path = create_test_tar_with_tags(tmp_path / "test.tar", [f"{repo_name}:v1.0"])
 
-    try:
-        # Test tag extraction
-        tags = extract_original_tags(tar_path)
-        assert f"{repo_name}:v1.0" in tags
+    # Test tag extraction
+    tags = extract_original_tags(tar_path)
+    assert f"{repo_name}:v1.0" in tags
 
-        primary = get_primary_tag(tar_path)
-        assert primary == (repo_name, "v1.0")
+    primary = get_primary_tag(tar_path)
+    assert primary == (repo_name, "v1.0")
 
-        # Push with original tags
-        digest = await push_docker_tar_with_original_tags(
-            tar_path, test_context.registry_url
-        )
-        assert digest.startswith("sha256:")
-
-        # Verify it was pushed
-        repos = await list_repositories(test_context.registry_url)
-        assert repo_name in repos
+    # Push with original tags
+    digest = await push_docker_tar_with_original_tags(
+        tar_path, test_context.registry_url
+    )
+    assert digest.startswith("sha256:")
 
-        # List tags
-        repo_tags = await list_tags(test_context.registry_url, repo_name)
-        assert "v1.0" in repo_tags
+    # Verify it was pushed
+    repos = await list_repositories(test_context.registry_url)
+    assert repo_name in repos
 
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    # List tags
+    repo_tags = await list_tags(test_context.registry_url, repo_name)
+    assert "v1.0" in repo_tags
 
 
-@pytest.mark.asyncio
-async def test_isolated_multiple_tags_push(test_context):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_multiple_tags_push(test_context, tmp_path):
     """Test pushing multiple tags with isolation."""
     repo_name = test_context.repo_name("multi")
     tar_path = create_test_tar_with_tags(
-        [f"{repo_name}:v1.0", f"{repo_name}:latest", f"{repo_name}:stable"]
+        tmp_path / "test.tar",
+        [f"{repo_name}:v1.0", f"{repo_name}:latest", f"{repo_name}:stable"],
     )
 
-    try:
-        # Test tag extraction
-        tags = extract_original_tags(tar_path)
-        assert len(tags) == 3
-        assert f"{repo_name}:v1.0" in tags
-        assert f"{repo_name}:latest" in tags
-        assert f"{repo_name}:stable" in tags
-
-        # Push all original tags
-        digests = await push_docker_tar_with_all_original_tags(
-            tar_path, test_context.registry_url
-        )
-        assert len(digests) == 3
-        assert all(d.startswith("sha256:") for d in digests)
-
-        # Verify all tags were pushed
-        repos = await list_repositories(test_context.registry_url)
-        assert repo_name in repos
-
-        repo_tags = await list_tags(test_context.registry_url, repo_name)
-        assert "v1.0" in repo_tags
-        assert "latest" in repo_tags
-        assert "stable" in repo_tags
+    # Test tag extraction
+    tags = extract_original_tags(tar_path)
+    assert len(tags) == 3
+    assert f"{repo_name}:v1.0" in tags
+    assert f"{repo_name}:latest" in tags
+    assert f"{repo_name}:stable" in tags
 
-        # All tags should have the same digest (same image)
-        assert len(set(digests)) == 1, "All tags should point to the same image"
+    # Push all original tags
+    digests = await push_docker_tar_with_all_original_tags(
+        tar_path, test_context.registry_url
+    )
+    assert len(digests) == 3
+    assert all(d.startswith("sha256:") for d in digests)
+
+    # Verify all tags were pushed
+    repos = await list_repositories(test_context.registry_url)
+    assert repo_name in repos
+
+    repo_tags = await list_tags(test_context.registry_url, repo_name)
+    assert "v1.0" in repo_tags
+    assert "latest" in repo_tags
+    assert "stable" in repo_tags
+
+    # Paging one tag at a time yields the same tags
+    paged_tags = [
+        tag
+        async for tag in iter_tags(test_context.registry_url, repo_name, page_size=1)
+    ]
+    assert sorted(paged_tags) == sorted(repo_tags)
 
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    # All tags should have the same digest (same image)
+    assert len(set(digests)) == 1, "All tags should point to the same image"
 
 
-@pytest.mark.asyncio
-async def test_isolated_concurrent_operations(test_context):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_concurrent_operations(test_context, tmp_path):
     """Test concurrent operations with isolation."""
     import asyncio
 
     # Create multiple test tars
     tar_paths = []
-    try:
-        for i in range(3):
-            repo_name = test_context.repo_name(f"concurrent-{i}")
-            tar_path = create_test_tar_with_tags([f"{repo_name}:v1.0"])
-            tar_paths.append((tar_path, repo_name))
-
-        # Push all concurrently
-        tasks = [
-            push_docker_tar_with_original_tags(tar_path, test_context.registry_url)
-            for tar_path, _ in tar_paths
-        ]
-
-        digests = await asyncio.gather(*tasks)
-        assert len(digests) == 3
-        assert all(d.startswith("sha256:") for d in digests)
-
-        # Verify all were pushed
-        repos = await list_repositories(test_context.registry_url)
-        for _, repo_name in tar_paths:
-            assert repo_name in repos
-
-    finally:
-        for tar_path, _ in tar_paths:
-            Path(tar_path).unlink(missing_ok=True)
-
-
-@pytest.mark.asyncio
-async def test_isolated_cleanup_verification(test_context):
+    for i in range(3):
+        repo_name = test_context.repo_name(f"concurrent-{i}")
+        tar_path = create_test_tar_with_tags(
+            tmp_path / f"test-{i}.tar", [f"{repo_name}:v1.0"]
+        )
+        tar_paths.append((tar_path, repo_name))
+
+    # Push all concurrently
+    tasks = [
+        push_docker_tar_with_original_tags(tar_path, test_context.registry_url)
+        for tar_path, _ in tar_paths
+    ]
+
+    digests = await asyncio.gather(*tasks)
+    assert len(digests) == 3
+    assert all(d.startswith("sha256:") for d in digests)
+
+    # Verify all were pushed
+    repos = await list_repositories(test_context.registry_url)
+    for _, repo_name in tar_paths:
+        assert repo_name in repos
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_cleanup_verification(test_context, tmp_path):
     """Test that cleanup works properly."""
     repo_name = test_context.repo_name("cleanup-test")
-    tar_path = create_test_tar_with_tags([f"{repo_name}:test"])
+    tar_path = create_test_tar_with_tags(tmp_path / "test.tar", [f"{repo_name}:test"])
 
-    try:
-        # Push image
-        digest = await push_docker_tar_with_original_tags(
-            tar_path, test_context.registry_url
+    # Push image
+    digest = await push_docker_tar_with_original_tags(
+        tar_path, test_context.registry_url
+    )
+    assert digest.startswith("sha256:")
+
+    # Verify it exists
+    repos = await list_repositories(test_context.registry_url)
+    assert repo_name in repos
+
+    # Note: Cleanup happens via test_context.__aexit__ once the module is done
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_connectivity_warmup(test_context):
+    """Test warming up a shared session's connection pool."""
+    async with await create_session() as session:
+        assert await check_registry_connectivity(
+            test_context.registry_url, session=session, warmup=3
         )
-        assert digest.startswith("sha256:")
+        repos = await list_repositories(test_context.registry_url, session=session)
+        assert isinstance(repos, list)
 
-        # Verify it exists
-        repos = await list_repositories(test_context.registry_url)
-        assert repo_name in repos
 
-        # Note: Cleanup will happen automatically via test_context.__aexit__
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_push_reports_progress(test_context, tmp_path):
+    """Test push_docker_tar reports every blob through progress_callback."""
+    repo_name = test_context.repo_name("progress")
+    tar_path = create_test_tar_with_tags(tmp_path / "test.tar", [f"{repo_name}:v1.0"])
 
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    progress: dict[str, tuple[int, int]] = {}
+
+    def on_progress(digest, uploaded, size):
+        progress[digest] = (uploaded, size)
+
+    await push_docker_tar(
+        tar_path, test_context.registry_url, progress_callback=on_progress
+    )
+    assert progress == {
+        f"sha256:{CONFIG_HASH}": (len(CONFIG_CONTENT), len(CONFIG_CONTENT)),
+        f"sha256:{LAYER_HASH}": (len(LAYER_CONTENT), len(LAYER_CONTENT)),
+    }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_push_truncated_tar_raises_registry_error(
+    test_context, tmp_path
+):
+    """Test a corrupt archive fails every push function with RegistryError."""
+    repo_name = test_context.repo_name("truncated")
+    tar_path = create_test_tar_with_tags(tmp_path / "test.tar", [f"{repo_name}:v1.0"])
+    with open(tar_path, "rb") as f:
+        compressed = gzip.compress(f.read())
+    truncated_path = tmp_path / "truncated.tar.gz"
+    truncated_path.write_bytes(compressed[: len(compressed) // 2])
+
+    for push in (push_docker_tar, push_docker_tar_with_all_original_tags):
+        with pytest.raises(RegistryError, match="Failed to process tar file"):
+            await push(str(truncated_path), test_context.registry_url)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_duplicate_blobs(test_context, tmp_path):
+    """Test repeated layers are uploaded once and reported in order."""
+    repo_name = test_context.repo_name("dedup")
+    tar_path = create_test_tar_with_tags(tmp_path / "test.tar", [f"{repo_name}:v1.0"])
+
+    manifest_info, _ = process_tar_file(tar_path)
+    config_blob, layer = manifest_info.config, manifest_info.layers[0]
+
+    digests = await upload_all_blobs(
+        RegistryConfig(url=test_context.registry_url),
+        repo_name,
+        tar_path,
+        [config_blob, layer, layer],
+    )
+    assert digests == [config_blob.digest, layer.digest, layer.digest]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_tags_across_repositories(test_context, tmp_path):
+    """Test tags in several repositories share blobs via cross-repo mount."""
+    first_repo = test_context.repo_name("mount-src")
+    second_repo = test_context.repo_name("mount-dst")
+    tar_path = create_test_tar_with_tags(
+        tmp_path / "test.tar", [f"{first_repo}:v1.0", f"{second_repo}:v1.0"]
+    )
+
+    digests = await push_docker_tar_with_all_original_tags(
+        tar_path, test_context.registry_url
+    )
+    assert len(digests) == 2
+    assert len(set(digests)) == 1
+
+    assert await list_tags(test_context.registry_url, first_repo) == ["v1.0"]
+    assert await list_tags(test_context.registry_url, second_repo) == ["v1.0"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_chunked_upload(test_context):
+    """Test chunked uploads send consecutive byte ranges."""
+    repo_name = test_context.repo_name("chunked")
+    config = RegistryConfig(url=test_context.registry_url)
+    blob_data = b"chunked upload data" * 1000
+    digest = f"sha256:{hashlib.sha256(blob_data).hexdigest()}"
+
+    async with await create_session() as session:
+        uploaded = await upload_blob_chunked(
+            session,
+            config,
+            repo_name,
+            iter_blob_chunks(blob_data, chunk_size=4096),
+            digest,
+        )
+        assert uploaded == digest
+
+        clear_blob_cache(session)
+        assert await check_blob_exists(config, repo_name, digest, session)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_isolated_large_blob_uses_chunked_upload(
+    test_context, tmp_path, monkeypatch
+):
+    """Test blobs above the monolithic limit go up as consecutive byte ranges."""
+    monkeypatch.setattr(blobs, "MONOLITHIC_UPLOAD_MAX_SIZE", 1024)
+    monkeypatch.setattr(blobs, "UPLOAD_CHUNK_SIZE", 4096)
+    repo_name = test_context.repo_name("large-blob")
+    config = RegistryConfig(url=test_context.registry_url)
+    layer = b"large layer data" * 1000
+    digest = f"sha256:{hashlib.sha256(layer).hexdigest()}"
+    tar_path = write_tar(tmp_path / "large.tar", {f"blobs/sha256/{digest[7:]}": layer})
+
+    patches = []
+    upload_chunk = blobs.upload_chunk
+
+    async def record_chunk(session, location, config, chunk, offset=None):
+        patches.append((offset, len(chunk)))
+        return await upload_chunk(session, location, config, chunk, offset)
+
+    monkeypatch.setattr(blobs, "upload_chunk", record_chunk)
+    blob_info = BlobInfo(digest=digest, size=len(layer), media_type="")
+    assert await blobs.upload_blob(config, repo_name, str(tar_path), blob_info)
+    assert patches == [(0, 4096), (4096, 4096), (8192, 4096), (12288, 3712)]
+
+    assert await check_blob_exists(config, repo_name, digest)
@@ -1,8 +1,6 @@
 """Tests for tag extraction from Docker tar files."""
 
-import json
-import tarfile
-import tempfile
+import gzip
 from pathlib import Path
 
 import pytest
@@ -15,12 +13,12 @@ from registry_api_v2_client.tar.tags import (
     get_primary_tag,
     parse_repository_tag,
 )
+from registry_api_v2_client.utils.inspect import inspect_docker_tar
+from tests.helpers import write_tar
 
 
-def create_test_tar_with_manifest(repo_tags):
+def create_test_tar_with_manifest(tmp_path, repo_tags):
     """Create test tar with manifest.json containing specified repo tags."""
-    tar_path = tempfile.mktemp(suffix=".tar")
-
     manifest = [
         {
             "Config": "blobs/sha256/config123",
@@ -29,82 +27,49 @@ def create_test_tar_with_manifest(repo_tags):
         }
     ]
 
-    with tarfile.open(tar_path, "w") as tar:
-        # Add manifest.json
-        manifest_info = tarfile.TarInfo("manifest.json")
-        manifest_content = json.dumps(manifest).encode("utf-8")
-        manifest_info.size = len(manifest_content)
-        tar.addfile(manifest_info, fileobj=tarfile.io.BytesIO(manifest_content))
-
-        # Add dummy blobs
-        for blob_name in ["blobs/sha256/config123", "blobs/sha256/layer123"]:
-            blob_info = tarfile.TarInfo(blob_name)
-            blob_content = b"dummy"
-            blob_info.size = len(blob_content)
-            tar.addfile(blob_info, fileobj=tarfile.io.BytesIO(blob_content))
+    # Tag readers only look at manifest.json, so the blobs are left out
+    return str(write_tar(tmp_path / "test.tar", {"manifest.json": manifest}))
 
-    return tar_path
 
-
-def create_test_tar_with_repositories(repositories):
+def create_test_tar_with_repositories(tmp_path, repositories):
     """Create test tar with repositories file containing specified repos."""
-    tar_path = tempfile.mktemp(suffix=".tar")
-
-    with tarfile.open(tar_path, "w") as tar:
-        # Add repositories
-        repos_info = tarfile.TarInfo("repositories")
-        repos_content = json.dumps(repositories).encode("utf-8")
-        repos_info.size = len(repos_content)
-        tar.addfile(repos_info, fileobj=tarfile.io.BytesIO(repos_content))
+    return str(write_tar(tmp_path / "test.tar", {"repositories": repositories}))
 
-    return tar_path
 
-
-def test_extract_repo_tags_from_manifest():
+def test_extract_repo_tags_from_manifest(tmp_path):
     """Test extracting repo tags from manifest.json."""
     repo_tags = ["nginx:alpine", "nginx:latest", "my-nginx:v1.0"]
-    tar_path = create_test_tar_with_manifest(repo_tags)
+    tar_path = create_test_tar_with_manifest(tmp_path, repo_tags)
 
-    try:
-        extracted_tags = extract_repo_tags_from_manifest(tar_path)
-        assert extracted_tags == repo_tags
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    extracted_tags = extract_repo_tags_from_manifest(tar_path)
+    assert extracted_tags == repo_tags
 
 
-def test_extract_repo_tags_from_manifest_empty():
+def test_extract_repo_tags_from_manifest_empty(tmp_path):
     """Test extracting from manifest with empty RepoTags."""
-    tar_path = create_test_tar_with_manifest([])
+    tar_path = create_test_tar_with_manifest(tmp_path, [])
 
-    try:
-        extracted_tags = extract_repo_tags_from_manifest(tar_path)
-        assert extracted_tags == []
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    extracted_tags = extract_repo_tags_from_manifest(tar_path)
+    assert extracted_tags == []
 
 
-def test_extract_repo_tags_from_repositories():
+def test_extract_repo_tags_from_repositories(tmp_path):
     """Test extracting repo tags from repositories file."""
     repositories = {
         "nginx": {"alpine": "abc123", "latest": "def456"},
         "my-app": {"v1.0": "ghi789"},
     }
-    tar_path = create_test_tar_with_repositories(repositories)
+    tar_path = create_test_tar_with_repositories(tmp_path, repositories)
 
-    try:
-        extracted_tags = extract_repo_tags_from_repositories(tar_path)
-        # Order may vary, so use set comparison
-        expected_tags = {"nginx:alpine", "nginx:latest", "my-app:v1.0"}
-        assert set(extracted_tags) == expected_tags
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    extracted_tags = extract_repo_tags_from_repositories(tar_path)
+    # Order may vary, so use set comparison
+    expected_tags = {"nginx:alpine", "nginx:latest", "my-app:v1.0"}
+    assert set(extracted_tags) == expected_tags
 
 
-def test_extract_original_tags_prefers_manifest():
+def test_extract_original_tags_prefers_manifest(tmp_path):
     """Test that extract_original_tags prefers manifest.json over repositories."""
     # Create tar with both manifest and repositories
-    tar_path = tempfile.mktemp(suffix=".tar")
-
     manifest = [
         {
             "Config": "blobs/sha256/config123",
@@ -115,100 +80,109 @@ def test_extract_original_tags_prefers_manifest():
 
     repositories = {"different": {"tag": "xyz789"}}
 
-    with tarfile.open(tar_path, "w") as tar:
-        # Add manifest.json
-        manifest_info = tarfile.TarInfo("manifest.json")
-        manifest_content = json.dumps(manifest).encode("utf-8")
-        manifest_info.size = len(manifest_content)
-        tar.addfile(manifest_info, fileobj=tarfile.io.BytesIO(manifest_content))
-
-        # Add repositories
-        repos_info = tarfile.TarInfo("repositories")
-        repos_content = json.dumps(repositories).encode("utf-8")
-        repos_info.size = len(repos_content)
-        tar.addfile(repos_info, fileobj=tarfile.io.BytesIO(repos_content))
-
-    try:
-        extracted_tags = extract_original_tags(tar_path)
-        # Should prefer manifest.json
-        assert extracted_tags == ["nginx:alpine"]
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
-
+    tar_path = str(
+        write_tar(
+            tmp_path / "test.tar",
+            {"manifest.json": manifest, "repositories": repositories},
+        )
+    )
 
-def test_parse_repository_tag():
-    """Test parsing repository:tag strings."""
-    # Simple cases
-    assert parse_repository_tag("nginx:alpine") == ("nginx", "alpine")
-    assert parse_repository_tag("my-app:latest") == ("my-app", "latest")
+    extracted_tags = extract_original_tags(tar_path)
+    # Should prefer manifest.json
+    assert extracted_tags == ["nginx:alpine"]
 
-    # No tag specified (should default to latest)
-    assert parse_repository_tag("nginx") == ("nginx", "latest")
 
-    # Registry URLs
-    assert parse_repository_tag("localhost:5000/nginx:alpine") == (
-        "localhost:5000/nginx",
-        "alpine",
-    )
-    assert parse_repository_tag("registry.io:443/user/app:v1.0") == (
-        "registry.io:443/user/app",
-        "v1.0",
+def test_extract_original_tags_gzip_tar(tmp_path):
+    """Test tags are read from a gzip-compressed docker save archive."""
+    config = b'{"architecture":"amd64","os":"linux"}'
+    manifest = [
+        {
+            "Config": "blobs/sha256/config123",
+            "RepoTags": ["myapp:v1"],
+            "Layers": ["blobs/sha256/layer123"],
+        }
+    ]
+    tar_path = write_tar(
+        tmp_path / "image.tar",
+        {
+            "blobs/sha256/config123": config,
+            "blobs/sha256/layer123": b"layer content",
+            "repositories": {"myapp": {"v1": "config123"}},
+            "manifest.json": manifest,
+        },
     )
-
-    # Edge cases
-    assert parse_repository_tag("app:") == ("app", "latest")  # Empty tag
+    gzip_path = tmp_path / "image.tar.gz"
+    gzip_path.write_bytes(gzip.compress(tar_path.read_bytes()))
+
+    assert extract_repo_tags_from_manifest(str(gzip_path)) == ["myapp:v1"]
+    assert extract_repo_tags_from_repositories(str(gzip_path)) == ["myapp:v1"]
+    assert extract_original_tags(str(gzip_path)) == ["myapp:v1"]
+    assert inspect_docker_tar(gzip_path).repo_tags == ["myapp:v1"]
+
+
+@pytest.mark.parametrize(
+    ("reference", "expected"),
+    [
+        # Simple cases
+        ("nginx:alpine", ("nginx", "alpine")),
+        ("my-app:latest", ("my-app", "latest")),
+        # No tag specified (should default to latest)
+        ("nginx", ("nginx", "latest")),
+        # Registry URLs
+        ("localhost:5000/nginx:alpine", ("localhost:5000/nginx", "alpine")),
+        ("registry.io:443/user/app:v1.0", ("registry.io:443/user/app", "v1.0")),
+        # Registry port without a tag
+        ("localhost:5000/nginx", ("localhost:5000/nginx", "latest")),
+        # Edge cases
+        ("app:", ("app", "latest")),  # Empty tag
+    ],
+)
+def test_parse_repository_tag(reference, expected):
+    """Test parsing repository:tag strings."""
+    assert parse_repository_tag(reference) == expected
 
 
-def test_get_primary_tag():
+def test_get_primary_tag(tmp_path):
     """Test getting primary (first) tag from tar file."""
     repo_tags = ["nginx:alpine", "nginx:latest"]
-    tar_path = create_test_tar_with_manifest(repo_tags)
+    tar_path = create_test_tar_with_manifest(tmp_path, repo_tags)
 
-    try:
-        primary = get_primary_tag(tar_path)
-        assert primary == ("nginx", "alpine")
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    primary = get_primary_tag(tar_path)
+    assert primary == ("nginx", "alpine")
 
 
-def test_get_primary_tag_no_tags():
+def test_get_primary_tag_no_tags(tmp_path):
     """Test getting primary tag when no tags exist."""
-    tar_path = create_test_tar_with_manifest([])
+    tar_path = create_test_tar_with_manifest(tmp_path, [])
 
-    try:
-        primary = get_primary_tag(tar_path)
-        assert primary is None
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    primary = get_primary_tag(tar_path)
+    assert primary is None
 
 
-def test_extract_tags_invalid_tar():
+def test_extract_tags_invalid_tar(tmp_path):
     """Test error handling for invalid tar files."""
     # Create invalid tar file (empty file)
-    invalid_tar = tempfile.mktemp(suffix=".tar")
+    invalid_tar = str(tmp_path / "test.tar")
     Path(invalid_tar).touch()
 
-    try:
-        with pytest.raises(TarReadError):
-            extract_repo_tags_from_manifest(invalid_tar)
-    finally:
-        Path(invalid_tar).unlink(missing_ok=True)
+    with pytest.raises(TarReadError):
+        extract_repo_tags_from_manifest(invalid_tar)
 
 
-def test_extract_tags_missing_manifest():
+def test_extract_tags_missing_manifest(tmp_path):
     """Test error handling when manifest.json is missing."""
-    # Create tar without manifest.json
-    tar_path = tempfile.mktemp(suffix=".tar")
-
-    with tarfile.open(tar_path, "w") as tar:
-        # Add dummy file instead of manifest
-        dummy_info = tarfile.TarInfo("dummy.txt")
-        dummy_content = b"dummy"
-        dummy_info.size = len(dummy_content)
-        tar.addfile(dummy_info, fileobj=tarfile.io.BytesIO(dummy_content))
-
-    try:
-        with pytest.raises(ValidationError, match="manifest.json not found"):
-            extract_repo_tags_from_manifest(tar_path)
-    finally:
-        Path(tar_path).unlink(missing_ok=True)
+    # Create tar with a dummy file instead of manifest.json
+    tar_path = str(write_tar(tmp_path / "test.tar", {"dummy.txt": b"dummy"}))
+
+    with pytest.raises(ValidationError, match="manifest.json not found"):
+        extract_repo_tags_from_manifest(tar_path)
+
+
+def test_extract_tags_manifest_not_utf8(tmp_path):
+    """Test a manifest.json that is not UTF-8 is rejected."""
+    tar_path = str(
+        write_tar(tmp_path / "test.tar", {"manifest.json": b'[{"RepoTags": ["\xff"]}]'})
+    )
+
+    with pytest.raises(ValidationError):
+        extract_repo_tags_from_manifest(tar_path)
@@ -1,6 +1,5 @@
 """Tests for tar file validation utilities."""
 
-import json
 import tarfile
 
 import pytest
@@ -9,174 +8,110 @@ from registry_api_v2_client.exceptions import ValidationError
 from registry_api_v2_client.utils.validator import (
     are_all_layers_exist,
     are_layers_valid,
+    get_required_paths,
     get_tar_manifest,
     get_tar_members,
     has_required_fields,
     has_required_files,
     is_config_file_exists,
     is_path_exists,
+    is_valid_docker_tar,
     is_valid_tarfile,
+    load_docker_tar_manifest,
+    open_tarfile,
     parse_manifest_json,
+    read_docker_tar_manifest_cached,
     validate_docker_tar,
     validate_manifest_entry,
 )
+from tests.helpers import write_tar
 
+VALID_MANIFEST = [
+    {
+        "Config": "blobs/sha256/config123",
+        "RepoTags": ["test/image:latest"],
+        "Layers": ["blobs/sha256/layer123"],
+    }
+]
 
-def test_validate_synthetic_docker_tar(tmp_path):
-    """Test validation with synthetic Docker tar file."""
-    # Create a small valid tar file from test_data
-    tar_dir = tmp_path / "synthetic_tar"
-    tar_dir.mkdir()
 
-    # Create manifest.json
-    manifest = [
+@pytest.fixture(scope="session")
+def valid_docker_tar(tmp_path_factory):
+    """Create a valid Docker tar once, shared by every test that reads it."""
+    return write_tar(
+        tmp_path_factory.mktemp("validator") / "valid.tar",
         {
-            "Config": "blobs/sha256/test_config",
-            "RepoTags": ["test/synthetic:latest"],
-            "Layers": ["blobs/sha256/test_layer"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    # Create required files
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "test_config").write_text('{"os":"linux","architecture":"amd64"}')
-    (blobs_dir / "test_layer").write_text("synthetic layer content for testing")
-
-    # Create tar file
-    tar_path = tmp_path / "synthetic.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "test_config", arcname="blobs/sha256/test_config")
-        tar.add(blobs_dir / "test_layer", arcname="blobs/sha256/test_layer")
-
-    assert validate_docker_tar(tar_path) is True
-
-
-def test_validate_valid_tar(tmp_path):
+            "manifest.json": VALID_MANIFEST,
+            "blobs/sha256/config123": b'{"os":"linux"}',
+            "blobs/sha256/layer123": b"layer content",
+        },
+    )
+
+
+def mutate_tar(base_path, tar_path, drop=(), manifest=None):
+    """Copy a tar in one pass, dropping members and optionally the manifest."""
+    members = {}
+    with tarfile.open(base_path, "r") as tar:
+        for member in tar:
+            if member.name not in drop:
+                members[member.name] = tar.extractfile(member).read()
+    if manifest is not None:
+        members["manifest.json"] = manifest
+    return write_tar(tar_path, members)
+
+
+@pytest.mark.parametrize("use_cache", [True, False], ids=["cached", "uncached"])
+def test_validate_valid_tar(valid_docker_tar, use_cache):
     """Test validation with a valid Docker tar structure."""
-    # Create a valid tar structure
-    tar_dir = tmp_path / "valid_tar"
-    tar_dir.mkdir()
-
-    # Create manifest.json
-    manifest = [
-        {
-            "Config": "blobs/sha256/config123",
-            "RepoTags": ["test/image:latest"],
-            "Layers": ["blobs/sha256/layer123"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    # Create required files
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "config123").write_text('{"os":"linux"}')
-    (blobs_dir / "layer123").write_text("layer content")
-
-    # Create tar file
-    tar_path = tmp_path / "valid.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        # Add files individually to avoid directory structure issues
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "config123", arcname="blobs/sha256/config123")
-        tar.add(blobs_dir / "layer123", arcname="blobs/sha256/layer123")
-
-    assert validate_docker_tar(tar_path) is True
+    assert validate_docker_tar(valid_docker_tar, use_cache=use_cache) is True
 
 
 def test_validate_missing_manifest(tmp_path):
     """Test validation fails when manifest.json is missing."""
-    tar_dir = tmp_path / "no_manifest"
-    tar_dir.mkdir()
-    (tar_dir / "some_file.txt").write_text("content")
-
-    tar_path = tmp_path / "no_manifest.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = write_tar(tmp_path / "no_manifest.tar", {"some_file.txt": b"content"})
 
     assert validate_docker_tar(tar_path) is False
 
 
 def test_validate_invalid_manifest_json(tmp_path):
     """Test validation fails with invalid JSON in manifest."""
-    tar_dir = tmp_path / "invalid_json"
-    tar_dir.mkdir()
-    (tar_dir / "manifest.json").write_text("invalid json")
-
-    tar_path = tmp_path / "invalid_json.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = write_tar(
+        tmp_path / "invalid_json.tar", {"manifest.json": b"invalid json"}
+    )
 
     assert validate_docker_tar(tar_path) is False
 
 
 def test_validate_invalid_manifest_structure(tmp_path):
     """Test validation fails with invalid manifest structure."""
-    tar_dir = tmp_path / "invalid_structure"
-    tar_dir.mkdir()
-
     # Invalid manifest structure (not a list)
     manifest = {"invalid": "structure"}
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    tar_path = tmp_path / "invalid_structure.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = write_tar(
+        tmp_path / "invalid_structure.tar",
+        {"manifest.json": manifest},
+    )
 
     assert validate_docker_tar(tar_path) is False
 
 
-def test_validate_missing_config_file(tmp_path):
+def test_validate_missing_config_file(valid_docker_tar, tmp_path):
     """Test validation fails when referenced config file is missing."""
-    tar_dir = tmp_path / "missing_config"
-    tar_dir.mkdir()
-
-    manifest = [
-        {
-            "Config": "blobs/sha256/missing_config",
-            "RepoTags": ["test/image:latest"],
-            "Layers": ["blobs/sha256/layer123"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    # Create layer but not config
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "layer123").write_text("layer content")
-
-    tar_path = tmp_path / "missing_config.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = mutate_tar(
+        valid_docker_tar,
+        tmp_path / "missing_config.tar",
+        drop={"blobs/sha256/config123"},
+    )
 
     assert validate_docker_tar(tar_path) is False
 
 
-def test_validate_missing_layer_file(tmp_path):
+def test_validate_missing_layer_file(valid_docker_tar, tmp_path):
     """Test validation fails when referenced layer file is missing."""
-    tar_dir = tmp_path / "missing_layer"
-    tar_dir.mkdir()
-
-    manifest = [
-        {
-            "Config": "blobs/sha256/config123",
-            "RepoTags": ["test/image:latest"],
-            "Layers": ["blobs/sha256/missing_layer"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest))
-
-    # Create config but not layer
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "config123").write_text('{"os":"linux"}')
-
-    tar_path = tmp_path / "missing_layer.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = mutate_tar(
+        valid_docker_tar,
+        tmp_path / "missing_layer.tar",
+        drop={"blobs/sha256/layer123"},
+    )
 
     assert validate_docker_tar(tar_path) is False
 
@@ -197,48 +132,39 @@ def test_validate_nonexistent_file(tmp_path):
         validate_docker_tar(nonexistent)
 
 
-def test_validate_empty_manifest(tmp_path):
+def test_validate_empty_manifest(valid_docker_tar, tmp_path):
     """Test validation fails with empty manifest array."""
-    tar_dir = tmp_path / "empty_manifest"
-    tar_dir.mkdir()
-    (tar_dir / "manifest.json").write_text("[]")
-
-    tar_path = tmp_path / "empty_manifest.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir, arcname=".")
+    tar_path = mutate_tar(
+        valid_docker_tar, tmp_path / "empty_manifest.tar", manifest=b"[]"
+    )
 
     assert validate_docker_tar(tar_path) is False
 
 
-def test_get_manifest_valid_tar(tmp_path):
+@pytest.mark.parametrize(
+    "manifest_last", [True, False], ids=["saved", "manifest-first"]
+)
+def test_validate_many_layer_tar(tmp_path, manifest_last):
+    """Test validating an image with hundreds of layers, as ML images have."""
+    layers = [f"blobs/sha256/layer{i:03d}" for i in range(200)]
+    manifest = [{"Config": "blobs/sha256/config", "Layers": layers}]
+    blobs = dict.fromkeys(["blobs/sha256/config", *layers], b"")
+    members = (
+        {**blobs, "manifest.json": manifest}
+        if manifest_last
+        else {"manifest.json": manifest, **blobs}
+    )
+    tar_path = write_tar(tmp_path / "many_layers.tar", members)
+    assert validate_docker_tar(tar_path, use_cache=False) is True
+
+    del members[layers[-1]]
+    tar_path = write_tar(tmp_path / "missing_last_layer.tar", members)
+    assert validate_docker_tar(tar_path, use_cache=False) is False
+
+
+def test_get_manifest_valid_tar(valid_docker_tar):
     """Test getting manifest from valid tar file."""
-    tar_dir = tmp_path / "valid_tar"
-    tar_dir.mkdir()
-
-    manifest_data = [
-        {
-            "Config": "blobs/sha256/config123",
-            "RepoTags": ["test/image:latest"],
-            "Layers": ["blobs/sha256/layer123"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest_data))
-
-    # Create required files
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "config123").write_text('{"os":"linux"}')
-    (blobs_dir / "layer123").write_text("layer content")
-
-    tar_path = tmp_path / "valid.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        # Add files individually to avoid directory structure issues
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "config123", arcname="blobs/sha256/config123")
-        tar.add(blobs_dir / "layer123", arcname="blobs/sha256/layer123")
-
-    result = get_tar_manifest(tar_path)
-    assert result == manifest_data
+    assert get_tar_manifest(valid_docker_tar) == VALID_MANIFEST
 
 
 def test_get_manifest_invalid_tar(tmp_path):
@@ -250,39 +176,20 @@ def test_get_manifest_invalid_tar(tmp_path):
         get_tar_manifest(not_tar)
 
 
-def test_get_manifest_synthetic_docker_tar(tmp_path):
-    """Test getting manifest from a synthetic Docker tar file."""
-    # Create a synthetic tar file
-    tar_dir = tmp_path / "synthetic_tar"
-    tar_dir.mkdir()
-
-    manifest_data = [
-        {
-            "Config": "blobs/sha256/synthetic_config",
-            "RepoTags": ["test/synthetic:v1.0"],
-            "Layers": ["blobs/sha256/synthetic_layer"],
-        }
-    ]
-    (tar_dir / "manifest.json").write_text(json.dumps(manifest_data))
-
-    # Create required files
-    blobs_dir = tar_dir / "blobs" / "sha256"
-    blobs_dir.mkdir(parents=True)
-    (blobs_dir / "synthetic_config").write_text('{"os":"linux","architecture":"amd64"}')
-    (blobs_dir / "synthetic_layer").write_text("synthetic layer for testing")
-
-    tar_path = tmp_path / "synthetic.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "manifest.json", arcname="manifest.json")
-        tar.add(blobs_dir / "synthetic_config", arcname="blobs/sha256/synthetic_config")
-        tar.add(blobs_dir / "synthetic_layer", arcname="blobs/sha256/synthetic_layer")
+def test_get_manifest_shares_validation_cache(valid_docker_tar, tmp_path):
+    """Test validating and then reading the manifest parses the tar once."""
+    tar_path = mutate_tar(valid_docker_tar, tmp_path / "cached.tar")
+    read_docker_tar_manifest_cached.cache_clear()
 
+    assert validate_docker_tar(tar_path) is True
     manifest = get_tar_manifest(tar_path)
-    assert isinstance(manifest, list)
-    assert len(manifest) > 0
-    assert "Config" in manifest[0]
-    assert "Layers" in manifest[0]
-    assert manifest[0]["RepoTags"] == ["test/synthetic:v1.0"]
+    assert read_docker_tar_manifest_cached.cache_info().misses == 1
+    assert read_docker_tar_manifest_cached.cache_info().hits == 1
+
+    # Callers get a copy of the cached manifest
+    manifest[0]["RepoTags"].append("changed:latest")
+    assert get_tar_manifest(tar_path) == VALID_MANIFEST
+    assert get_tar_manifest(tar_path, use_cache=False) == VALID_MANIFEST
 
 
 # Individual function tests
@@ -301,9 +208,7 @@ def test_is_path_exists(tmp_path):
 def test_is_valid_tarfile(tmp_path):
     """Test tar file validation."""
     # Create valid tar file
-    tar_path = tmp_path / "valid.tar"
-    with tarfile.open(tar_path, "w"):
-        pass
+    tar_path = write_tar(tmp_path / "valid.tar", {})
 
     # Create non-tar file
     not_tar = tmp_path / "not_tar.txt"
@@ -313,17 +218,25 @@ def test_is_valid_tarfile(tmp_path):
     assert is_valid_tarfile(not_tar) is False
 
 
+def test_open_tarfile(tmp_path):
+    """Test opening doubles as the tar format check."""
+    tar_path = write_tar(tmp_path / "test.tar", {})
+    not_tar = tmp_path / "not_tar.txt"
+    not_tar.write_text("not a tar")
+
+    tar = open_tarfile(tar_path)
+    assert tar is not None
+    tar.close()
+    assert open_tarfile(not_tar) is None
+    with pytest.raises(FileNotFoundError):
+        open_tarfile(tmp_path / "missing.tar")
+
+
 def test_get_tar_members(tmp_path):
     """Test tar member extraction."""
-    tar_dir = tmp_path / "test_tar"
-    tar_dir.mkdir()
-    (tar_dir / "file1.txt").write_text("content1")
-    (tar_dir / "file2.txt").write_text("content2")
-
-    tar_path = tmp_path / "test.tar"
-    with tarfile.open(tar_path, "w") as tar:
-        tar.add(tar_dir / "file1.txt", arcname="file1.txt")
-        tar.add(tar_dir / "file2.txt", arcname="file2.txt")
+    tar_path = write_tar(
+        tmp_path / "test.tar", {"file1.txt": b"content1", "file2.txt": b"content2"}
+    )
 
     with tarfile.open(tar_path, "r") as tar:
         members = get_tar_members(tar)
@@ -391,6 +304,16 @@ def test_are_all_layers_exist():
     assert are_all_layers_exist(missing_layers, tar_members) is False
 
 
+def test_required_member_checks_accept_any_list():
+    """Test membership checks with empty and repeated required paths."""
+    tar_members = {"manifest.json", "layer1", "layer2"}
+
+    assert has_required_files(tar_members, []) is True
+    assert are_all_layers_exist([], tar_members) is True
+    assert are_all_layers_exist(["layer1", "layer1"], tar_members) is True
+    assert are_all_layers_exist(["layer1", "layer1", "missing"], tar_members) is False
+
+
 def test_validate_manifest_entry():
     """Test manifest entry validation."""
     tar_members = {"blobs/sha256/config123", "blobs/sha256/layer123"}
@@ -419,3 +342,68 @@ def test_validate_manifest_entry():
     assert validate_manifest_entry(missing_config_entry, tar_members) is False
     assert validate_manifest_entry(invalid_layers_entry, tar_members) is False
     assert validate_manifest_entry(missing_layer_entry, tar_members) is False
+
+
+def test_get_required_paths():
+    """Test collecting the paths manifest entries refer to."""
+    valid_entry = {
+        "Config": "blobs/sha256/config123",
+        "Layers": ["blobs/sha256/layer123"],
+    }
+    missing_field_entry = {"Config": "blobs/sha256/config123"}
+    invalid_layers_entry = {"Config": "blobs/sha256/config123", "Layers": "not a list"}
+
+    assert get_required_paths([valid_entry]) == {
+        "blobs/sha256/config123",
+        "blobs/sha256/layer123",
+    }
+    assert get_required_paths([valid_entry, missing_field_entry]) is None
+    assert get_required_paths([invalid_layers_entry]) is None
+
+
+def test_is_valid_docker_tar_stops_early(tmp_path):
+    """Test validation stops reading once every required path is seen."""
+    manifest = [{"Config": "config.json", "Layers": ["layer.tar"]}]
+    files = {
+        "manifest.json": manifest,
+        "config.json": b"{}",
+        "layer.tar": b"layer",
+        "repositories": b"{}",
+    }
+    tar_path = write_tar(tmp_path / "ordered.tar", files)
+
+    with tarfile.open(tar_path, "r") as tar:
+        assert is_valid_docker_tar(tar) is True
+        assert "repositories" not in [member.name for member in tar.members]
+        # Later reads continue from where validation stopped
+        assert len(tar.getmembers()) == len(files)
+        assert tar.extractfile("repositories").read() == b"{}"
+
+
+def test_is_valid_docker_tar_missing_layer_after_manifest(tmp_path):
+    """Test a manifest-first tar missing a layer is invalid."""
+    manifest = [{"Config": "config.json", "Layers": ["missing.tar"]}]
+    tar_path = write_tar(
+        tmp_path / "missing.tar",
+        {"manifest.json": manifest, "config.json": b"{}"},
+    )
+
+    with tarfile.open(tar_path, "r") as tar:
+        assert is_valid_docker_tar(tar) is False
+
+
+def test_load_docker_tar_manifest(tmp_path):
+    """Test validation returns the manifest it parsed."""
+    manifest = [{"Config": "config.json", "Layers": ["layer.tar"]}]
+    tar_path = write_tar(
+        tmp_path / "image.tar",
+        {
+            "config.json": b"{}",
+            "layer.tar": b"layer",
+            "manifest.json": manifest,
+        },
+    )
+
+    with tarfile.open(tar_path, "r") as tar:
+        assert load_docker_tar_manifest(tar) == manifest
+    assert get_tar_manifest(tar_path) == manifest